@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 from .models import User, Profile
+from apps.courses.admin import render_bulk_enroll_page, run_bulk_enroll
+from apps.courses.forms import BulkEnrollCoursesForm
+from apps.courses.models import Course
 
 
 @admin.register(User)
@@ -9,6 +12,7 @@ class CustomUserAdmin(UserAdmin):
     list_filter = ('role', 'is_active', 'is_staff', 'date_joined')
     search_fields = ('username', 'email', 'first_name', 'last_name')
     ordering = ('-date_joined',)
+    actions = ['enroll_in_courses']
 
     fieldsets = UserAdmin.fieldsets + (
         ('Qo\'shimcha ma\'lumotlar', {
@@ -22,6 +26,27 @@ class CustomUserAdmin(UserAdmin):
         }),
     )
 
+    @admin.action(description='Tanlangan talabalarni kurslarga yozish')
+    def enroll_in_courses(self, request, queryset):
+        courses = Course.objects.all()
+        if request.user.role == 'teacher':
+            courses = courses.filter(instructor=request.user)
+
+        if 'apply' in request.POST:
+            form = BulkEnrollCoursesForm(request.POST, courses=courses)
+            if form.is_valid():
+                # Talaba bo'lmaganlar hisobotda "topilmadi" bo'ladi
+                run_bulk_enroll(
+                    self, request,
+                    (('id', pk) for pk in queryset.values_list('pk', flat=True).iterator()),
+                    [course.pk for course in form.cleaned_data['courses']],
+                )
+                return None
+        else:
+            form = BulkEnrollCoursesForm(courses=courses)
+
+        return render_bulk_enroll_page(self, request, queryset, form, 'Talabalarni kurslarga yozish')
+
 
 @admin.register(Profile)
 class ProfileAdmin(admin.ModelAdmin):
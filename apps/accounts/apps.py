@@ -5,3 +5,6 @@ class AccountsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.accounts'
     verbose_name = 'Foydalanuvchilar'
+
+    def ready(self):
+        import apps.accounts.signals
\ No newline at end of file
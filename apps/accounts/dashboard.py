@@ -0,0 +1,119 @@
+"""
+Shaxsiy kabinet statistikasi.
+
+Har bir rol uchun statistika shartli agregatsiya (Count/Sum + filter) bilan
+bir-ikki so'rovda hisoblanadi va foydalanuvchi bo'yicha cache qilinadi.
+Yozilish, dars tugallash, test urinishi, kurs yoki foydalanuvchi
+o'zgarganda tegishli versiya oshiriladi (signals.py), eski cache o'z-o'zidan
+eskiradi.
+"""
+from django.core.cache import cache
+from django.db.models import Avg, Count, Q, Sum
+
+from .models import User
+from apps.courses.models import Course, Enrollment
+from apps.quizzes.models import QuizAttempt, QuizStats
+
+DASHBOARD_STATS_TIMEOUT = 600
+
+# Admin statistikasi hamma adminlar uchun bir xil
+ADMIN_SCOPE = 'admin'
+
+
+def _version_key(scope):
+    return f'dashboard_stats_version_{scope}'
+
+
+def invalidate_dashboard_stats(*scopes):
+    """Foydalanuvchi id lari (yoki ADMIN_SCOPE) bo'yicha cache ni eskirtirish"""
+    for scope in scopes:
+        if scope is None:
+            continue
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.set(_version_key(scope), 1, None)
+
+
+def student_stats(user):
+    """Talaba: yozilishlar bo'yicha bitta, urinishlar bo'yicha bitta so'rov"""
+    enrollments = Enrollment.objects.filter(student=user).aggregate(
+        total_courses=Count('id'),
+        completed_courses=Count('id', filter=Q(is_completed=True)),
+        completed_lessons=Sum('completed_lessons'),
+    )
+    attempts = QuizAttempt.objects.filter(student=user).aggregate(
+        quiz_attempts=Count('id'),
+        average_score=Avg('score'),
+    )
+
+    return {
+        'total_courses': enrollments['total_courses'],
+        'active_courses': enrollments['total_courses'] - enrollments['completed_courses'],
+        'completed_courses': enrollments['completed_courses'],
+        'completed_lessons': enrollments['completed_lessons'] or 0,
+        'quiz_attempts': attempts['quiz_attempts'],
+        'average_score': round(attempts['average_score'] or 0, 1),
+    }
+
+
+def teacher_stats(user):
+    """O'qituvchi: kurs hisoblagichlari va QuizStats yig'ma qatorlaridan"""
+    courses = Course.objects.filter(instructor=user).aggregate(
+        total_courses=Count('id'),
+        active_courses=Count('id', filter=Q(is_active=True)),
+        total_students=Sum('student_count'),
+        total_lessons=Sum('lesson_count'),
+    )
+    quizzes = QuizStats.objects.filter(quiz__lesson__course__instructor=user).aggregate(
+        attempt_count=Sum('attempt_count'),
+        pass_count=Sum('pass_count'),
+        score_sum=Sum('score_sum'),
+    )
+    quiz_attempts = quizzes['attempt_count'] or 0
+
+    return {
+        'total_courses': courses['total_courses'],
+        'active_courses': courses['active_courses'],
+        'total_students': courses['total_students'] or 0,
+        'total_lessons': courses['total_lessons'] or 0,
+        'quiz_attempts': quiz_attempts,
+        'quiz_pass_rate': round((quizzes['pass_count'] or 0) / quiz_attempts * 100, 1) if quiz_attempts else 0,
+        'average_score': round((quizzes['score_sum'] or 0) / quiz_attempts, 1) if quiz_attempts else 0,
+    }
+
+
+def admin_stats():
+    """Admin: foydalanuvchilar bitta, kurslar bitta so'rovda"""
+    users = User.objects.aggregate(
+        total_users=Count('id'),
+        total_students=Count('id', filter=Q(role='student')),
+        total_teachers=Count('id', filter=Q(role='teacher')),
+    )
+    courses = Course.objects.aggregate(
+        total_courses=Count('id'),
+        active_courses=Count('id', filter=Q(is_active=True)),
+    )
+    return {**users, **courses}
+
+
+def compute_dashboard_stats(user):
+    if user.role == 'student':
+        return student_stats(user)
+    if user.role == 'teacher':
+        return teacher_stats(user)
+    return admin_stats()
+
+
+def get_dashboard_stats(user):
+    """Rolga mos statistika (cache dan)"""
+    scope = user.pk if user.role in ('student', 'teacher') else ADMIN_SCOPE
+    version = cache.get_or_set(_version_key(scope), 1, None)
+    cache_key = f'dashboard_stats_{scope}_{user.role}_v{version}'
+
+    stats = cache.get(cache_key)
+    if stats is None:
+        stats = compute_dashboard_stats(user)
+        cache.set(cache_key, stats, DASHBOARD_STATS_TIMEOUT)
+
+    return stats
@@ -0,0 +1,87 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import User
+from .dashboard import ADMIN_SCOPE, invalidate_dashboard_stats
+from apps.courses.models import Course, Enrollment
+from apps.lessons.models import Lesson, LessonProgress
+from apps.quizzes.models import Quiz, QuizAttempt
+
+
+def _invalidate_on_commit(*scopes):
+    """Versiya tranzaksiya tugagach oshiriladi: aks holda parallel so'rov eski
+    ma'lumotni yangi versiya ostida cache ga yozib qo'yishi mumkin"""
+    transaction.on_commit(lambda: invalidate_dashboard_stats(*scopes))
+
+
+def _course_instructor_id(course_id):
+    return Course.objects.filter(pk=course_id).values_list('instructor_id', flat=True).first()
+
+
+def _quiz_instructor_id(quiz_id):
+    return Quiz.objects.filter(pk=quiz_id).values_list('lesson__course__instructor_id', flat=True).first()
+
+
+@receiver(post_init, sender=User)
+def remember_user_role(sender, instance, **kwargs):
+    """Rol o'zgarishini aniqlash uchun (last_login saqlanishida hech narsa qilinmaydi)"""
+    instance._dashboard_role = instance.__dict__.get('role')
+
+
+@receiver(post_save, sender=User)
+def invalidate_admin_stats_on_user_save(sender, instance, created, **kwargs):
+    """Yangi foydalanuvchi yoki rol o'zgarganda admin statistikasini yangilash"""
+    if created or instance._dashboard_role != instance.role:
+        _invalidate_on_commit(ADMIN_SCOPE)
+    instance._dashboard_role = instance.role
+
+
+@receiver(post_delete, sender=User)
+def invalidate_admin_stats_on_user_delete(sender, instance, **kwargs):
+    _invalidate_on_commit(ADMIN_SCOPE)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_stats_on_course_change(sender, instance, **kwargs):
+    """Kurs o'zgarganda o'qituvchi va admin statistikasini yangilash"""
+    _invalidate_on_commit(instance.instructor_id, ADMIN_SCOPE)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def invalidate_stats_on_enrollment_change(sender, instance, **kwargs):
+    """Yozilish o'zgarganda talaba va kurs o'qituvchisi statistikasini yangilash"""
+    _invalidate_on_commit(instance.student_id, _course_instructor_id(instance.course_id))
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_stats_on_lesson_change(sender, instance, **kwargs):
+    """Darslar soni o'zgarganda o'qituvchi statistikasini yangilash"""
+    _invalidate_on_commit(_course_instructor_id(instance.course_id))
+
+
+@receiver(post_init, sender=LessonProgress)
+def remember_progress_completion(sender, instance, **kwargs):
+    instance._dashboard_completed = instance.is_completed
+
+
+@receiver(post_save, sender=LessonProgress)
+def invalidate_stats_on_lesson_complete(sender, instance, created, **kwargs):
+    """Dars tugallanganda (heartbeatlarda emas) talaba statistikasini yangilash"""
+    was_completed = False if created else instance._dashboard_completed
+    instance._dashboard_completed = instance.is_completed
+    if instance.is_completed != was_completed:
+        _invalidate_on_commit(instance.student_id)
+
+
+@receiver(post_delete, sender=LessonProgress)
+def invalidate_stats_on_progress_delete(sender, instance, **kwargs):
+    if instance._dashboard_completed:
+        _invalidate_on_commit(instance.student_id)
+
+
+@receiver([post_save, post_delete], sender=QuizAttempt)
+def invalidate_stats_on_attempt_change(sender, instance, **kwargs):
+    """Urinish saqlanganda talaba, tugallangan bo'lsa o'qituvchi statistikasini yangilash"""
+    _invalidate_on_commit(instance.student_id)
+    if instance.completed_at is not None:
+        _invalidate_on_commit(_quiz_instructor_id(instance.quiz_id))
@@ -1,3 +1,48 @@
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from apps.courses.models import Course, Enrollment
+from .dashboard import get_dashboard_stats
+from .models import User
+
+
+class DashboardStatsCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=self.teacher,
+            level='beginner', duration_weeks=4
+        )
+
+    def test_enrollment_invalidates_after_commit(self):
+        self.assertEqual(get_dashboard_stats(self.student)['total_courses'], 0)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            Enrollment.objects.create(student=self.student, course=self.course)
+            # Tranzaksiya tugamaguncha versiya o'zgarmaydi
+            self.assertEqual(get_dashboard_stats(self.student)['total_courses'], 0)
+        for callback in callbacks:
+            callback()
+
+        self.assertEqual(get_dashboard_stats(self.student)['total_courses'], 1)
+
+    def test_enrollment_invalidates_instructor_stats(self):
+        self.assertEqual(get_dashboard_stats(self.teacher)['total_students'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Enrollment.objects.create(student=self.student, course=self.course)
+
+        self.assertEqual(get_dashboard_stats(self.teacher)['total_students'], 1)
+
+    def test_unrelated_user_save_keeps_admin_cache(self):
+        admin_user = User.objects.create_user(username='admin', password='pw', role='admin')
+        get_dashboard_stats(admin_user)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.student.first_name = 'Ali'
+            self.student.save()
+
+        self.assertEqual(callbacks, [])
@@ -11,6 +11,7 @@ urlpatterns = [
 
     # Dashboard va Profile
     path('dashboard/', views.dashboard_view, name='dashboard'),
+    path('dashboard/stats/', views.dashboard_stats_view, name='dashboard_stats'),
     path('profile/', views.profile_view, name='profile'),
     path('profile/edit/', views.profile_edit_view, name='profile_edit'),
     path('profile/<int:user_id>/', views.public_profile_view, name='public_profile'),
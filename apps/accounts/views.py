@@ -5,8 +5,7 @@ from django.contrib import messages
 from django.urls import reverse
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
-from django.db.models import Count, Q, Avg
+from django.db.models import Q
 
 from .models import User, Profile
 from .forms import (
@@ -14,8 +13,9 @@ from .forms import (
     PasswordChangeForm, PasswordResetForm, TeacherApplicationForm
 )
 from apps.courses.models import Course, Enrollment
-from apps.lessons.models import LessonProgress
 from apps.quizzes.models import QuizAttempt
+from apps.core.pagination import paginate
+from .dashboard import get_dashboard_stats
 
 
 def register_view(request):
@@ -95,76 +95,27 @@ def dashboard_view(request):
     """Shaxsiy kabinet"""
     user = request.user
 
-    # Statistika
-    if user.role == 'student':
-        # Talaba statistikasi
-        enrollments = Enrollment.objects.filter(student=user)
-        completed_lessons = LessonProgress.objects.filter(
-            student=user,
-            is_completed=True
-        ).count()
-
-        quiz_attempts = QuizAttempt.objects.filter(student=user)
-        avg_score = quiz_attempts.aggregate(
-            avg_score=Avg('score')
-        )['avg_score'] or 0
-
-        stats = {
-            'total_courses': enrollments.count(),
-            'active_courses': enrollments.filter(is_completed=False).count(),
-            'completed_courses': enrollments.filter(is_completed=True).count(),
-            'completed_lessons': completed_lessons,
-            'quiz_attempts': quiz_attempts.count(),
-            'average_score': round(avg_score, 1),
-        }
+    # Statistika (cache dan, rolga mos)
+    stats = get_dashboard_stats(user)
+    context = {'stats': stats}
 
+    if user.role == 'student':
         # So'nggi faoliyat
-        recent_enrollments = enrollments.select_related('course')[:5]
-        recent_quiz_attempts = quiz_attempts.select_related('quiz__lesson__course')[:5]
-
-        context = {
-            'stats': stats,
-            'recent_enrollments': recent_enrollments,
-            'recent_quiz_attempts': recent_quiz_attempts,
-        }
+        context.update({
+            'recent_enrollments': Enrollment.objects.filter(student=user).select_related('course')[:5],
+            'recent_quiz_attempts': QuizAttempt.objects.filter(
+                student=user
+            ).select_related('quiz__lesson__course')[:5],
+        })
 
     elif user.role == 'teacher':
-        # O'qituvchi statistikasi
-        my_courses = Course.objects.filter(instructor=user)
-        total_students = Enrollment.objects.filter(
-            course__instructor=user
-        ).count()
-
-        stats = {
-            'total_courses': my_courses.count(),
-            'active_courses': my_courses.filter(is_active=True).count(),
-            'total_students': total_students,
-            'total_lessons': sum(course.lessons.count() for course in my_courses),
-        }
-
         # So'nggi enrollmentlar
-        recent_enrollments = Enrollment.objects.filter(
-            course__instructor=user
-        ).select_related('student', 'course')[:10]
-
-        context = {
-            'stats': stats,
-            'my_courses': my_courses[:5],
-            'recent_enrollments': recent_enrollments,
-        }
-
-    else:
-        # Admin statistikasi
-        stats = {
-            'total_users': User.objects.count(),
-            'total_students': User.objects.filter(role='student').count(),
-            'total_teachers': User.objects.filter(role='teacher').count(),
-            'total_courses': Course.objects.count(),
-        }
-
-        context = {
-            'stats': stats,
-        }
+        context.update({
+            'my_courses': Course.objects.filter(instructor=user)[:5],
+            'recent_enrollments': Enrollment.objects.filter(
+                course__instructor=user
+            ).select_related('student', 'course')[:10],
+        })
 
     context.update({
         'page_title': 'Shaxsiy kabinet',
@@ -174,6 +125,15 @@ def dashboard_view(request):
     return render(request, 'accounts/dashboard.html', context)
 
 
+@login_required
+def dashboard_stats_view(request):
+    """Kabinet statistikasi JSON ko'rinishida (sahifani yangilamasdan yangilash uchun)"""
+    return JsonResponse({
+        'role': request.user.role,
+        'stats': get_dashboard_stats(request.user),
+    })
+
+
 @login_required
 def profile_view(request):
     """Profil ko'rish"""
@@ -234,12 +194,10 @@ def my_courses_view(request):
         # Talaba kurslari
         enrollments = Enrollment.objects.filter(
             student=user
-        ).select_related('course', 'course__instructor').order_by('-enrolled_at')
+        ).select_related('course', 'course__instructor')
 
         # Pagination
-        paginator = Paginator(enrollments, 12)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(request, enrollments, 12, ('-enrolled_at', '-id'))
 
         context = {
             'enrollments': page_obj,
@@ -250,14 +208,10 @@ def my_courses_view(request):
         # O'qituvchi kurslari
         courses = Course.objects.filter(
             instructor=user
-        ).annotate(
-            student_count=Count('enrollment')
-        ).order_by('-created_at')
+        )
 
         # Pagination
-        paginator = Paginator(courses, 12)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(request, courses, 12, ('-created_at', '-id'))
 
         context = {
             'courses': page_obj,
@@ -322,8 +276,6 @@ def public_profile_view(request, user_id):
         courses = Course.objects.filter(
             instructor=user,
             is_active=True
-        ).annotate(
-            student_count=Count('enrollment')
         )[:6]
 
     context = {
@@ -0,0 +1,151 @@
+"""
+Qidiruv maydoni uchun avtoto'ldirish (search-as-you-type).
+
+Faol kurs va dars sarlavhalari process xotirasida saralangan so'zlar
+massivi ko'rinishida saqlanadi: har bir so'z (normallashtirilgan) va
+sarlavha raqami. Prefiks bisect bilan topiladi, javob uchun bazaga
+murojaat qilinmaydi.
+
+Kurs yoki dars sarlavhasi (kurs holati, darsning kursi) o'zgarganda indeks
+shu processda darhol qayta quriladi, boshqa processlar esa cache dagi
+versiya orqali buni bilib oladi. Mashhurlik (talabalar soni) uchun indeks
+MAX_AGE dan eski bo'lsa ham qayta quriladi. Worker ishga tushganda indeks
+oldindan quriladi (warm_index, config/wsgi.py va asgi.py).
+"""
+import bisect
+import logging
+import time
+import uuid
+
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.urls import reverse
+
+from .text import search_terms
+
+logger = logging.getLogger(__name__)
+
+VERSION_KEY = 'autocomplete:version'
+# Talabalar soni (mashhurlik) shu muddatdan ko'p eskirmaydi, soniya
+MAX_AGE = 600
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+
+class PrefixIndex:
+    """Saralangan (so'z, sarlavha raqami) juftliklari ustidagi prefiks indeks"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.entry_terms = []
+        pairs = []
+        for position, entry in enumerate(entries):
+            terms = search_terms(entry['title'])
+            self.entry_terms.append(terms)
+            pairs.extend((term, position) for term in set(terms))
+        pairs.sort()
+        self.terms = [term for term, _ in pairs]
+        self.positions = [position for _, position in pairs]
+
+    def _prefix_positions(self, prefix):
+        start = bisect.bisect_left(self.terms, prefix)
+        end = bisect.bisect_left(self.terms, prefix + '\uffff', lo=start)
+        return set(self.positions[start:end])
+
+    def lookup(self, query, limit=DEFAULT_LIMIT):
+        terms = search_terms(query)
+        if not terms:
+            return []
+
+        # Eng uzun so'z bo'yicha nomzodlar, qolganlari ham prefiks bo'lishi kerak
+        terms.sort(key=len, reverse=True)
+        candidates = self._prefix_positions(terms[0])
+        for term in terms[1:]:
+            candidates = {
+                position for position in candidates
+                if any(word.startswith(term) for word in self.entry_terms[position])
+            }
+
+        matches = [self.entries[position] for position in candidates]
+        # Mashhurlik bo'yicha, teng bo'lsa kurslar darslardan oldin
+        matches.sort(key=lambda entry: (-entry['popularity'], entry['type'] != 'course', entry['title']))
+        return [
+            {key: value for key, value in entry.items() if key != 'popularity'}
+            for entry in matches[:limit]
+        ]
+
+
+def build_entries():
+    """Faol kurslar va ularning darslari (mashhurlik - kursdagi talabalar soni)"""
+    from apps.courses.models import Course
+    from apps.lessons.models import Lesson
+
+    entries = [
+        {
+            'type': 'course',
+            'title': title,
+            'url': reverse('courses:detail', args=[course_id]),
+            'popularity': student_count,
+        }
+        for course_id, title, student_count in Course.objects.filter(is_active=True).values_list(
+            'pk', 'title', 'student_count'
+        )
+    ]
+    entries += [
+        {
+            'type': 'lesson',
+            'title': title,
+            'course': course_title,
+            'url': reverse('lessons:detail', args=[course_id, lesson_id]),
+            'popularity': student_count,
+        }
+        for lesson_id, course_id, title, course_title, student_count in Lesson.objects.filter(
+            course__is_active=True
+        ).values_list('pk', 'course_id', 'title', 'course__title', 'course__student_count')
+    ]
+    return entries
+
+
+# Process ichidagi indeks: (versiya, PrefixIndex, qurilgan vaqt)
+_index = (None, None, 0)
+
+
+def _build(version):
+    global _index
+
+    index = PrefixIndex(build_entries())
+    _index = (version, index, time.monotonic())
+    return index
+
+
+def get_index():
+    """Joriy indeks; boshqa processda o'zgarish bo'lgan yoki eskirgan bo'lsa qayta quriladi"""
+    version = cache.get(VERSION_KEY)
+    current_version, index, built_at = _index
+    if index is not None and version == current_version and time.monotonic() - built_at < MAX_AGE:
+        return index
+
+    if version is None:
+        version = uuid.uuid4().hex
+        if not cache.add(VERSION_KEY, version, None):
+            version = cache.get(VERSION_KEY)
+    return _build(version)
+
+
+def refresh_index():
+    """Kurs yoki dars o'zgarganda: shu processda qayta qurish va versiyani yangilash"""
+    version = uuid.uuid4().hex
+    cache.set(VERSION_KEY, version, None)
+    return _build(version)
+
+
+def warm_index():
+    """Worker ishga tushganda; baza hali tayyor bo'lmasa birinchi so'rovda quriladi"""
+    try:
+        get_index()
+    except DatabaseError:
+        logger.warning('Avtoto\'ldirish indeksini oldindan qurib bo\'lmadi', exc_info=True)
+
+
+def autocomplete(query, limit=DEFAULT_LIMIT):
+    return get_index().lookup(query, min(max(limit, 1), MAX_LIMIT))
@@ -0,0 +1,120 @@
+"""
+Ochiq katalog sahifalari (bosh sahifa, biz haqimizda, kurslar) uchun HTTP
+conditional GET: ETag / Last-Modified va CDN uchun Cache-Control.
+
+Katalog versiyasi - oxirgi o'zgarish vaqti (timestamp). U cache da
+saqlanadi va kurs, dars yoki sayt chrome i o'zgarganda yangilanadi
+(signals.py, site_chrome._publish). Yozilishlar faqat talabalar sonini
+o'zgartiradi, shuning uchun ular katalogni ko'pi bilan
+CATALOG_CACHE_S_MAXAGE da bir marta yangilaydi. Cache bo'sh bo'lsa
+Course/Lesson.updated_at va Testimonial.created_at ning eng kattasidan
+olinadi.
+
+Faqat anonim foydalanuvchilarga 304 qaytariladi. Kirgan foydalanuvchi
+sahifasi shaxsiy, shuning uchun u har doim render qilinadi va
+Cache-Control: private bo'ladi.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone as dt_timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+LAST_MODIFIED_KEY = 'catalog:last_modified'
+ENROLLMENT_TOUCH_KEY = 'catalog:enrollment_touch'
+ENROLLMENT_PENDING_KEY = 'catalog:enrollment_pending'
+
+
+def touch_catalog():
+    """Katalog o'zgardi - barcha ETag va Last-Modified lar yangilanadi"""
+    cache.set(LAST_MODIFIED_KEY, time.time(), None)
+
+
+def touch_catalog_for_enrollment():
+    """
+    Talabalar soni o'zgardi. Oraliq ichidagi keyingi yozilishlar faqat
+    belgilanadi va oraliq tugagach birinchi so'rovda katalogni yangilaydi.
+    """
+    if cache.add(ENROLLMENT_TOUCH_KEY, True, settings.CATALOG_CACHE_S_MAXAGE):
+        cache.delete(ENROLLMENT_PENDING_KEY)
+        touch_catalog()
+    else:
+        cache.set(ENROLLMENT_PENDING_KEY, True, None)
+
+
+def _last_modified_from_database():
+    from apps.courses.models import Course
+    from apps.lessons.models import Lesson
+    from .models import Testimonial
+
+    stamps = [
+        Course.objects.aggregate(stamp=Max('updated_at'))['stamp'],
+        Lesson.objects.aggregate(stamp=Max('updated_at'))['stamp'],
+        Testimonial.objects.aggregate(stamp=Max('created_at'))['stamp'],
+    ]
+    stamps = [stamp.timestamp() for stamp in stamps if stamp is not None]
+    return max(stamps) if stamps else time.time()
+
+
+def catalog_timestamp():
+    values = cache.get_many([LAST_MODIFIED_KEY, ENROLLMENT_PENDING_KEY, ENROLLMENT_TOUCH_KEY])
+    if ENROLLMENT_PENDING_KEY in values and ENROLLMENT_TOUCH_KEY not in values:
+        touch_catalog_for_enrollment()
+        values[LAST_MODIFIED_KEY] = cache.get(LAST_MODIFIED_KEY)
+
+    stamp = values.get(LAST_MODIFIED_KEY)
+    if stamp is None:
+        cache.add(LAST_MODIFIED_KEY, _last_modified_from_database(), None)
+        stamp = cache.get(LAST_MODIFIED_KEY, time.time())
+    return stamp
+
+
+def catalog_last_modified(request, *args, **kwargs):
+    return datetime.fromtimestamp(catalog_timestamp(), tz=dt_timezone.utc)
+
+
+def catalog_etag(request, *args, **kwargs):
+    """
+    Versiya va CSRF cookie dan. Sahifada CSRF token bor, shuning uchun cookie
+    o'zgarsa (yoki o'chirilsa) brauzerdagi eski nusxa ishlatilmaydi.
+    """
+    csrf_cookie = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    digest = hashlib.md5(f'{catalog_timestamp():.6f}|{csrf_cookie}'.encode()).hexdigest()
+    return f'catalog-{digest}'
+
+
+def has_pending_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+def catalog_page(view_func):
+    """Ochiq katalog sahifasi uchun decorator"""
+    conditional_view = condition(etag_func=catalog_etag, last_modified_func=catalog_last_modified)(view_func)
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.user.is_authenticated or has_pending_messages(request):
+            response = view_func(request, *args, **kwargs)
+            patch_cache_control(response, private=True)
+            return response
+
+        response = conditional_view(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            # Brauzer har safar tekshiradi (304), CDN qisqa muddat saqlaydi
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=0,
+                s_maxage=settings.CATALOG_CACHE_S_MAXAGE,
+            )
+            # ETag CSRF cookie ga bog'liq
+            patch_vary_headers(response, ['Cookie'])
+        return response
+
+    return wrapper
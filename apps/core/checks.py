@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Production da cache barcha workerlar uchun umumiy bo'lishi kerak"""
+    backend = settings.CACHES['default']['BACKEND']
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+
+    return [
+        Warning(
+            f'Default cache ({backend}) faqat bitta process ichida ishlaydi.',
+            hint=(
+                'Bir nechta worker bo\'lsa sayt chrome, yozilishlar holati va heartbeat '
+                'buferi eskiradi. CACHE_BACKEND ga Redis yoki Memcached ni belgilang.'
+            ),
+            id='core.W001',
+        )
+    ]
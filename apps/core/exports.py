@@ -0,0 +1,240 @@
+"""
+Katta jadvallarni CSV yoki XLSX sifatida oqim (streaming) bilan eksport qilish.
+
+Qatorlar generator dan bittadan olinadi va javobga darhol yoziladi, shuning
+uchun xotira qatorlar soniga bog'liq emas. XLSX qo'shimcha kutubxonasiz
+yoziladi: zipfile seek qilib bo'lmaydigan oqimga ham yoza oladi, varaq
+(sheet) XML i esa qatorma-qator siqiladi.
+"""
+import csv
+import re
+import zipfile
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+from django.core.exceptions import PermissionDenied
+from django.http import StreamingHttpResponse
+from django.urls import path
+from django.utils import timezone
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Shuncha qatordan keyin yig'ilgan XLSX baytlari javobga yuboriladi
+XLSX_FLUSH_ROWS = 500
+
+CONTENT_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+
+def format_value(value):
+    """Katak qiymati: sana - mahalliy vaqt, bool - Ha/Yo'q, None - bo'sh"""
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Ha' if value else 'Yo\'q'
+    if isinstance(value, datetime):
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.strftime('%Y-%m-%d %H:%M')
+    return value
+
+
+# Excel/LibreOffice bunday boshlangan katakni formula deb bajaradi (CSV injection)
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def csv_value(value):
+    """CSV katagi: formula bo'lib qolmasligi uchun oldiga ' qo'shiladi"""
+    value = format_value(value)
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class _Echo:
+    """csv.writer uchun: yozilgan qatorni qaytaradi"""
+
+    def write(self, value):
+        return value
+
+
+def csv_rows(header, rows):
+    writer = csv.writer(_Echo())
+    # Excel UTF-8 ni to'g'ri ochishi uchun BOM
+    yield '\ufeff' + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([csv_value(value) for value in row])
+
+
+class _Sink:
+    """zipfile yozadigan, seek qilib bo'lmaydigan bufer"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+_ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_XLSX_PARTS = {
+    '[Content_Types].xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        '</Types>'
+    ),
+    '_rels/.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/_rels/workbook.xml.rels': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '<Relationship Id="rId2" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+        'Target="styles.xml"/>'
+        '</Relationships>'
+    ),
+    'xl/styles.xml': (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+        '<borders count="1"><border/></borders>'
+        '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+        '<cellXfs count="2"><xf/><xf fontId="1" applyFont="1"/></cellXfs>'
+        '</styleSheet>'
+    ),
+}
+
+
+def _workbook_xml(sheet_name):
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name[:31])}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def _cell(value, style=''):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f'<c{style}><v>{value}</v></c>'
+    text = escape(_ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"{style}><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _row(values, style=''):
+    return '<row>' + ''.join(_cell(value, style) for value in values) + '</row>'
+
+
+def xlsx_chunks(header, rows, sheet_name='Export'):
+    sink = _Sink()
+    with zipfile.ZipFile(sink, 'w', zipfile.ZIP_DEFLATED) as workbook:
+        for name, content in _XLSX_PARTS.items():
+            workbook.writestr(name, content)
+        workbook.writestr('xl/workbook.xml', _workbook_xml(sheet_name))
+
+        with workbook.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                b'<sheetData>'
+            )
+            # Sarlavha qalin (styles.xml dagi 1-uslub)
+            sheet.write(_row(header, ' s="1"').encode())
+            for number, row in enumerate(rows, 1):
+                sheet.write(_row([format_value(value) for value in row]).encode())
+                if number % XLSX_FLUSH_ROWS == 0:
+                    yield sink.drain()
+            sheet.write(b'</sheetData></worksheet>')
+
+    yield sink.drain()
+
+
+def streaming_export(filename, header, rows, file_format='csv', sheet_name='Export'):
+    """
+    Eksport javobi. rows - qatorlar (tuple) iteratori, masalan
+    queryset.values_list(...).iterator(chunk_size=EXPORT_CHUNK_SIZE).
+    Noma'lum format bo'lsa ValueError.
+    """
+    if file_format == 'csv':
+        content = csv_rows(header, rows)
+    elif file_format == 'xlsx':
+        content = xlsx_chunks(header, rows, sheet_name)
+    else:
+        raise ValueError(f'Noma\'lum eksport formati: {file_format}')
+
+    response = StreamingHttpResponse(content, content_type=CONTENT_TYPES[file_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{file_format}"'
+    return response
+
+
+class ExportAdminMixin:
+    """
+    ModelAdmin uchun CSV/XLSX eksport (<changelist>/export/?format=csv|xlsx).
+
+    Qatorlar changelist bilan bir xil: get_queryset (o'qituvchi faqat o'z
+    kurslarini ko'radi), filtrlar, qidiruv va tartib saqlanadi.
+    export_fields - (sarlavha, values_list maydoni) juftlari.
+    """
+    export_fields = ()
+    export_filename = 'export'
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                'export/',
+                self.admin_site.admin_view(self.export_view),
+                name=f'{opts.app_label}_{opts.model_name}_export',
+            ),
+        ] + super().get_urls()
+
+    def export_view(self, request):
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+
+        # format changelist filtri emas
+        request.GET = request.GET.copy()
+        file_format = request.GET.pop('format', ['csv'])[0]
+        if file_format not in CONTENT_TYPES:
+            file_format = 'csv'
+
+        queryset = self.get_changelist_instance(request).get_queryset(request)
+        rows = queryset.values_list(*[field for _, field in self.export_fields]).iterator(
+            chunk_size=EXPORT_CHUNK_SIZE
+        )
+        header = [title for title, _ in self.export_fields]
+        filename = f'{self.export_filename}_{timezone.localdate():%Y%m%d}'
+        sheet_name = str(self.model._meta.verbose_name_plural)
+        return streaming_export(filename, header, rows, file_format, sheet_name=sheet_name)
@@ -0,0 +1,68 @@
+"""
+Cache qilingan sahifa shellidagi shaxsiy qismlar (ESI uslubida).
+
+Sahifadagi har bir [data-fragment="nom"] yoki [data-fragment="nom:kurs_id"]
+elementi uchun shu yerda ro'yxatdan o'tgan template joriy foydalanuvchi
+bilan render qilinadi. Kurs fragmentlari uchun kurslar va yozilishlar
+guruhlab (bitta so'rovda) yuklanadi.
+"""
+from django.template.loader import render_to_string
+
+from .viewer_state import get_viewer_state
+
+MAX_FRAGMENTS = 60
+
+FRAGMENTS = {
+    'navbar_user': 'components/navbar_user.html',
+    'navbar_user_mobile': 'components/navbar_user_mobile.html',
+    'teacher_cta': 'courses/components/teacher_cta.html',
+}
+
+COURSE_FRAGMENTS = {
+    'course_enroll': 'courses/components/enroll_actions.html',
+    'course_lessons': 'courses/components/lesson_outline.html',
+    'course_cta': 'courses/components/course_cta.html',
+    'course_action': 'courses/components/course_card_action.html',
+}
+
+
+def _course_contexts(request, course_ids):
+    """Kurs fragmentlari uchun course_detail_view dagi kabi kontekst"""
+    from apps.courses.models import Course
+
+    courses = Course.objects.filter(is_active=True).select_related('instructor').in_bulk(course_ids)
+    state = get_viewer_state(request.user)
+
+    contexts = {}
+    for course_id, course in courses.items():
+        enrollment = state.enrollment(course) if state else None
+        contexts[course_id] = {
+            'course': course,
+            'lessons': course.lessons.order_by('order'),
+            'is_enrolled': enrollment is not None,
+            'enrollment': enrollment,
+        }
+    return contexts
+
+
+def render_fragments(request, names):
+    """{nom: html}; noma'lum nomlar o'tkazib yuboriladi"""
+    parsed = []
+    course_ids = set()
+    for name in list(dict.fromkeys(names))[:MAX_FRAGMENTS]:
+        base, _, key = name.partition(':')
+        if base in FRAGMENTS and not key:
+            parsed.append((name, FRAGMENTS[base], None))
+        elif base in COURSE_FRAGMENTS and key.isdigit():
+            parsed.append((name, COURSE_FRAGMENTS[base], int(key)))
+            course_ids.add(int(key))
+
+    contexts = _course_contexts(request, course_ids) if course_ids else {}
+
+    fragments = {}
+    for name, template_name, course_id in parsed:
+        if course_id is not None and course_id not in contexts:
+            continue
+        context = contexts[course_id] if course_id is not None else {}
+        fragments[name] = render_to_string(template_name, context, request=request)
+    return fragments
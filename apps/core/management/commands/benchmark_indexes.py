@@ -0,0 +1,203 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.courses.models import Course, Enrollment
+from apps.lessons.models import Lesson, LessonProgress
+from apps.quizzes.models import Quiz, QuizAttempt
+
+User = get_user_model()
+
+# Meta.indexes dagi indekslari tekshiriladigan modellar
+INDEXED_MODELS = [Course, LessonProgress, QuizAttempt]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _seed(students, courses, lessons_per_course, rng):
+    """Sinov ma'lumotlari (bulk_create - signallarsiz, tranzaksiya oxirida o'chadi)"""
+    now = timezone.now()
+    teachers = User.objects.bulk_create([
+        User(username=f'bench_teacher_{i}', role='teacher') for i in range(max(courses // 10, 1))
+    ])
+    course_objs = Course.objects.bulk_create([
+        Course(
+            title=f'Benchmark kurs {i}', description='-', instructor=rng.choice(teachers),
+            level=rng.choice(Course.LEVEL_CHOICES)[0], duration_weeks=4,
+            is_active=rng.random() < 0.9, student_count=rng.randint(0, 5000),
+        )
+        for i in range(courses)
+    ])
+    lesson_objs = Lesson.objects.bulk_create([
+        Lesson(course=course, title=f'Dars {order}', order=order, duration_minutes=10)
+        for course in course_objs
+        for order in range(1, lessons_per_course + 1)
+    ])
+    lessons_by_course = {}
+    for lesson in lesson_objs:
+        lessons_by_course.setdefault(lesson.course_id, []).append(lesson)
+    quizzes = Quiz.objects.bulk_create([Quiz(lesson=lesson, title='Test') for lesson in lesson_objs[::3]])
+    quizzes_by_course = {}
+    for quiz in quizzes:
+        quizzes_by_course.setdefault(quiz.lesson.course_id, []).append(quiz)
+
+    student_objs = User.objects.bulk_create(
+        [User(username=f'bench_student_{i}', role='student') for i in range(students)],
+        batch_size=1000,
+    )
+
+    enrollments, progress, attempts = [], [], []
+    for student in student_objs:
+        for course in rng.sample(course_objs, min(5, len(course_objs))):
+            enrollments.append(Enrollment(student=student, course=course))
+            watched = lessons_by_course[course.pk][:rng.randint(0, lessons_per_course)]
+            for lesson in watched:
+                completed = rng.random() < 0.7
+                progress.append(LessonProgress(
+                    student=student, lesson=lesson, is_completed=completed,
+                    watched_duration=600, completed_at=now if completed else None,
+                ))
+            for quiz in quizzes_by_course.get(course.pk, []):
+                for _ in range(rng.randint(0, 3)):
+                    completed = rng.random() < 0.8
+                    attempts.append(QuizAttempt(
+                        student=student, quiz=quiz, score=rng.randint(0, 100),
+                        completed_at=now if completed else None,
+                    ))
+
+    Enrollment.objects.bulk_create(enrollments, batch_size=1000)
+    LessonProgress.objects.bulk_create(progress, batch_size=1000)
+    QuizAttempt.objects.bulk_create(attempts, batch_size=1000)
+    return {
+        'kurslar': len(course_objs),
+        'darslar': len(lesson_objs),
+        'yozilishlar': len(enrollments),
+        'progress': len(progress),
+        'urinishlar': len(attempts),
+    }
+
+
+def _queries():
+    """Issiq yo'llardagi so'rovlar (views, viewer_state, progress, statistics)"""
+    attempt = QuizAttempt.objects.filter(completed_at__isnull=False).order_by('-pk').first()
+    enrollment = Enrollment.objects.order_by('-pk').first()
+    course = Course.objects.filter(is_active=True).order_by('-pk').first()
+    if attempt is None or enrollment is None or course is None:
+        raise CommandError('Ma\'lumot yetarli emas: --seed bilan ishga tushiring')
+
+    student_id, course_id = enrollment.student_id, enrollment.course_id
+    return [
+        ('Yozilganmi', Enrollment.objects.filter(student_id=student_id, course_id=course_id)[:1]),
+        ('Kurs darslari progressi', LessonProgress.objects.filter(
+            student_id=student_id, lesson__course_id=course_id
+        ).values('lesson_id', 'is_completed', 'watched_duration')),
+        ('Tugallangan darslar', LessonProgress.objects.filter(
+            student_id=student_id, is_completed=True
+        ).values('lesson__course_id')),
+        ('Test urinishlari', QuizAttempt.objects.filter(
+            student_id=attempt.student_id, quiz_id=attempt.quiz_id
+        ).order_by('-started_at')),
+        ('Mening natijalarim', QuizAttempt.objects.filter(
+            student_id=attempt.student_id, completed_at__isnull=False
+        ).order_by('-completed_at', '-id')[:20]),
+        ('Boshqa tugallangan urinish', QuizAttempt.objects.filter(
+            quiz_id=attempt.quiz_id, student_id=attempt.student_id, completed_at__isnull=False
+        ).exclude(pk=attempt.pk)[:1]),
+        ('Katalog: daraja', Course.objects.filter(
+            is_active=True, level=course.level
+        ).order_by('-created_at', '-id')[:12]),
+        ('Katalog: yangi', Course.objects.filter(is_active=True).order_by('-created_at', '-id')[:12]),
+        ('Katalog: mashhur', Course.objects.filter(is_active=True).order_by('-student_count', '-id')[:12]),
+        ('O\'qituvchi kurslari', Course.objects.filter(
+            instructor_id=course.instructor_id
+        ).order_by('-created_at', '-id')[:12]),
+    ]
+
+
+def _measure(queries, repeat):
+    results = []
+    for label, queryset in queries:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(queryset.all())
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append((label, queryset.explain(), statistics.median(timings)))
+    return results
+
+
+def _drop_indexes():
+    with connection.cursor() as cursor:
+        for model in INDEXED_MODELS:
+            for index in model._meta.indexes:
+                cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+
+def _analyze():
+    with connection.cursor() as cursor:
+        for model in INDEXED_MODELS + [Enrollment, Lesson]:
+            cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+
+class Command(BaseCommand):
+    help = (
+        'Kompozit va qisman indekslar uchun so\'rov rejalari va vaqtini solishtirish '
+        '(oldin/keyin). Hammasi tranzaksiyada bajariladi va oxirida bekor qilinadi'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Shuncha sinov talabasi yaratish (0 - mavjud ma\'lumotlar bilan)'
+        )
+        parser.add_argument('--courses', type=int, default=200, help='Sinov kurslari soni')
+        parser.add_argument('--lessons', type=int, default=12, help='Har bir kursdagi darslar soni')
+        parser.add_argument('--repeat', type=int, default=20, help='Har bir so\'rov necha marta o\'lchanadi')
+
+    def handle(self, *args, **options):
+        repeat = max(options['repeat'], 1)
+
+        try:
+            with transaction.atomic():
+                if options['seed']:
+                    counts = _seed(
+                        options['seed'], max(options['courses'], 1), max(options['lessons'], 1),
+                        random.Random(42),
+                    )
+                    self.stdout.write('Sinov ma\'lumotlari: ' + ', '.join(
+                        f'{name}: {count}' for name, count in counts.items()
+                    ))
+
+                _analyze()
+                queries = _queries()
+                after = _measure(queries, repeat)
+                _drop_indexes()
+                _analyze()
+                before = _measure(queries, repeat)
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        for (label, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f'{label}: {ms_before:.3f} ms -> {ms_after:.3f} ms'
+            ))
+            self.stdout.write('  Indekslarsiz:')
+            self.stdout.write(_indent(plan_before))
+            self.stdout.write('  Indekslar bilan:')
+            self.stdout.write(_indent(plan_after))
+
+        self.stdout.write(self.style.SUCCESS('Benchmark tugadi, ma\'lumotlar bazasi o\'zgarmadi'))
+
+
+def _indent(plan):
+    return '\n'.join(f'    {line}' for line in plan.splitlines())
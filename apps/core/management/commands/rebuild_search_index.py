@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.core.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Qidiruv indeksini (kurslar, darslar, savollar) qayta qurish'
+
+    def handle(self, *args, **options):
+        courses, lessons, questions = rebuild_search_index()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Indekslandi: {courses} ta kurs, {lessons} ta dars, {questions} ta savol'
+        ))
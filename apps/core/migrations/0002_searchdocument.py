@@ -0,0 +1,155 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:34
+
+import re
+from itertools import islice
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+FTS_TABLE = 'core_searchdocument_fts'
+BATCH_SIZE = 500
+
+# apps.core.text.normalize_text ning shu migratsiya paytidagi nusxasi
+# (modul keyin o'zgarsa ham migratsiya natijasi o'zgarmasligi uchun)
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o', 'қ': 'q',
+    'ғ': 'g', 'ҳ': 'h',
+}
+_WORD_START_E = re.compile(r'(?<![^\W\d_])е')
+_APOSTROPHE_RE = re.compile("['`ʻʼ‘’ʹ]")
+
+
+def normalize_text(text):
+    if not text:
+        return ''
+
+    text = _WORD_START_E.sub('ye', text.lower())
+    text = ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    return _APOSTROPHE_RE.sub('', text)
+
+
+def create_search_index(apps, schema_editor):
+    """PostgreSQL da GIN indeks, SQLite da FTS5 jadvali va triggerlar"""
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX core_searchdocument_vector_gin ON core_searchdocument USING GIN (search_vector)'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+            f"title, body, content='core_searchdocument', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2')"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER core_searchdocument_ai AFTER INSERT ON core_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER core_searchdocument_ad AFTER DELETE ON core_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END"
+        )
+        schema_editor.execute(
+            f"CREATE TRIGGER core_searchdocument_au AFTER UPDATE ON core_searchdocument BEGIN "
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+            f"INSERT INTO {FTS_TABLE}(rowid, title, body) VALUES (new.id, new.title, new.body); END"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS core_searchdocument_vector_gin')
+    elif vendor == 'sqlite':
+        for trigger in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS core_searchdocument_{trigger}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def backfill_documents(apps, schema_editor):
+    SearchDocument = apps.get_model('core', 'SearchDocument')
+    Course = apps.get_model('courses', 'Course')
+    Lesson = apps.get_model('lessons', 'Lesson')
+    Question = apps.get_model('quizzes', 'Question')
+
+    course_active = dict(Course.objects.values_list('pk', 'is_active'))
+
+    courses = (
+        SearchDocument(
+            kind='course', object_id=pk, course_id=pk, is_active=is_active,
+            title=normalize_text(title), body=normalize_text(description)
+        )
+        for pk, title, description, is_active in Course.objects.values_list(
+            'pk', 'title', 'description', 'is_active'
+        ).iterator(chunk_size=BATCH_SIZE)
+    )
+    lessons = (
+        SearchDocument(
+            kind='lesson', object_id=pk, course_id=course_id, is_active=course_active[course_id],
+            title=normalize_text(title), body=normalize_text(f'{description}\n{content}')
+        )
+        for pk, course_id, title, description, content in Lesson.objects.values_list(
+            'pk', 'course_id', 'title', 'description', 'content'
+        ).iterator(chunk_size=BATCH_SIZE)
+    )
+    questions = (
+        SearchDocument(
+            kind='question', object_id=pk, course_id=course_id, is_active=course_active[course_id],
+            title=normalize_text(text)
+        )
+        for pk, course_id, text in Question.objects.values_list(
+            'pk', 'quiz__lesson__course_id', 'text'
+        ).iterator(chunk_size=BATCH_SIZE)
+    )
+
+    # Hujjatlar xotirada to'planmaydi - BATCH_SIZE talik bo'laklar bilan yoziladi
+    for documents in (courses, lessons, questions):
+        while batch := list(islice(documents, BATCH_SIZE)):
+            SearchDocument.objects.bulk_create(batch)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        from django.contrib.postgres.search import SearchVector
+
+        SearchDocument.objects.update(
+            search_vector=SearchVector('title', weight='A', config='simple') +
+            SearchVector('body', weight='B', config='simple')
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('courses', '0003_course_student_count_total_duration_minutes'),
+        ('lessons', '0001_initial'),
+        ('quizzes', '0003_quizstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('course', 'Kurs'), ('lesson', 'Dars'), ('question', 'Savol')], max_length=20)),
+                ('object_id', models.PositiveIntegerField()),
+                ('course_id', models.PositiveIntegerField(db_index=True)),
+                ('title', models.TextField(blank=True)),
+                ('body', models.TextField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'verbose_name': 'Qidiruv hujjati',
+                'verbose_name_plural': 'Qidiruv hujjatlari',
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import URLValidator
 
 
@@ -252,4 +253,34 @@ class Newsletter(models.Model):
         verbose_name_plural = 'Newsletter obunachilar'
 
     def __str__(self):
-        return self.email
\ No newline at end of file
+        return self.email
+
+
+class SearchDocument(models.Model):
+    """
+    Qidiruv indeksi: kurs, dars va savollarning normallashtirilgan matni.
+
+    PostgreSQL da search_vector (GIN indeks bilan), SQLite da FTS5 jadvali
+    ishlatiladi (apps.core.search).
+    """
+    KIND_CHOICES = [
+        ('course', 'Kurs'),
+        ('lesson', 'Dars'),
+        ('question', 'Savol'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    course_id = models.PositiveIntegerField(db_index=True)
+    title = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    is_active = models.BooleanField(default=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        unique_together = ['kind', 'object_id']
+        verbose_name = 'Qidiruv hujjati'
+        verbose_name_plural = 'Qidiruv hujjatlari'
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
\ No newline at end of file
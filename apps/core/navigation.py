@@ -0,0 +1,69 @@
+from django.urls import NoReverseMatch, reverse
+
+from .models import NavbarMenu, FooterLink
+
+# Bu prefikslar bilan boshlangan havolalar URL nomi emas
+LITERAL_URL_PREFIXES = ('/', '#', '?', 'http://', 'https://', 'mailto:', 'tel:')
+
+
+def resolve_menu_url(url):
+    """URL nomi bo'lsa reverse() qilish, aks holda o'zini qaytarish"""
+    url = url.strip()
+    if not url or url.startswith(LITERAL_URL_PREFIXES):
+        return url
+
+    try:
+        return reverse(url)
+    except NoReverseMatch:
+        return url
+
+
+def build_navbar_tree():
+    """
+    Faol navbar elementlari daraxti (dict lar, har qanday chuqurlikda).
+
+    Barcha elementlar bitta so'rovda olinadi. Nofaol elementning bolalari
+    ham ko'rsatilmaydi.
+    """
+    items = NavbarMenu.objects.filter(is_active=True).order_by('order', 'id').values(
+        'id', 'parent_id', 'title', 'url', 'icon'
+    )
+
+    nodes = {}
+    children = {}
+    for item in items:
+        nodes[item['id']] = {
+            'id': item['id'],
+            'title': item['title'],
+            'url': resolve_menu_url(item['url']),
+            'icon': item['icon'],
+            'children': [],
+        }
+        children.setdefault(item['parent_id'], []).append(item['id'])
+
+    # Faqat ildizdan yetib boriladigan elementlar daraxtga kiradi
+    stack = [(None, node_id) for node_id in reversed(children.get(None, []))]
+    roots = []
+    while stack:
+        parent_id, node_id = stack.pop()
+        node = nodes[node_id]
+        (roots if parent_id is None else nodes[parent_id]['children']).append(node)
+        stack.extend((node_id, child_id) for child_id in reversed(children.get(node_id, [])))
+
+    return roots
+
+
+def build_footer_links():
+    """Faol footer linklar, ustunlar bo'yicha guruhlangan"""
+    links = FooterLink.objects.filter(is_active=True).order_by('column', 'order', 'id').values(
+        'title', 'url', 'column', 'open_new_tab'
+    )
+
+    footer_links = {}
+    for link in links:
+        footer_links.setdefault(link['column'], []).append({
+            'title': link['title'],
+            'url': resolve_menu_url(link['url']),
+            'open_new_tab': link['open_new_tab'],
+        })
+    return footer_links
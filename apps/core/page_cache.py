@@ -0,0 +1,97 @@
+"""
+Ochiq sahifalar uchun to'liq sahifa cache i (page shell).
+
+Sahifa anonim foydalanuvchi sifatida render qilinadi: CSRF token o'rniga
+placeholder yoziladi va natija katalog versiyasi, til va to'liq URL
+(query string bilan) bo'yicha cache ga saqlanadi. Har bir javobda
+placeholder shu foydalanuvchining o'z tokeni bilan almashtiriladi, shuning
+uchun CSRF cookie odatdagidek o'rnatiladi. Katalog o'zgarganda versiya
+(catalog.touch_catalog) bilan birga barcha sahifalar eskiradi.
+
+Kirgan foydalanuvchiga ham shu shell beriladi. Shaxsiy qismlar
+([data-fragment] elementlari) sahifa ochilgach fragments endpointi orqali
+to'ldiriladi (ESI uslubida, fragments.py). Xabarlari (messages) bor
+so'rovlar va staff foydalanuvchilar uchun sahifa odatdagidek render
+qilinadi.
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.translation import get_language
+
+from .catalog import catalog_timestamp, has_pending_messages
+from .site_chrome import get_site_chrome
+
+CSRF_PLACEHOLDER = '__page_cache_csrf_token__'
+PERSONALIZE_PLACEHOLDER = '__page_cache_personalize__'
+
+
+def is_shell_render(request):
+    """So'rov hozir cache uchun (anonim shell sifatida) render qilinmoqdami"""
+    return getattr(request, '_page_shell', False)
+
+
+def _cache_key(request):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page_cache:{catalog_timestamp():.6f}:{get_language()}:{path}'
+
+
+def _render_shell(view_func, request, args, kwargs):
+    user = request.user
+    request.user = AnonymousUser()
+    request._page_shell = True
+    try:
+        return view_func(request, *args, **kwargs)
+    finally:
+        request.user = user
+        request._page_shell = False
+
+
+def _serve(request, content, content_type, personalize):
+    """Shelldan shu foydalanuvchi uchun javob"""
+    content = content.replace(CSRF_PLACEHOLDER.encode(), get_token(request).encode())
+    content = content.replace(PERSONALIZE_PLACEHOLDER.encode(), b'true' if personalize else b'false')
+    return HttpResponse(content, content_type=content_type)
+
+
+def page_cache(view_func):
+    """Sahifani shell sifatida cache qilish uchun decorator"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        user = request.user
+        if request.method not in ('GET', 'HEAD') or user.is_staff or has_pending_messages(request):
+            return view_func(request, *args, **kwargs)
+
+        personalize = user.is_authenticated
+        # Chrome snapshot qurilsa katalog versiyasi o'zgaradi - kalitdan oldin
+        get_site_chrome(request)
+        key = _cache_key(request)
+        cached = cache.get(key)
+        status = 'HIT'
+
+        if cached is None:
+            status = 'MISS'
+            response = _render_shell(view_func, request, args, kwargs)
+            if response.status_code != 200 or response.streaming or response.cookies:
+                # Shell yaroqsiz (redirect, xato yoki cookie o'rnatilgan)
+                if personalize:
+                    return view_func(request, *args, **kwargs)
+                response.content = response.content.replace(
+                    CSRF_PLACEHOLDER.encode(), get_token(request).encode()
+                ).replace(PERSONALIZE_PLACEHOLDER.encode(), b'false')
+                return response
+
+            cached = (response.content, response['Content-Type'])
+            cache.set(key, cached, settings.PAGE_CACHE_TIMEOUT)
+
+        response = _serve(request, *cached, personalize=personalize)
+        response['X-Page-Cache'] = status
+        return response
+
+    return wrapper
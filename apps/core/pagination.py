@@ -0,0 +1,170 @@
+"""
+Keyset (cursor) pagination.
+
+OFFSET o'rniga oxirgi ko'rilgan qatorning tartiblash qiymatlari bo'yicha
+filtrlanadi (WHERE (created_at, id) < (...)), shuning uchun chuqur
+sahifalar ham birinchi sahifa kabi tez ochiladi va COUNT(*) kerak emas.
+
+Cursor - imzolangan (signing) token, foydalanuvchi uni o'zgartira olmaydi.
+Tartiblash maydonlari NULL bo'lmasligi va oxirgisi unikal (odatda id)
+bo'lishi kerak.
+"""
+import hashlib
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+CURSOR_PARAM = 'cursor'
+CURSOR_SALT = 'core.pagination.cursor'
+COUNT_CACHE_TIMEOUT = 300
+
+
+def cached_count(queryset, timeout=COUNT_CACHE_TIMEOUT):
+    """Taxminiy umumiy son: COUNT(*) natijasi so'rov matni bo'yicha cache qilinadi"""
+    sql, params = queryset.query.sql_with_params()
+    key = 'pagination_count:' + hashlib.md5(f'{sql}|{params}'.encode()).hexdigest()
+
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+class CursorPage:
+    """Bitta sahifa: obyektlar va oldingi/keyingi sahifa cursorlari"""
+    is_cursor = True
+
+    def __init__(self, object_list, next_cursor, previous_cursor, per_page, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.per_page = per_page
+        self.approximate_count = count
+        self.next_query = ''
+        self.previous_query = ''
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """
+    queryset ni ordering bo'yicha cursor bilan sahifalash.
+
+    ordering - masalan ('-created_at', '-id'); oxirgi maydon unikal bo'lishi kerak.
+    count - taxminiy umumiy son (int yoki callable), berilmasa hisoblanmaydi.
+    """
+
+    def __init__(self, queryset, ordering, per_page, count=None):
+        self.queryset = queryset
+        self.ordering = list(ordering)
+        self.per_page = per_page
+        self.count = count
+        self.fields = [field.lstrip('-') for field in self.ordering]
+
+    def _encode(self, obj, direction):
+        values = [
+            self.queryset.model._meta.get_field(field).value_to_string(obj)
+            for field in self.fields
+        ]
+        return signing.dumps([direction, values], salt=CURSOR_SALT, compress=True)
+
+    def _decode(self, cursor):
+        try:
+            direction, values = signing.loads(cursor, salt=CURSOR_SALT)
+            if direction not in ('next', 'prev') or len(values) != len(self.fields):
+                return None
+            return direction, [
+                self.queryset.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except (signing.BadSignature, ValueError, TypeError):
+            return None
+
+    def _keyset_filter(self, values, forward):
+        """(f1, f2, ...) tartibida berilgan qiymatlardan keyingi (yoki oldingi) qatorlar"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            descending = field.startswith('-')
+            lookup = 'lt' if descending == forward else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    @staticmethod
+    def _reverse(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    def get_page(self, cursor=None):
+        decoded = self._decode(cursor) if cursor else None
+        queryset = self.queryset
+
+        if decoded is None:
+            direction = 'next'
+            rows = list(queryset.order_by(*self.ordering)[:self.per_page + 1])
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            has_next, has_previous = has_more, False
+        else:
+            direction, values = decoded
+            forward = direction == 'next'
+            ordering = self.ordering if forward else [self._reverse(field) for field in self.ordering]
+            rows = list(
+                queryset.filter(self._keyset_filter(values, forward)).order_by(*ordering)[:self.per_page + 1]
+            )
+            has_more = len(rows) > self.per_page
+            rows = rows[:self.per_page]
+            if forward:
+                has_next, has_previous = has_more, True
+            else:
+                rows.reverse()
+                has_next, has_previous = True, has_more
+
+        count = self.count() if callable(self.count) else self.count
+        return CursorPage(
+            rows,
+            next_cursor=self._encode(rows[-1], 'next') if rows and has_next else None,
+            previous_cursor=self._encode(rows[0], 'prev') if rows and has_previous else None,
+            per_page=self.per_page,
+            count=count,
+        )
+
+
+def paginate(request, queryset, per_page, ordering, count=None):
+    """
+    View lar uchun: ?page= bo'lsa oddiy Paginator (eski havolalar ishlashi
+    uchun), aks holda cursor pagination. Cursor sahifasida next_query va
+    previous_query - boshqa GET parametrlari saqlangan tayyor havolalar.
+    """
+    if 'page' in request.GET:
+        return Paginator(queryset.order_by(*ordering), per_page).get_page(request.GET.get('page'))
+
+    page = CursorPaginator(queryset, ordering, per_page, count=count).get_page(request.GET.get(CURSOR_PARAM))
+
+    params = request.GET.copy()
+    params.pop('page', None)
+    for attr, cursor in (('next_query', page.next_cursor), ('previous_query', page.previous_cursor)):
+        if cursor:
+            params[CURSOR_PARAM] = cursor
+            setattr(page, attr, f'?{params.urlencode()}')
+    return page
@@ -0,0 +1,346 @@
+"""
+To'liq matnli qidiruv.
+
+Kurslar, darslar va savollar matni normallashtirilib (apps.core.text)
+SearchDocument jadvaliga yoziladi. Qidiruv backend bazaga qarab tanlanadi:
+- PostgreSQL: search_vector (tsvector, GIN indeks) + SearchRank
+- SQLite: FTS5 virtual jadvali + bm25
+- boshqalar: LIKE (tartiblashsiz)
+
+settings.SEARCH_BACKEND orqali boshqa backend ulash mumkin.
+"""
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+
+from .models import SearchDocument
+from .text import normalize_text, search_terms
+
+FTS_TABLE = 'core_searchdocument_fts'
+INDEX_BATCH_SIZE = 500
+
+
+class BaseSearchBackend:
+    """Backend interfeysi"""
+
+    def refresh_vectors(self, documents):
+        """Hujjatlar saqlangandan keyin backendga xos indeksni yangilash"""
+
+    def search(self, query, kinds=None):
+        """Rank bo'yicha tartiblangan, Paginator bilan ishlaydigan natijalar"""
+        raise NotImplementedError
+
+    def matching_ids(self, query, kind):
+        """Mos keladigan obyekt id lari (subquery sifatida ishlatish uchun)"""
+        raise NotImplementedError
+
+    def _documents(self, kinds=None):
+        documents = SearchDocument.objects.filter(is_active=True)
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        return documents
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    config = 'simple'
+
+    def _vector(self):
+        from django.contrib.postgres.search import SearchVector
+
+        return (
+            SearchVector('title', weight='A', config=self.config) +
+            SearchVector('body', weight='B', config=self.config)
+        )
+
+    def _query(self, query):
+        from django.contrib.postgres.search import SearchQuery
+
+        terms = search_terms(query)
+        if not terms:
+            return None
+        # Har bir so'z prefiks bo'yicha (AND)
+        return SearchQuery(' & '.join(f'{term}:*' for term in terms), search_type='raw', config=self.config)
+
+    def refresh_vectors(self, documents):
+        documents.update(search_vector=self._vector())
+
+    def search(self, query, kinds=None):
+        from django.contrib.postgres.search import SearchRank
+
+        search_query = self._query(query)
+        if search_query is None:
+            return SearchDocument.objects.none()
+
+        return self._documents(kinds).filter(search_vector=search_query).annotate(
+            rank=SearchRank(F('search_vector'), search_query)
+        ).order_by('-rank', 'id')
+
+    def matching_ids(self, query, kind):
+        search_query = self._query(query)
+        if search_query is None:
+            return SearchDocument.objects.none().values('object_id')
+        return self._documents([kind]).filter(search_vector=search_query).values('object_id')
+
+
+class SQLiteRankedResults:
+    """FTS5 natijalari: Paginator uchun count() va kesish (LIMIT/OFFSET)"""
+
+    def __init__(self, match, kinds=None):
+        self.match = match
+        self.kinds = list(kinds or [])
+
+    def _where(self):
+        sql = f'{FTS_TABLE} MATCH %s AND d.is_active'
+        params = [self.match]
+        if self.kinds:
+            sql += f" AND d.kind IN ({', '.join(['%s'] * len(self.kinds))})"
+            params += self.kinds
+        return sql, params
+
+    def count(self):
+        where, params = self._where()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT COUNT(*) FROM {FTS_TABLE} JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+                f'WHERE {where}',
+                params
+            )
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+
+        start = index.start or 0
+        limit = -1 if index.stop is None else max(index.stop - start, 0)
+        where, params = self._where()
+        with connection.cursor() as cursor:
+            # Sarlavhadagi moslik tanadagidan muhimroq
+            cursor.execute(
+                f'SELECT d.id, bm25({FTS_TABLE}, 10.0, 1.0) AS rank '
+                f'FROM {FTS_TABLE} JOIN core_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+                f'WHERE {where} ORDER BY rank, d.id LIMIT %s OFFSET %s',
+                params + [limit, start]
+            )
+            ranks = cursor.fetchall()
+
+        documents = SearchDocument.objects.in_bulk([document_id for document_id, _ in ranks])
+        results = []
+        for document_id, rank in ranks:
+            document = documents[document_id]
+            # bm25 - qanchalik kichik bo'lsa shunchalik mos
+            document.rank = -rank
+            results.append(document)
+        return results
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+
+    def _match(self, query):
+        terms = search_terms(query)
+        if not terms:
+            return None
+        # Har bir so'z qo'shtirnoqda (FTS5 sintaksisidan himoya), prefiks bo'yicha
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, query, kinds=None):
+        match = self._match(query)
+        if match is None:
+            return SearchDocument.objects.none()
+        return SQLiteRankedResults(match, kinds)
+
+    def matching_ids(self, query, kind):
+        match = self._match(query)
+        if match is None:
+            return SearchDocument.objects.none().values('object_id')
+        return self._documents([kind]).filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        ).values('object_id')
+
+
+class SimpleSearchBackend(BaseSearchBackend):
+    """Boshqa bazalar uchun: har bir so'z title yoki body da bo'lishi kerak"""
+
+    def _filter(self, query, kinds):
+        terms = search_terms(query)
+        if not terms:
+            return SearchDocument.objects.none()
+
+        documents = self._documents(kinds)
+        for term in terms:
+            documents = documents.filter(Q(title__contains=term) | Q(body__contains=term))
+        return documents
+
+    def search(self, query, kinds=None):
+        return self._filter(query, kinds).order_by('id')
+
+    def matching_ids(self, query, kind):
+        return self._filter(query, [kind]).values('object_id')
+
+
+_backend = None
+
+
+def get_search_backend():
+    """Sozlamalar yoki baza turiga qarab backend"""
+    global _backend
+
+    if _backend is None:
+        backend_path = getattr(settings, 'SEARCH_BACKEND', None)
+        if backend_path:
+            _backend = import_string(backend_path)()
+        elif connection.vendor == 'postgresql':
+            _backend = PostgresSearchBackend()
+        elif connection.vendor == 'sqlite':
+            _backend = SQLiteSearchBackend()
+        else:
+            _backend = SimpleSearchBackend()
+    return _backend
+
+
+def search(query, kinds=None):
+    return get_search_backend().search(query, kinds)
+
+
+def attach_objects(documents):
+    """Hujjatlarga asl obyektlarni (kurs, dars, savol) biriktirish"""
+    from apps.courses.models import Course
+    from apps.lessons.models import Lesson
+    from apps.quizzes.models import Question
+
+    querysets = {
+        'course': Course.objects.select_related('instructor'),
+        'lesson': Lesson.objects.select_related('course'),
+        'question': Question.objects.select_related('quiz__lesson__course'),
+    }
+
+    ids_by_kind = {}
+    for document in documents:
+        ids_by_kind.setdefault(document.kind, []).append(document.object_id)
+
+    objects = {
+        kind: querysets[kind].in_bulk(ids)
+        for kind, ids in ids_by_kind.items()
+    }
+
+    results = []
+    for document in documents:
+        document.object = objects[document.kind].get(document.object_id)
+        if document.object is not None:
+            results.append(document)
+    return results
+
+
+# Indekslash
+def course_document(course):
+    return SearchDocument(
+        kind='course',
+        object_id=course.pk,
+        course_id=course.pk,
+        title=normalize_text(course.title),
+        body=normalize_text(course.description),
+        is_active=course.is_active,
+    )
+
+
+def lesson_document(lesson, is_active):
+    return SearchDocument(
+        kind='lesson',
+        object_id=lesson.pk,
+        course_id=lesson.course_id,
+        title=normalize_text(lesson.title),
+        body=normalize_text(f'{lesson.description}\n{lesson.content}'),
+        is_active=is_active,
+    )
+
+
+def question_document(question, course_id, is_active):
+    return SearchDocument(
+        kind='question',
+        object_id=question.pk,
+        course_id=course_id,
+        title=normalize_text(question.text),
+        is_active=is_active,
+    )
+
+
+def index_documents(documents):
+    """Hujjatlarni upsert qilish va backend indeksini yangilash"""
+    if not documents:
+        return 0
+
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=INDEX_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['kind', 'object_id'],
+        update_fields=['course_id', 'title', 'body', 'is_active'],
+    )
+
+    backend = get_search_backend()
+    ids_by_kind = {}
+    for document in documents:
+        ids_by_kind.setdefault(document.kind, []).append(document.object_id)
+    for kind, ids in ids_by_kind.items():
+        backend.refresh_vectors(SearchDocument.objects.filter(kind=kind, object_id__in=ids))
+    return len(documents)
+
+
+def remove_documents(kind, object_ids):
+    return SearchDocument.objects.filter(kind=kind, object_id__in=object_ids).delete()[0]
+
+
+def set_course_active(course_id, is_active):
+    """Kurs holati o'zgarganda uning barcha hujjatlarini yangilash"""
+    return SearchDocument.objects.filter(course_id=course_id).exclude(is_active=is_active).update(
+        is_active=is_active
+    )
+
+
+def move_question_documents(questions, course_id, is_active):
+    """Dars yoki test boshqa kursga ko'chirilganda savollar hujjatlarini yangilash"""
+    return SearchDocument.objects.filter(
+        kind='question', object_id__in=questions.values('pk')
+    ).exclude(course_id=course_id, is_active=is_active).update(course_id=course_id, is_active=is_active)
+
+
+def rebuild_search_index():
+    """Indeksni noldan qurish, (kurslar, darslar, savollar) sonini qaytaradi"""
+    from apps.courses.models import Course
+    from apps.lessons.models import Lesson
+    from apps.quizzes.models import Question
+
+    SearchDocument.objects.all().delete()
+
+    counts = []
+    course_active = dict(Course.objects.values_list('pk', 'is_active'))
+
+    counts.append(_index_in_batches(
+        course_document(course) for course in Course.objects.iterator(chunk_size=INDEX_BATCH_SIZE)
+    ))
+    counts.append(_index_in_batches(
+        lesson_document(lesson, course_active[lesson.course_id])
+        for lesson in Lesson.objects.iterator(chunk_size=INDEX_BATCH_SIZE)
+    ))
+    questions = Question.objects.select_related('quiz__lesson').iterator(chunk_size=INDEX_BATCH_SIZE)
+    counts.append(_index_in_batches(
+        question_document(question, question.quiz.lesson.course_id, course_active[question.quiz.lesson.course_id])
+        for question in questions
+    ))
+    return tuple(counts)
+
+
+def _index_in_batches(documents):
+    total = 0
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= INDEX_BATCH_SIZE:
+            total += index_documents(batch)
+            batch = []
+    return total + index_documents(batch)
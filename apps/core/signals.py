@@ -0,0 +1,133 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import (
+    SiteSettings, SocialNetworks, HeaderSettings,
+    FooterSettings, NavbarMenu, FooterLink, SEOPage, Testimonial, SearchDocument
+)
+from .search import (
+    course_document, lesson_document, question_document,
+    index_documents, remove_documents, set_course_active, move_question_documents
+)
+from .site_chrome import rebuild_site_chrome
+from .autocomplete import refresh_index
+from .catalog import touch_catalog, touch_catalog_for_enrollment
+from apps.courses.models import Course, Enrollment
+from apps.lessons.models import Lesson
+from apps.quizzes.models import Question, Quiz
+
+
+@receiver([post_save, post_delete], sender=SiteSettings)
+@receiver([post_save, post_delete], sender=SocialNetworks)
+@receiver([post_save, post_delete], sender=HeaderSettings)
+@receiver([post_save, post_delete], sender=FooterSettings)
+@receiver([post_save, post_delete], sender=NavbarMenu)
+@receiver([post_save, post_delete], sender=FooterLink)
+@receiver([post_save, post_delete], sender=SEOPage)
+@receiver([post_save, post_delete], sender=Testimonial)
+def rebuild_site_chrome_on_change(sender, **kwargs):
+    """
+    Sayt sozlamalari, menyular yoki sharhlar o'zgarganda chrome snapshotni
+    tranzaksiya tugagach darhol qayta qurish (warm-on-write)
+    """
+    transaction.on_commit(rebuild_site_chrome)
+
+
+# Qidiruv indeksi
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, **kwargs):
+    """Kurs saqlanganda qidiruv indeksini yangilash"""
+    index_documents([course_document(instance)])
+    set_course_active(instance.pk, instance.is_active)
+
+
+@receiver(post_init, sender=Lesson)
+def remember_lesson_course(sender, instance, **kwargs):
+    instance._search_course_id = instance.__dict__.get('course_id')
+    instance._autocomplete_state = _autocomplete_state(instance)
+
+
+@receiver(post_save, sender=Lesson)
+def index_lesson(sender, instance, **kwargs):
+    """Dars saqlanganda qidiruv indeksini, kursi o'zgarsa savollarini ham yangilash"""
+    is_active = bool(Course.objects.filter(pk=instance.course_id).values_list('is_active', flat=True).first())
+    index_documents([lesson_document(instance, is_active)])
+    if instance._search_course_id != instance.course_id:
+        move_question_documents(Question.objects.filter(quiz__lesson=instance), instance.course_id, is_active)
+    instance._search_course_id = instance.course_id
+
+
+@receiver(post_save, sender=Quiz)
+def move_quiz_questions(sender, instance, created, **kwargs):
+    """Test boshqa darsga (va kursga) ko'chirilganda savollar hujjatlarini yangilash"""
+    if created:
+        return
+    course = Course.objects.filter(lessons=instance.lesson_id).values('pk', 'is_active').first()
+    if course:
+        move_question_documents(instance.questions.all(), course['pk'], course['is_active'])
+
+
+@receiver(post_save, sender=Question)
+def index_question(sender, instance, **kwargs):
+    """Savol saqlanganda qidiruv indeksini yangilash"""
+    course = Course.objects.filter(lessons__quizzes=instance.quiz_id).values('pk', 'is_active').first()
+    if course:
+        index_documents([question_document(instance, course['pk'], course['is_active'])])
+
+
+@receiver(post_delete, sender=Course)
+def remove_course_documents(sender, instance, **kwargs):
+    """Kurs o'chirilganda uning barcha hujjatlarini o'chirish"""
+    SearchDocument.objects.filter(course_id=instance.pk).delete()
+
+
+@receiver(post_delete, sender=Lesson)
+def remove_lesson_document(sender, instance, **kwargs):
+    remove_documents('lesson', [instance.pk])
+
+
+@receiver(post_delete, sender=Question)
+def remove_question_document(sender, instance, **kwargs):
+    remove_documents('question', [instance.pk])
+
+
+# Avtoto'ldirish indeksi
+def _autocomplete_state(instance):
+    """Indeksga kiradigan maydonlar (kurs uchun holati, dars uchun kursi)"""
+    extra = 'is_active' if isinstance(instance, Course) else 'course_id'
+    return instance.__dict__.get('title'), instance.__dict__.get(extra)
+
+
+@receiver(post_init, sender=Course)
+def remember_course_autocomplete_state(sender, instance, **kwargs):
+    instance._autocomplete_state = _autocomplete_state(instance)
+
+
+@receiver(post_save, sender=Course)
+@receiver(post_save, sender=Lesson)
+def refresh_autocomplete_on_save(sender, instance, created, **kwargs):
+    """Sarlavha, kurs holati yoki darsning kursi o'zgargandagina qayta qurish"""
+    state = _autocomplete_state(instance)
+    if created or state != instance._autocomplete_state:
+        transaction.on_commit(refresh_index)
+    instance._autocomplete_state = state
+
+
+@receiver(post_delete, sender=Course)
+@receiver(post_delete, sender=Lesson)
+def refresh_autocomplete_on_delete(sender, **kwargs):
+    transaction.on_commit(refresh_index)
+
+
+# Katalog versiyasi (ETag / Last-Modified)
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Lesson)
+def touch_catalog_on_change(sender, **kwargs):
+    """Kurs yoki dars o'zgarganda katalog sahifalari eskiradi"""
+    transaction.on_commit(touch_catalog)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def touch_catalog_on_enrollment(sender, **kwargs):
+    """Talabalar soni biroz kechikib (CATALOG_CACHE_S_MAXAGE gacha) yangilanadi"""
+    transaction.on_commit(touch_catalog_for_enrollment)
@@ -0,0 +1,127 @@
+"""
+Saytning umumiy "chrome" qismi (header, footer, menyular, sozlamalar,
+hisoblagichlar) uchun yagona snapshot.
+
+Snapshot bir marta quriladi va umumiy cache ga versiya bilan yoziladi.
+Har bir process oxirgi snapshotni xotirada (memo) saqlaydi, shuning uchun
+sahifa render qilinganda cache ga faqat versiyani tekshirish uchun bitta
+murojaat bo'ladi. Admin sozlamalarni o'zgartirganda versiya yangilanadi va
+barcha processlar keyingi so'rovda yangi snapshotni oladi.
+
+Model o'zgarganda snapshot darhol qayta quriladi va yangi versiya bilan
+yoziladi (warm-on-write), shuning uchun o'zgarish darhol ko'rinadi va cache
+hech qachon bo'sh qolmaydi. Cache tozalanib ketsa faqat bitta process
+snapshotni quradi, qolganlari eski memo bilan ishlashda davom etadi.
+
+Versiya barcha processlarga faqat umumiy cache (settings.CACHES, prod da
+Redis) orqali yetadi; LocMem da har bir process o'z nusxasini ko'radi.
+"""
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import (
+    SiteSettings, SocialNetworks, HeaderSettings,
+    FooterSettings, SEOPage, Testimonial
+)
+from .navigation import build_navbar_tree, build_footer_links
+from .catalog import touch_catalog
+
+VERSION_KEY = 'site_chrome:version'
+BUILD_LOCK_KEY = 'site_chrome:build_lock'
+BUILD_LOCK_TIMEOUT = 30
+
+# Process ichidagi memo: (versiya, snapshot)
+_memo = (None, None)
+
+
+def _snapshot_key(version):
+    return f'site_chrome:snapshot:{version}'
+
+
+def build_site_chrome():
+    """Snapshotni bazadan qurish"""
+    from apps.courses.models import Course
+    from apps.accounts.models import User
+    from apps.lessons.models import Lesson
+
+    site_config = SiteSettings.objects.first()
+
+    return {
+        'site_settings': site_config,
+        'social_networks': SocialNetworks.objects.first(),
+        'header_settings': HeaderSettings.objects.first(),
+        'footer_settings': FooterSettings.objects.first(),
+        'navbar_menu': build_navbar_tree(),
+        'footer_links': build_footer_links(),
+        'seo_pages': {page.page_name: page for page in SEOPage.objects.all()},
+        'testimonials': list(Testimonial.objects.filter(is_active=True)),
+        'default_meta': {
+            'title': site_config.site_name if site_config else 'Tibbiy Ta\'lim Platformasi',
+            'description': site_config.site_description if site_config else 'Professional tibbiy ta\'lim',
+            'keywords': site_config.site_keywords if site_config else 'tibbiyot, ta\'lim, kurs',
+        },
+        'maintenance_mode': site_config.site_maintenance if site_config else False,
+        'registration_open': site_config.registration_open if site_config else True,
+        'counters': {
+            'total_courses': Course.objects.filter(is_active=True).count(),
+            'total_students': User.objects.filter(role='student', is_active=True).count(),
+            'total_teachers': User.objects.filter(role='teacher', is_active=True).count(),
+            'total_lessons': Lesson.objects.count(),
+        },
+    }
+
+
+def _publish(snapshot):
+    """Snapshotni yangi versiya bilan cache ga yozish"""
+    global _memo
+
+    timeout = settings.SITE_CHROME_TIMEOUT
+    version = uuid.uuid4().hex
+
+    # Avval snapshot, keyin versiya - o'quvchilar snapshotsiz versiyani ko'rmaydi
+    cache.set(_snapshot_key(version), snapshot, timeout)
+    cache.set(VERSION_KEY, version, timeout)
+    _memo = (version, snapshot)
+    # Chrome barcha katalog sahifalarida bor
+    touch_catalog()
+    return snapshot
+
+
+def get_site_chrome(request=None):
+    """
+    Joriy snapshot. Odatiy holatda cache ga bitta murojaat (versiya),
+    snapshot esa process memo sidan olinadi. request berilsa so'rov
+    davomida versiya qayta tekshirilmaydi.
+    """
+    global _memo
+
+    if request is not None and hasattr(request, '_site_chrome'):
+        return request._site_chrome
+
+    version = cache.get(VERSION_KEY)
+    memo_version, snapshot = _memo
+
+    if version is None or version != memo_version:
+        cached = cache.get(_snapshot_key(version)) if version is not None else None
+        if cached is not None:
+            snapshot = cached
+            _memo = (version, snapshot)
+        elif cache.add(BUILD_LOCK_KEY, True, BUILD_LOCK_TIMEOUT):
+            try:
+                snapshot = _publish(build_site_chrome())
+            finally:
+                cache.delete(BUILD_LOCK_KEY)
+        elif snapshot is None:
+            # Boshqa process qurmoqda, lekin bu processda hali hech narsa yo'q
+            snapshot = build_site_chrome()
+
+    if request is not None:
+        request._site_chrome = snapshot
+    return snapshot
+
+
+def rebuild_site_chrome():
+    """Snapshotni darhol qayta qurish va barcha processlarga e'lon qilish"""
+    return _publish(build_site_chrome())
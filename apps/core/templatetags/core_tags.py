@@ -1,25 +1,32 @@
 from django import template
 from django.conf import settings
-from apps.core.models import SiteSettings
+from apps.core.site_chrome import get_site_chrome
 
 register = template.Library()
 
 
-@register.simple_tag
-def site_name():
+def _site_settings(context):
+    """Context processor qo'ygan sozlamalar (bo'lmasa chrome snapshotdan)"""
+    if 'site_settings' in context:
+        return context['site_settings']
+    return get_site_chrome()['site_settings']
+
+
+@register.simple_tag(takes_context=True)
+def site_name(context):
     """Sayt nomi"""
     try:
-        site_settings = SiteSettings.objects.first()
+        site_settings = _site_settings(context)
         return site_settings.site_name if site_settings else 'Tibbiy Ta\'lim Platformasi'
     except:
         return 'Tibbiy Ta\'lim Platformasi'
 
 
-@register.simple_tag
-def site_logo():
+@register.simple_tag(takes_context=True)
+def site_logo(context):
     """Sayt logosi"""
     try:
-        site_settings = SiteSettings.objects.first()
+        site_settings = _site_settings(context)
         if site_settings and site_settings.site_logo:
             return site_settings.site_logo.url
     except:
@@ -1,3 +1,338 @@
+import time
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.courses.models import Course, Enrollment
+from apps.lessons.models import Lesson, LessonProgress
+from apps.quizzes.models import Question, Quiz, QuizAttempt
+from . import autocomplete, catalog
+from .page_cache import CSRF_PLACEHOLDER, PERSONALIZE_PLACEHOLDER
+from .pagination import CursorPaginator
+from .site_chrome import get_site_chrome
+from .viewer_state import get_viewer_state
+from .models import FooterLink, NavbarMenu, SearchDocument, SiteSettings
+from .navigation import build_footer_links, build_navbar_tree
+
+
+class SearchIndexTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.other = Course.objects.create(
+            title='Fiziologiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4, is_active=False
+        )
+        self.lesson = Lesson.objects.create(course=self.course, title='1-dars')
+        self.quiz = Quiz.objects.create(lesson=self.lesson, title='Test')
+        self.question = Question.objects.create(quiz=self.quiz, text='Yurak nechta kameradan iborat?', order=1)
+
+    def _question_document(self):
+        return SearchDocument.objects.values_list('course_id', 'is_active').get(
+            kind='question', object_id=self.question.pk
+        )
+
+    def test_moving_lesson_reindexes_questions(self):
+        self.assertEqual(self._question_document(), (self.course.pk, True))
+
+        lesson = Lesson.objects.get(pk=self.lesson.pk)
+        lesson.course = self.other
+        lesson.save()
+
+        self.assertEqual(self._question_document(), (self.other.pk, False))
+
+    def test_moving_quiz_reindexes_questions(self):
+        lesson = Lesson.objects.create(course=self.other, title='2-dars')
+
+        self.quiz.lesson = lesson
+        self.quiz.save()
+
+        self.assertEqual(self._question_document(), (self.other.pk, False))
+
+
+class CatalogVersionTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.students = [
+            User.objects.create_user(username=f'student{i}', password='pw', role='student') for i in range(2)
+        ]
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        cache.set(catalog.LAST_MODIFIED_KEY, 0, None)
+
+    def _enroll(self, student):
+        with self.captureOnCommitCallbacks(execute=True):
+            Enrollment.objects.create(student=student, course=self.course)
+
+    def test_enrollments_touch_catalog_once_per_interval(self):
+        self._enroll(self.students[0])
+        first_touch = catalog.catalog_timestamp()
+        self.assertGreater(first_touch, 0)
+
+        cache.set(catalog.LAST_MODIFIED_KEY, 0, None)
+        self._enroll(self.students[1])
+        self.assertEqual(catalog.catalog_timestamp(), 0)
+
+    def test_pending_enrollment_touches_after_interval(self):
+        self._enroll(self.students[0])
+        cache.set(catalog.LAST_MODIFIED_KEY, 0, None)
+        self._enroll(self.students[1])
+
+        # Oraliq tugadi
+        cache.delete(catalog.ENROLLMENT_TOUCH_KEY)
+
+        self.assertGreater(catalog.catalog_timestamp(), 0)
+        self.assertIsNone(cache.get(catalog.ENROLLMENT_PENDING_KEY))
+
+
+class AutocompleteIndexTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course = Course.objects.create(
+            title='Anatomiya asoslari', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+
+    def _save(self, course):
+        with mock.patch('apps.core.signals.refresh_index') as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                course.save()
+        return refresh.call_count
+
+    def test_rebuilt_only_when_indexed_fields_change(self):
+        course = Course.objects.get(pk=self.course.pk)
+
+        course.description = 'Yangi tavsif'
+        self.assertEqual(self._save(course), 0)
+
+        course.title = 'Anatomiya 2'
+        self.assertEqual(self._save(course), 1)
+
+        course.is_active = False
+        self.assertEqual(self._save(course), 1)
+
+    def test_popularity_refreshed_after_max_age(self):
+        autocomplete.refresh_index()
+        Course.objects.filter(pk=self.course.pk).update(student_count=5)
+        self.assertEqual(autocomplete.get_index().entries[0]['popularity'], 0)
+
+        with mock.patch.object(autocomplete.time, 'monotonic', return_value=time.monotonic() + autocomplete.MAX_AGE):
+            self.assertEqual(autocomplete.get_index().entries[0]['popularity'], 5)
+
+
+class CursorPaginationTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        for number in range(5):
+            Course.objects.create(
+                title=f'{number}-kurs', description='Kurs', instructor=teacher,
+                level='beginner', duration_weeks=4
+            )
+        # Hammasi bir vaqtda - tartib faqat id bo'yicha ajraladi
+        Course.objects.update(created_at=timezone.now())
+        self.ids = list(Course.objects.order_by('-id').values_list('pk', flat=True))
+        self.paginator = CursorPaginator(Course.objects.all(), ('-created_at', '-id'), per_page=2)
+
+    def _ids(self, page):
+        return [course.pk for course in page]
+
+    def test_cursor_round_trip(self):
+        course = Course.objects.get(pk=self.ids[0])
+        cursor = self.paginator._encode(course, 'next')
+
+        self.assertEqual(self.paginator._decode(cursor), ('next', [course.created_at, course.pk]))
+
+    def test_pages_split_ties_by_id(self):
+        first = self.paginator.get_page()
+        second = self.paginator.get_page(first.next_cursor)
+        third = self.paginator.get_page(second.next_cursor)
+
+        self.assertEqual(self._ids(first) + self._ids(second) + self._ids(third), self.ids)
+        self.assertFalse(third.has_next())
+        self.assertEqual(self._ids(self.paginator.get_page(third.previous_cursor)), self._ids(second))
+
+    def test_tampered_cursor_falls_back_to_first_page(self):
+        cursor = self.paginator.get_page().next_cursor
+
+        page = self.paginator.get_page(cursor[:-2] + 'xx')
+
+        self.assertEqual(self._ids(page), self.ids[:2])
+        self.assertFalse(page.has_previous())
+
+
+class ViewerStateTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.lessons = [Lesson.objects.create(course=self.course, title=f'{i}-dars', order=i) for i in range(1, 4)]
+        LessonProgress.objects.create(student=self.student, lesson=self.lessons[0], is_completed=True)
+        Enrollment.objects.create(student=self.student, course=self.course)
+        self.quiz = Quiz.objects.create(lesson=self.lessons[0], title='Test')
+        now = timezone.now()
+        for score in (40, 90, 60):
+            QuizAttempt.objects.create(
+                student=self.student, quiz=self.quiz, score=score, is_passed=score >= 70, completed_at=now
+            )
+
+    def test_one_query_per_course_and_lesson(self):
+        state = get_viewer_state(self.student)
+
+        # Darslar progressi - kurs bo'yicha bitta so'rov
+        with self.assertNumQueries(1):
+            completed = [bool(state.lesson_progress(lesson)) for lesson in self.lessons]
+        self.assertEqual(completed, [True, False, False])
+
+        # Urinishlar - dars bo'yicha bitta so'rov
+        with self.assertNumQueries(1):
+            summary = state.quiz_summary(self.quiz)
+            state.quiz_summary(self.quiz)
+        self.assertEqual((summary['attempts_count'], summary['best_attempt'].score), (3, 90))
+        self.assertTrue(summary['is_passed'])
+
+    def test_state_is_shared_for_the_same_user_object(self):
+        self.assertIs(get_viewer_state(self.student), get_viewer_state(self.student))
+        self.assertTrue(get_viewer_state(self.student).is_enrolled(self.course))
+
+
+class SiteChromeTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        SiteSettings.objects.create(site_name='Tibbiyot', site_keywords='tibbiyot')
+
+    def test_warm_snapshot_needs_no_queries(self):
+        get_site_chrome()
+
+        with self.assertNumQueries(0):
+            chrome = get_site_chrome()
+
+        self.assertEqual(chrome['default_meta']['title'], 'Tibbiyot')
+
+    def test_snapshot_rebuilt_after_commit(self):
+        get_site_chrome()
+        site_config = SiteSettings.objects.get()
+        site_config.site_name = 'Yangi nom'
+
+        with self.captureOnCommitCallbacks(execute=True):
+            site_config.save()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_site_chrome()['site_settings'].site_name, 'Yangi nom')
+
+
+class NavigationTreeTests(TestCase):
+
+    def test_nested_tree_in_one_query(self):
+        courses = NavbarMenu.objects.create(title='Kurslar', url='/courses/', order=2)
+        about = NavbarMenu.objects.create(title='Biz haqimizda', url='core:about', order=1)
+        hidden = NavbarMenu.objects.create(title='Yashirin', url='#', parent=courses, is_active=False)
+        NavbarMenu.objects.create(title='Ichki', url='#', parent=hidden)
+        child = NavbarMenu.objects.create(title='Anatomiya', url='/courses/1/', parent=courses)
+        NavbarMenu.objects.create(title='Bo\'lim', url='no-such-url', parent=child)
+
+        with self.assertNumQueries(1):
+            tree = build_navbar_tree()
+
+        self.assertEqual([(node['title'], node['url']) for node in tree], [
+            ('Biz haqimizda', reverse('core:about')), ('Kurslar', '/courses/')
+        ])
+        # Nofaol element bolalari bilan birga yashiriladi
+        self.assertEqual([node['title'] for node in tree[1]['children']], ['Anatomiya'])
+        self.assertEqual(tree[1]['children'][0]['children'][0]['url'], 'no-such-url')
+
+    def test_footer_links_grouped_by_column(self):
+        FooterLink.objects.create(title='Yordam', url='/help/', column='support')
+        FooterLink.objects.create(title='Biz', url='core:about', column='company', order=2)
+        FooterLink.objects.create(title='Bosh sahifa', url='core:home', column='company', order=1)
+
+        links = build_footer_links()
+
+        self.assertEqual([link['url'] for link in links['company']], [reverse('core:home'), reverse('core:about')])
+        self.assertEqual(list(links), ['company', 'support'])
+
+
+class CatalogConditionalGetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.url = reverse('courses:list')
+
+    def test_not_modified_until_catalog_changes(self):
+        # Birinchi javob CSRF cookie ni o'rnatadi, ETag unga bog'liq
+        self.client.get(self.url)
+        response = self.client.get(self.url)
+        etag = response['ETag']
+        self.assertIn('public', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.create(
+                title='Anatomiya', description='Kurs', instructor=self.teacher,
+                level='beginner', duration_weeks=4
+            )
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_logged_in_page_is_private(self):
+        etag = self.client.get(self.url)['ETag']
+        self.client.login(username='teacher', password='pw')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('private', response['Cache-Control'])
+
+
+class PageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        User.objects.create_user(username='student', password='pw', role='student')
+        self.url = reverse('core:faq')
+
+    def test_shell_cached_until_catalog_changes(self):
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SiteSettings.objects.create(site_name='Tibbiyot', site_keywords='tibbiyot')
+
+        self.assertEqual(self.client.get(self.url)['X-Page-Cache'], 'MISS')
+
+    def test_placeholders_filled_per_request(self):
+        self.client.get(self.url)
+        self.client.login(username='student', password='pw')
+
+        response = self.client.get(self.url)
 
-# Create your tests here.
+        self.assertEqual(response['X-Page-Cache'], 'HIT')
+        content = response.content.decode()
+        self.assertNotIn(CSRF_PLACEHOLDER, content)
+        self.assertNotIn(PERSONALIZE_PLACEHOLDER, content)
+        self.assertNotIn('student', content)
@@ -0,0 +1,39 @@
+import re
+
+# O'zbek kirill -> lotin (qidiruv indeksi uchun, apostroflarsiz)
+CYRILLIC_TO_LATIN = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya', 'ў': 'o', 'қ': 'q',
+    'ғ': 'g', 'ҳ': 'h',
+}
+
+# o', g', ta'lim: barcha apostrof ko'rinishlari olib tashlanadi
+APOSTROPHES = "'`ʻʼ‘’ʹ"
+
+_WORD_START_E = re.compile(r'(?<![^\W\d_])е')
+_APOSTROPHE_RE = re.compile(f'[{APOSTROPHES}]')
+_WORD_RE = re.compile(r'\w+')
+
+
+def normalize_text(text):
+    """
+    Qidiruv uchun matnni bir xil ko'rinishga keltirish: kichik harf,
+    kirill -> lotin, apostroflarsiz. "Oʻzbek", "O'zbek" va "Ўзбек" bir xil
+    "ozbek" bo'ladi.
+    """
+    if not text:
+        return ''
+
+    text = text.lower()
+    # So'z boshidagi "е" - "ye"
+    text = _WORD_START_E.sub('ye', text)
+    text = ''.join(CYRILLIC_TO_LATIN.get(char, char) for char in text)
+    return _APOSTROPHE_RE.sub('', text)
+
+
+def search_terms(text):
+    """Normallashtirilgan so'zlar ro'yxati"""
+    return _WORD_RE.findall(normalize_text(text))
@@ -17,6 +17,8 @@ urlpatterns = [
 
     # AJAX endpoints
     path('newsletter/subscribe/', views.newsletter_subscribe, name='newsletter_subscribe'),
+    path('search/autocomplete/', views.autocomplete_view, name='autocomplete'),
+    path('fragments/', views.fragments_view, name='fragments'),
 
     # Texnik sahifalar
     path('maintenance/', views.maintenance_view, name='maintenance'),
@@ -0,0 +1,119 @@
+from apps.courses.enrollment_state import get_enrollment_state
+from apps.lessons.models import LessonProgress
+from apps.quizzes.models import QuizAttempt
+
+
+def _pk(obj):
+    """Model yoki id dan primary key olish"""
+    return getattr(obj, 'pk', obj)
+
+
+class ViewerState:
+    """
+    So'rov davomidagi foydalanuvchi holati (DataLoader uslubida).
+
+    Template filterlar har bir obyekt uchun alohida so'rov yubormasligi uchun
+    ma'lumotlar guruhlab yuklanadi va shu yerda saqlanadi:
+    - Enrollment: foydalanuvchining barcha yozilishlari cache dan
+      (enrollment_state.py, so'rovsiz)
+    - LessonProgress: kurs bo'yicha bitta so'rovda
+    - QuizAttempt: dars bo'yicha bitta so'rovda
+    """
+
+    def __init__(self, user):
+        self.user = user
+        self._enrollments = None
+        self._lesson_progress = {}
+        self._quiz_summaries = {}
+        self._quiz_lessons = set()
+
+    # Enrollment
+    def _load_enrollments(self):
+        if self._enrollments is None:
+            self._enrollments = get_enrollment_state(self.user.pk)
+        return self._enrollments
+
+    def enrollment(self, course):
+        """Kursga yozilish (CachedEnrollment: progress, completed_lessons, is_completed) yoki None"""
+        return self._load_enrollments().get(_pk(course))
+
+    def is_enrolled(self, course):
+        return self.enrollment(course) is not None
+
+    def course_progress(self, course):
+        enrollment = self.enrollment(course)
+        return enrollment.progress if enrollment else 0
+
+    # Lesson progress
+    def _load_course_progress(self, course_id):
+        if course_id not in self._lesson_progress:
+            self._lesson_progress[course_id] = {
+                progress.lesson_id: progress
+                for progress in LessonProgress.objects.filter(
+                    student=self.user,
+                    lesson__course_id=course_id
+                )
+            }
+        return self._lesson_progress[course_id]
+
+    def lesson_progress(self, lesson):
+        """Dars progressi (yoki None)"""
+        return self._load_course_progress(lesson.course_id).get(lesson.pk)
+
+    def completed_lessons_count(self, course):
+        enrollment = self.enrollment(course)
+        return enrollment.completed_lessons if enrollment else 0
+
+    # Quiz attempts
+    def _load_lesson_attempts(self, lesson_id):
+        if lesson_id in self._quiz_lessons:
+            return
+        self._quiz_lessons.add(lesson_id)
+
+        attempts = QuizAttempt.objects.filter(
+            student=self.user,
+            quiz__lesson_id=lesson_id
+        )
+        for attempt in attempts:
+            summary = self._quiz_summaries.setdefault(attempt.quiz_id, {
+                'attempts_count': 0,
+                'best_attempt': None,
+                'latest_attempt': None,
+                'is_passed': False,
+            })
+
+            if attempt.is_passed:
+                summary['is_passed'] = True
+
+            if attempt.completed_at is None:
+                continue
+
+            summary['attempts_count'] += 1
+            best = summary['best_attempt']
+            if best is None or attempt.score > best.score:
+                summary['best_attempt'] = attempt
+            latest = summary['latest_attempt']
+            if latest is None or attempt.started_at > latest.started_at:
+                summary['latest_attempt'] = attempt
+
+    def quiz_summary(self, quiz):
+        """Test bo'yicha urinishlar xulosasi (yoki None)"""
+        self._load_lesson_attempts(quiz.lesson_id)
+        return self._quiz_summaries.get(quiz.pk)
+
+
+def get_viewer_state(user):
+    """
+    Foydalanuvchi uchun ViewerState.
+
+    request.user har bir so'rov uchun yangi yaratiladi, shuning uchun holat
+    aynan shu obyektda saqlanadi va so'rov tugagach o'zi yo'qoladi.
+    """
+    if not user or not user.is_authenticated:
+        return None
+
+    state = getattr(user, '_viewer_state', None)
+    if state is None:
+        state = ViewerState(user)
+        user._viewer_state = state
+    return state
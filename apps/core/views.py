@@ -2,33 +2,35 @@ from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
+from django.views.decorators.cache import never_cache
 from django.core.paginator import Paginator
-from django.db.models import Count
 
 from apps.courses.models import Course
 from apps.accounts.models import User
-from apps.lessons.models import Lesson
-from .models import Testimonial, Newsletter
+from .models import Newsletter, SearchDocument
+from .search import search, attach_objects
+from .autocomplete import autocomplete, DEFAULT_LIMIT
+from .site_chrome import get_site_chrome
+from .catalog import catalog_page
+from .page_cache import page_cache
+from .fragments import render_fragments
 from .forms import NewsletterForm, ContactForm
 
 
+@catalog_page
+@page_cache
 def home_view(request):
     """Bosh sahifa"""
     # Featured kurslar (eng mashhur 6 ta)
-    featured_courses = Course.objects.filter(is_active=True).annotate(
-        student_count=Count('enrollment')
-    ).order_by('-student_count')[:6]
+    featured_courses = Course.objects.filter(is_active=True).order_by('-student_count')[:6]
+
+    chrome = get_site_chrome(request)
 
     # Featured testimonials
-    testimonials = Testimonial.objects.filter(is_active=True, is_featured=True)[:6]
+    testimonials = [testimonial for testimonial in chrome['testimonials'] if testimonial.is_featured][:6]
 
     # Statistika
-    stats = {
-        'total_courses': Course.objects.filter(is_active=True).count(),
-        'total_students': User.objects.filter(role='student', is_active=True).count(),
-        'total_teachers': User.objects.filter(role='teacher', is_active=True).count(),
-        'total_lessons': Lesson.objects.count(),
-    }
+    stats = chrome['counters']
 
     # Newsletter form
     newsletter_form = NewsletterForm()
@@ -44,6 +46,8 @@ def home_view(request):
     return render(request, 'pages/home.html', context)
 
 
+@catalog_page
+@page_cache
 def about_view(request):
     """Biz haqimizda sahifasi"""
     # O'qituvchilar
@@ -53,7 +57,7 @@ def about_view(request):
     ).select_related('profile')[:8]
 
     # Barcha testimonials
-    testimonials = Testimonial.objects.filter(is_active=True)
+    testimonials = get_site_chrome(request)['testimonials']
 
     context = {
         'teachers': teachers,
@@ -136,31 +140,24 @@ def newsletter_subscribe(request):
 def search_view(request):
     """Qidiruv sahifasi"""
     query = request.GET.get('q', '').strip()
+    kind = request.GET.get('type', '')
+    kinds = [kind] if kind in dict(SearchDocument.KIND_CHOICES) else None
     results = []
+    page_obj = None
     total_results = 0
 
     if query:
-        # Kurslarda qidirish
-        course_results = Course.objects.filter(
-            title__icontains=query,
-            is_active=True
-        ).select_related('instructor')
-
-        # Darslarda qidirish
-        lesson_results = Lesson.objects.filter(
-            title__icontains=query
-        ).select_related('course')
-
-        results = {
-            'courses': course_results[:10],
-            'lessons': lesson_results[:10],
-        }
-
-        total_results = course_results.count() + lesson_results.count()
+        # To'liq matnli qidiruv (rank bo'yicha tartiblangan)
+        paginator = Paginator(search(query, kinds), 20)
+        page_obj = paginator.get_page(request.GET.get('page'))
+        results = attach_objects(list(page_obj.object_list))
+        total_results = paginator.count
 
     context = {
         'query': query,
+        'search_type': kind if kinds else '',
         'results': results,
+        'page_obj': page_obj,
         'total_results': total_results,
         'page_title': f'Qidiruv: {query}' if query else 'Qidiruv',
     }
@@ -168,6 +165,21 @@ def search_view(request):
     return render(request, 'pages/search.html', context)
 
 
+def autocomplete_view(request):
+    """Qidiruv maydoni uchun takliflar (JSON)"""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        limit = DEFAULT_LIMIT
+
+    return JsonResponse({
+        'query': query,
+        'results': autocomplete(query, limit) if query else [],
+    })
+
+
+@page_cache
 def privacy_policy_view(request):
     """Maxfiylik siyosati"""
     context = {
@@ -176,6 +188,7 @@ def privacy_policy_view(request):
     return render(request, 'pages/privacy_policy.html', context)
 
 
+@page_cache
 def terms_of_service_view(request):
     """Foydalanish shartlari"""
     context = {
@@ -184,6 +197,7 @@ def terms_of_service_view(request):
     return render(request, 'pages/terms_of_service.html', context)
 
 
+@page_cache
 def faq_view(request):
     """Tez-tez so'raladigan savollar"""
     # FAQ ma'lumotlari (keyinroq model yaratamiz)
@@ -227,4 +241,13 @@ def handler500(request):
     context = {
         'page_title': 'Server xatoligi',
     }
-    return render(request, 'pages/500.html', context, status=500)
\ No newline at end of file
+    return render(request, 'pages/500.html', context, status=500)
+
+
+@never_cache
+@require_http_methods(["GET"])
+def fragments_view(request):
+    """Cache qilingan sahifadagi shaxsiy qismlar (navbar, yozilish tugmasi, progress)"""
+    return JsonResponse({
+        'fragments': render_fragments(request, request.GET.getlist('name')),
+    })
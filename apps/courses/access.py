@@ -0,0 +1,83 @@
+"""
+Kurs kontentiga kirish huquqi (yozilgan / o'qituvchi / admin).
+
+Foydalanuvchi yozilgan kurslar id lari cache dagi yozilishlar holatidan
+(enrollment_state.py) olinadi va so'rov davomida bir marta o'qiladi.
+Tekshiruvlar set dan O(1), kursning o'qituvchisi esa instructor_id orqali
+(qo'shimcha so'rovsiz) aniqlanadi.
+
+Cache eskirgan bo'lishi mumkin (masalan boshqa processda yangi yozilish),
+shuning uchun "yozilmagan" javobi bazadan tasdiqlanadi va holat tozalanadi.
+"""
+from functools import wraps
+
+from .enrollment_state import get_enrollment_state, invalidate_enrollment_state
+from .models import Enrollment
+
+
+def _pk(obj):
+    """Model yoki id dan primary key olish"""
+    return getattr(obj, 'pk', obj)
+
+
+class CourseAccess:
+    """So'rov davomidagi kirish huquqlari"""
+
+    def __init__(self, user):
+        self.user = user
+        self._course_ids = None
+        self._confirmed = {}
+
+    @property
+    def is_admin(self):
+        return self.user.is_authenticated and self.user.role == 'admin'
+
+    @property
+    def enrolled_course_ids(self):
+        if self._course_ids is None:
+            self._course_ids = (
+                frozenset(get_enrollment_state(self.user.pk)) if self.user.is_authenticated else frozenset()
+            )
+        return self._course_ids
+
+    def is_enrolled(self, course):
+        course_id = _pk(course)
+        if course_id in self.enrolled_course_ids:
+            return True
+        if not self.user.is_authenticated:
+            return False
+
+        if course_id not in self._confirmed:
+            enrolled = Enrollment.objects.filter(student_id=self.user.pk, course_id=course_id).exists()
+            if enrolled:
+                # Cache dagi holat eskirgan - keyingi so'rovda qayta yuklanadi
+                invalidate_enrollment_state(self.user.pk)
+            self._confirmed[course_id] = enrolled
+        return self._confirmed[course_id]
+
+    def is_instructor(self, course):
+        return self.user.is_authenticated and course.instructor_id == self.user.pk
+
+    def can_view(self, course):
+        """Kursning barcha darslari va testlarini ko'rish mumkinmi"""
+        return self.is_admin or self.is_instructor(course) or self.is_enrolled(course)
+
+
+def get_course_access(request):
+    """So'rov uchun CourseAccess (bir marta yaratiladi)"""
+    access = getattr(request, '_course_access', None)
+    if access is None or access.user is not request.user:
+        access = CourseAccess(request.user)
+        request._course_access = access
+    return access
+
+
+def course_access(view_func):
+    """View uchun decorator: request.access - CourseAccess"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        request.access = get_course_access(request)
+        return view_func(request, *args, **kwargs)
+
+    return wrapper
@@ -1,5 +1,37 @@
-from django.contrib import admin
+import io
+import os
+
+from django.contrib import admin, messages
+from django.contrib.admin import helpers
+from django.shortcuts import render
+
 from .models import Course, Enrollment
+from .forms import BulkEnrollFileForm
+from .bulk_enroll import bulk_enroll, read_references, summarize
+from apps.core.exports import ExportAdminMixin
+
+
+def render_bulk_enroll_page(modeladmin, request, queryset, form, title):
+    """Admin action uchun oraliq sahifa (fayl yoki kurslarni tanlash)"""
+    return render(request, 'admin/courses/bulk_enroll.html', {
+        **modeladmin.admin_site.each_context(request),
+        'title': title,
+        'opts': modeladmin.model._meta,
+        'form': form,
+        'preview': queryset[:20],
+        'selected_ids': list(queryset.values_list('pk', flat=True)),
+        'action': request.POST['action'],
+        'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+    })
+
+
+def run_bulk_enroll(modeladmin, request, references, course_ids):
+    try:
+        report = bulk_enroll(references, course_ids)
+    except ValueError as e:
+        modeladmin.message_user(request, str(e), messages.ERROR)
+    else:
+        modeladmin.message_user(request, summarize(report), messages.SUCCESS)
 
 
 @admin.register(Course)
@@ -22,23 +54,61 @@ class CourseAdmin(admin.ModelAdmin):
         }),
     )
 
+    actions = ['enroll_students_from_file']
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.role == 'teacher':
             return qs.filter(instructor=request.user)
         return qs
 
+    @admin.action(description='Fayldagi talabalarni yozish (CSV/JSON)')
+    def enroll_students_from_file(self, request, queryset):
+        if 'apply' in request.POST:
+            form = BulkEnrollFileForm(request.POST, request.FILES)
+            if form.is_valid():
+                upload = form.cleaned_data['file']
+                file_format = os.path.splitext(upload.name)[1].lstrip('.').lower() or 'csv'
+                # Fayl oqim sifatida o'qiladi
+                stream = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+                try:
+                    references = read_references(stream, file_format)
+                except ValueError as e:
+                    self.message_user(request, str(e), messages.ERROR)
+                else:
+                    run_bulk_enroll(self, request, references, queryset.values_list('pk', flat=True))
+                return None
+        else:
+            form = BulkEnrollFileForm()
+
+        return render_bulk_enroll_page(self, request, queryset, form, 'Kurslarga talabalarni yozish')
+
 
 @admin.register(Enrollment)
-class EnrollmentAdmin(admin.ModelAdmin):
+class EnrollmentAdmin(ExportAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'course', 'progress', 'is_completed', 'enrolled_at')
-    list_filter = ('is_completed', 'enrolled_at', 'course__level')
+    list_filter = ('is_completed', 'enrolled_at', 'course__level', ('course', admin.RelatedOnlyFieldListFilter))
     search_fields = ('student__username', 'student__email', 'course__title')
     list_editable = ('progress', 'is_completed')
     ordering = ('-enrolled_at',)
 
     readonly_fields = ('enrolled_at',)
 
+    # Kurs progressi eksporti (filtrlangan ro'yxat bo'yicha)
+    export_filename = 'kurs_progressi'
+    export_fields = (
+        ('Login', 'student__username'),
+        ('Ism', 'student__first_name'),
+        ('Familiya', 'student__last_name'),
+        ('Email', 'student__email'),
+        ('Kurs', 'course__title'),
+        ('Tugallangan darslar', 'completed_lessons'),
+        ('Jami darslar', 'course__lesson_count'),
+        ('Progress (%)', 'progress'),
+        ('Kurs tugallangan', 'is_completed'),
+        ('Yozilgan', 'enrolled_at'),
+    )
+
     def get_queryset(self, request):
         qs = super().get_queryset(request)
         if request.user.role == 'teacher':
@@ -5,3 +5,6 @@ class CoursesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.courses'
     verbose_name = 'Kurslar'
+
+    def ready(self):
+        import apps.courses.signals
\ No newline at end of file
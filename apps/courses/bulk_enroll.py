@@ -0,0 +1,325 @@
+"""
+Talabalarni kurslarga ommaviy yozish (kogortalar uchun).
+
+Kirish fayli oqim sifatida o'qiladi (butun fayl xotiraga yuklanmaydi):
+- CSV: "username", "email" yoki "id" ustuni (sarlavhasiz bo'lsa birinchi ustun)
+- JSON: qatorlar, sonlar yoki {"username"/"email"/"id": ...} obyektlari massivi
+  yoki har bir qatorda bitta qiymat (JSON Lines)
+Har bir qiymat faqat o'z ustuni (kaliti) bo'yicha qidiriladi; turi noma'lum
+raqamli qiymatlar noaniq deb hisobotga chiqadi.
+
+Talabalar bo'lak-bo'lak (chunk) bitta so'rov bilan topiladi va
+bulk_create(ignore_conflicts=True) bilan yoziladi. Signallar ishlamaydi,
+shuning uchun yangi yozilishlar progressi LessonProgress dan sanaladi, kurs
+talabalar soni har bir kurs uchun oxirida bitta UPDATE bilan oshiriladi,
+cache lar (yozilishlar holati, dashboard, katalog) tranzaksiya tugagach
+yangilanadi.
+"""
+import csv
+import io
+import json
+from itertools import chain, islice
+
+from django.db import transaction
+from django.db.models import Q
+
+from apps.accounts.models import User
+from apps.accounts.dashboard import ADMIN_SCOPE, invalidate_dashboard_stats
+from apps.core.catalog import touch_catalog
+from .counters import adjust_course_counters
+from .enrollment_state import invalidate_enrollment_state
+from .models import Course, Enrollment
+from .progress import seed_enrollments_progress
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Hisobotda ko'rsatiladigan topilmagan foydalanuvchilar soni
+NOT_FOUND_SAMPLE = 20
+
+REFERENCE_FIELDS = ('id', 'username', 'email')
+
+
+def _reference(value, field=None):
+    """
+    Qiymatdan foydalanuvchi havolasi: (maydon, qiymat).
+
+    Maydon (CSV ustuni yoki JSON kaliti) berilsa faqat shu maydon bo'yicha
+    qidiriladi. Berilmasa: JSON son - id, "@" bor - email, boshqa matn -
+    username. Faqat raqamlardan iborat matn id ham, username ham bo'lishi
+    mumkin, shuning uchun maydoni None (noaniq) bo'ladi.
+    """
+    if isinstance(value, dict):
+        for name in REFERENCE_FIELDS:
+            if value.get(name) not in (None, ''):
+                return _reference(value[name], name)
+        return None
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, int) and field in (None, 'id'):
+        return 'id', value
+
+    value = str(value).strip()
+    if not value:
+        return None
+    if field is None:
+        if '@' in value:
+            field = 'email'
+        elif not value.isdigit():
+            field = 'username'
+    elif field == 'id' and value.isdigit():
+        value = int(value)
+    return field, value
+
+
+def read_csv(stream):
+    """CSV qatorlaridan havolalar (sarlavhadagi ustun turi bo'yicha)"""
+    reader = csv.reader(stream)
+    column, field = 0, None
+    for number, row in enumerate(reader):
+        if not row:
+            continue
+        if number == 0:
+            header = [cell.strip().lower() for cell in row]
+            known = [name for name in REFERENCE_FIELDS if name in header]
+            if known:
+                field = known[0]
+                column = header.index(field)
+                continue
+        if column < len(row):
+            reference = _reference(row[column], field)
+            if reference is not None:
+                yield reference
+
+
+JSON_CHUNK_SIZE = 65536
+
+
+def _iter_json_array(stream, buffer):
+    """Katta JSON massiv elementlarini bittadan qaytarish (raw_decode bilan)"""
+    decoder = json.JSONDecoder()
+    position = buffer.index('[') + 1
+    eof = False
+
+    while True:
+        # Bo'sh joy va vergullarni o'tkazib yuborish
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            position += 1
+        if position < len(buffer) and buffer[position] == ']':
+            return
+
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError('JSON fayl noto\'g\'ri')
+            else:
+                # Bufer oxiridagi son kesilgan bo'lishi mumkin - keyingi bo'lakni kutish
+                if end < len(buffer) or eof:
+                    yield value
+                    position = end
+                    continue
+
+        if eof:
+            raise ValueError('JSON massiv yopilmagan')
+
+        data = stream.read(JSON_CHUNK_SIZE)
+        eof = not data
+        buffer = buffer[position:] + data
+        position = 0
+
+
+def _iter_json_lines(lines):
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            raise ValueError(f'JSON qator noto\'g\'ri: {number}')
+
+
+def read_json(stream):
+    """JSON massiv yoki JSON Lines dan havolalar"""
+    head = stream.read(JSON_CHUNK_SIZE)
+    if head.lstrip().startswith('['):
+        values = _iter_json_array(stream, head)
+    else:
+        # Birinchi bo'lakdagi oxirgi qator to'liq bo'lishi uchun
+        values = _iter_json_lines(chain(io.StringIO(head + stream.readline()), stream))
+
+    for value in values:
+        reference = _reference(value)
+        if reference is not None:
+            yield reference
+
+
+READERS = {
+    'csv': read_csv,
+    'json': read_json,
+    'jsonl': read_json,
+}
+
+
+def read_references(stream, file_format):
+    try:
+        reader = READERS[file_format]
+    except KeyError:
+        raise ValueError(f'Noma\'lum fayl formati: {file_format}')
+    return reader(stream)
+
+
+# Bir nechta talabaga mos keladigan havola (masalan takroriy email)
+AMBIGUOUS = object()
+
+
+def _resolve_students(references):
+    """
+    Havolalar bo'lagi -> {(maydon, qiymat): talaba id si yoki AMBIGUOUS}
+    (bitta so'rov). Har bir havola faqat o'z maydoni bo'yicha qidiriladi.
+    """
+    values = {field: set() for field in REFERENCE_FIELDS}
+    for field, value in references:
+        if field is not None:
+            values[field].add(value)
+
+    ids = {value for value in values['id'] if isinstance(value, int)}
+    lookup = Q(pk__in=ids) | Q(username__in=values['username']) | Q(email__in=values['email'])
+    students = User.objects.filter(lookup, role='student').values_list('pk', 'username', 'email')
+
+    resolved = {}
+    for pk, username, email in students:
+        resolved[('id', pk)] = pk
+        resolved[('username', username)] = pk
+        # Email yagona emas
+        key = ('email', email)
+        resolved[key] = pk if resolved.get(key, pk) == pk else AMBIGUOUS
+    return resolved
+
+
+def _sample(report, key, reference):
+    if len(report[key]) < NOT_FOUND_SAMPLE:
+        report[key].append(str(reference[1]))
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def bulk_enroll(references, course_ids, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Talabalarni (maydon, qiymat) havolalari bo'yicha kurslarga yozish.
+
+    Qaytaradi: {'rows', 'created', 'skipped', 'duplicates', 'not_found',
+    'not_found_sample', 'ambiguous', 'ambiguous_sample',
+    'courses': {course_id: yaratilganlar}}.
+    Noma'lum kurs bo'lsa ValueError.
+    """
+    course_ids = sorted(set(course_ids))
+    if not course_ids:
+        raise ValueError('Kamida bitta kurs tanlang')
+
+    courses = dict(Course.objects.filter(pk__in=course_ids).values_list('pk', 'instructor_id'))
+    missing = [course_id for course_id in course_ids if course_id not in courses]
+    if missing:
+        raise ValueError(f'Kurslar topilmadi: {", ".join(map(str, missing))}')
+
+    chunk_size = max(chunk_size, 1)
+    report = {
+        'rows': 0,
+        'created': 0,
+        'skipped': 0,
+        'duplicates': 0,
+        'not_found': 0,
+        'not_found_sample': [],
+        'ambiguous': 0,
+        'ambiguous_sample': [],
+        'courses': dict.fromkeys(course_ids, 0),
+    }
+    seen = set()
+
+    with transaction.atomic():
+        for chunk in _chunks(references, chunk_size):
+            report['rows'] += len(chunk)
+            resolved = _resolve_students(chunk)
+
+            student_ids = []
+            for reference in chunk:
+                student_id = resolved.get(reference) if reference[0] is not None else AMBIGUOUS
+                if student_id is None:
+                    report['not_found'] += 1
+                    _sample(report, 'not_found_sample', reference)
+                elif student_id is AMBIGUOUS:
+                    report['ambiguous'] += 1
+                    _sample(report, 'ambiguous_sample', reference)
+                elif student_id in seen:
+                    report['duplicates'] += 1
+                else:
+                    seen.add(student_id)
+                    student_ids.append(student_id)
+
+            if not student_ids:
+                continue
+
+            chunk_enrollments = Enrollment.objects.filter(student_id__in=student_ids, course_id__in=course_ids)
+            existing = set(chunk_enrollments.values_list('student_id', 'course_id'))
+
+            Enrollment.objects.bulk_create([
+                Enrollment(student_id=student_id, course_id=course_id)
+                for student_id in student_ids
+                for course_id in course_ids
+                if (student_id, course_id) not in existing
+            ], batch_size=chunk_size, ignore_conflicts=True)
+
+            # ignore_conflicts bilan qaysi qatorlar haqiqatan yozilgani noma'lum
+            # (parallel yozilganlari o'tkazib yuboriladi) - oldin/keyin farqi sanaladi
+            created = set(chunk_enrollments.values_list('student_id', 'course_id')) - existing
+
+            report['skipped'] += len(student_ids) * len(course_ids) - len(created)
+            report['created'] += len(created)
+            new_students = {}
+            for student_id, course_id in created:
+                report['courses'][course_id] += 1
+                new_students.setdefault(course_id, []).append(student_id)
+
+            # Avval tugallangan darslar bo'lsa progress 0 dan boshlanmaydi
+            for course_id, course_students in new_students.items():
+                seed_enrollments_progress(course_id, course_students)
+
+            chunk_students = student_ids
+            transaction.on_commit(lambda students=chunk_students: invalidate_enrollment_state(*students))
+
+        # Har bir kurs uchun bitta UPDATE
+        for course_id, created in report['courses'].items():
+            adjust_course_counters(course_id, student_count=created)
+
+        if report['created']:
+            instructors = {courses[course_id] for course_id, created in report['courses'].items() if created}
+            students = list(seen)
+            transaction.on_commit(lambda: invalidate_dashboard_stats(*students, *instructors, ADMIN_SCOPE))
+            transaction.on_commit(touch_catalog)
+
+    return report
+
+
+def summarize(report):
+    """Hisobotning qisqa matni (admin xabari va buyruq uchun)"""
+    summary = (
+        f'{report["created"]} ta yozilish yaratildi, '
+        f'{report["skipped"]} tasi allaqachon bor edi, '
+        f'{report["duplicates"]} ta takroriy qator'
+    )
+    if report['not_found']:
+        summary += f', {report["not_found"]} ta talaba topilmadi ({", ".join(report["not_found_sample"])})'
+    if report['ambiguous']:
+        summary += (
+            f', {report["ambiguous"]} ta qiymat noaniq - ustun nomini ko\'rsating '
+            f'({", ".join(report["ambiguous_sample"])})'
+        )
+    return summary
@@ -0,0 +1,50 @@
+from django.db.models import Count, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from .models import Course, Enrollment
+
+
+def adjust_course_counters(course_id, **deltas):
+    """
+    Kurs hisoblagichlarini bitta UPDATE da o'zgartirish, masalan:
+    adjust_course_counters(course_id, student_count=1)
+    """
+    updates = {
+        field: Greatest(F(field) + delta, Value(0))
+        for field, delta in deltas.items()
+        if delta
+    }
+    if not updates:
+        return 0
+    if set(updates) - {'student_count'}:
+        # Talabalar soni katalog versiyasini o'zi yangilaydi (core.catalog)
+        updates['updated_at'] = timezone.now()
+    return Course.objects.filter(pk=course_id).update(**updates)
+
+
+def reconcile_course_counters(course_ids=None):
+    """
+    student_count, lesson_count va total_duration_minutes ni noldan qayta
+    hisoblash (drift tuzatish uchun). Barcha kurslar bitta UPDATE da.
+    """
+    from apps.lessons.models import Lesson
+
+    courses = Course.objects.all()
+    if course_ids:
+        courses = courses.filter(pk__in=course_ids)
+
+    student_counts = Enrollment.objects.filter(
+        course=OuterRef('pk')
+    ).order_by().values('course').annotate(total=Count('pk')).values('total')
+
+    lessons = Lesson.objects.filter(course=OuterRef('pk')).order_by().values('course')
+    lesson_counts = lessons.annotate(total=Count('pk')).values('total')
+    durations = lessons.annotate(total=Sum('duration_minutes')).values('total')
+
+    return courses.update(
+        student_count=Coalesce(Subquery(student_counts), 0),
+        lesson_count=Coalesce(Subquery(lesson_counts), 0),
+        total_duration_minutes=Coalesce(Subquery(durations), 0),
+        updated_at=timezone.now(),
+    )
@@ -0,0 +1,64 @@
+"""
+Talabaning yozilishlari holati (so'rovlar orasida, cache da).
+
+Har bir foydalanuvchi uchun bitta kalit: {course_id: (progress,
+completed_lessons, is_completed)}. Kurs kartalari, kurs sahifasi va kirish
+huquqi (access.py) shu yerdan o'qiydi, shuning uchun yozilish holati
+uchun so'rov yuborilmaydi.
+
+Holat joyida o'zgartirilmaydi (o'qish-o'zgartirish-yozish parallel
+so'rovlarda yangilanishlarni yo'qotadi), kalit o'chiriladi va keyingi
+so'rovda bitta so'rov bilan qayta yuklanadi: yozilish qo'shilganda,
+o'zgarganda yoki o'chirilganda (signals.py) va dars tugallanganda
+(progress.apply_completed_delta). Kursdagi darslar soni o'zgarganda butun
+kurs talabalarining holati tozalanadi.
+
+Holat faqat ko'rsatish uchun; kirish huquqi (access.py) "yozilmagan"
+javobini bazadan tasdiqlaydi.
+"""
+from django.core.cache import cache
+
+from .models import Enrollment
+
+ENROLLMENT_STATE_TIMEOUT = 3600
+
+
+class CachedEnrollment:
+    """Cache dagi yozilish (template lar uchun Enrollment o'rniga)"""
+
+    def __init__(self, course_id, progress, completed_lessons, is_completed):
+        self.course_id = course_id
+        self.progress = progress
+        self.completed_lessons = completed_lessons
+        self.is_completed = is_completed
+
+
+def _state_key(user_id):
+    return f'enrollment_state_{user_id}'
+
+
+def _load_state(user_id):
+    rows = Enrollment.objects.filter(student_id=user_id).values_list(
+        'course_id', 'progress', 'completed_lessons', 'is_completed'
+    )
+    return {course_id: entry for course_id, *entry in rows}
+
+
+def get_enrollment_state(user_id):
+    """{course_id: CachedEnrollment} (cache bo'sh bo'lsa bitta so'rovda yuklanadi)"""
+    key = _state_key(user_id)
+    state = cache.get(key)
+    if state is None:
+        state = _load_state(user_id)
+        cache.set(key, state, ENROLLMENT_STATE_TIMEOUT)
+    return {course_id: CachedEnrollment(course_id, *entry) for course_id, entry in state.items()}
+
+
+def invalidate_enrollment_state(*user_ids):
+    cache.delete_many([_state_key(user_id) for user_id in user_ids])
+
+
+def invalidate_course_enrollment_states(course_ids):
+    """Kurs(lar)ning barcha talabalari holatini tozalash (progress qayta hisoblanganda)"""
+    student_ids = Enrollment.objects.filter(course_id__in=course_ids).values_list('student_id', flat=True)
+    invalidate_enrollment_state(*set(student_ids))
@@ -141,4 +141,25 @@ class CourseFilterForm(forms.Form):
             'class': 'form-input rounded-lg border-gray-300',
             'placeholder': 'Max narx'
         })
-    )
\ No newline at end of file
+    )
+
+
+class BulkEnrollFileForm(forms.Form):
+    """Admin: tanlangan kurslarga fayldagi talabalarni yozish"""
+    file = forms.FileField(
+        label='CSV yoki JSON fayl',
+        help_text='"username", "email" yoki "id" ustuni; JSON - massiv yoki har qatorda bitta qiymat'
+    )
+
+
+class BulkEnrollCoursesForm(forms.Form):
+    """Admin: tanlangan talabalarni kurslarga yozish"""
+    courses = forms.ModelMultipleChoiceField(
+        label='Kurslar',
+        queryset=Course.objects.none()
+    )
+
+    def __init__(self, *args, courses=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if courses is not None:
+            self.fields['courses'].queryset = courses
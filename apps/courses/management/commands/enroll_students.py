@@ -0,0 +1,58 @@
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.courses.bulk_enroll import DEFAULT_CHUNK_SIZE, READERS, bulk_enroll, read_references, summarize
+
+
+class Command(BaseCommand):
+    help = 'Talabalarni CSV yoki JSON ro\'yxatidan kurslarga ommaviy yozish'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV/JSON fayl yo\'li ("-" - standart kirish)')
+        parser.add_argument(
+            '--course',
+            dest='course_ids',
+            type=int,
+            action='append',
+            required=True,
+            help='Kurs ID si (bir nechta kurs uchun takrorlang)'
+        )
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help='Fayl formati (ko\'rsatilmasa kengaytmadan aniqlanadi)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Bir martada yoziladigan talabalar soni'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format']
+        if file_format is None:
+            file_format = os.path.splitext(path)[1].lstrip('.').lower() or 'csv'
+
+        try:
+            if path == '-':
+                report = self._import(sys.stdin, file_format, options)
+            else:
+                with open(path, encoding='utf-8-sig', newline='') as stream:
+                    report = self._import(stream, file_format, options)
+        except OSError as e:
+            raise CommandError(f'Faylni o\'qib bo\'lmadi: {e}')
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f'Qatorlar: {report["rows"]}')
+        for course_id, created in report['courses'].items():
+            self.stdout.write(f'  Kurs {course_id}: {created} ta yangi yozilish')
+        self.stdout.write(self.style.SUCCESS(summarize(report)))
+
+    def _import(self, stream, file_format, options):
+        references = read_references(stream, file_format)
+        return bulk_enroll(references, options['course_ids'], chunk_size=options['chunk_size'])
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.courses.progress import recompute_progress
+
+
+class Command(BaseCommand):
+    help = 'Kurs darslari soni va enrollment progress hisoblagichlarini qayta hisoblash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            type=int,
+            help='Faqat shu kurslar uchun (bo\'sh bo\'lsa barcha kurslar)'
+        )
+
+    def handle(self, *args, **options):
+        courses_count, enrollments_count = recompute_progress(options['course_ids'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{courses_count} ta kurs va {enrollments_count} ta enrollment qayta hisoblandi'
+        ))
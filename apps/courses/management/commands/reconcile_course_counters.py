@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.courses.counters import reconcile_course_counters
+
+
+class Command(BaseCommand):
+    help = 'Kurs hisoblagichlarini (talabalar, darslar, davomiylik) qayta hisoblash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'course_ids',
+            nargs='*',
+            type=int,
+            help='Faqat shu kurslar uchun (bo\'sh bo\'lsa barcha kurslar)'
+        )
+
+    def handle(self, *args, **options):
+        updated = reconcile_course_counters(options['course_ids'])
+
+        self.stdout.write(self.style.SUCCESS(f'{updated} ta kurs hisoblagichlari qayta hisoblandi'))
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    Lesson = apps.get_model('lessons', 'Lesson')
+    LessonProgress = apps.get_model('lessons', 'LessonProgress')
+
+    lesson_counts = Lesson.objects.filter(
+        course=OuterRef('pk')
+    ).order_by().values('course').annotate(total=Count('pk')).values('total')
+    Course.objects.update(lesson_count=Coalesce(Subquery(lesson_counts), 0))
+
+    completed_counts = LessonProgress.objects.filter(
+        student=OuterRef('student'),
+        lesson__course=OuterRef('course'),
+        is_completed=True
+    ).order_by().values('student').annotate(total=Count('pk')).values('total')
+    Enrollment.objects.update(completed_lessons=Coalesce(Subquery(completed_counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+        ('lessons', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='lesson_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='enrollment',
+            name='completed_lessons',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Course = apps.get_model('courses', 'Course')
+    Enrollment = apps.get_model('courses', 'Enrollment')
+    Lesson = apps.get_model('lessons', 'Lesson')
+
+    student_counts = Enrollment.objects.filter(
+        course=OuterRef('pk')
+    ).order_by().values('course').annotate(total=Count('pk')).values('total')
+    durations = Lesson.objects.filter(
+        course=OuterRef('pk')
+    ).order_by().values('course').annotate(total=Sum('duration_minutes')).values('total')
+
+    Course.objects.update(
+        student_count=Coalesce(Subquery(student_counts), 0),
+        total_duration_minutes=Coalesce(Subquery(durations), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_course_lesson_count_enrollment_completed_lessons'),
+        ('lessons', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='student_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='total_duration_minutes',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
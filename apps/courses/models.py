@@ -19,9 +19,34 @@ class Course(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Hisoblagichlar yangilanganda ham o'zgaradi (counters.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Denormalizatsiya qilingan hisoblagichlar (signallar orqali yangilanadi)
+    lesson_count = models.PositiveIntegerField(default=0, editable=False)
+    student_count = models.PositiveIntegerField(default=0, editable=False)
+    total_duration_minutes = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Katalog: faqat faol kurslar, daraja filtri, "yangi" va "mashhur" tartib
+            # (oxirgi maydon id - cursor pagination tartibi bilan bir xil)
+            models.Index(
+                fields=['level', '-created_at', '-id'], name='course_active_level_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='course_active_newest_idx',
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=['-student_count', '-id'], name='course_active_popular_idx',
+                condition=models.Q(is_active=True),
+            ),
+            # O'qituvchi kurslari
+            models.Index(fields=['instructor', '-created_at', '-id'], name='course_instructor_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -33,6 +58,7 @@ class Enrollment(models.Model):
     enrolled_at = models.DateTimeField(auto_now_add=True)
     is_completed = models.BooleanField(default=False)
     progress = models.PositiveIntegerField(default=0)  # 0-100%
+    completed_lessons = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         unique_together = ['student', 'course']
@@ -0,0 +1,150 @@
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Coalesce, Greatest, Least, Round
+
+from .models import Course, Enrollment
+from .enrollment_state import invalidate_course_enrollment_states, invalidate_enrollment_state
+
+
+def progress_expression(completed, lesson_count):
+    """Tugallangan darslar sonidan progress (0-100%) ifodasi"""
+    if not lesson_count:
+        return Value(0)
+
+    return Least(
+        Value(100),
+        Cast(Round(completed * Value(100.0) / Value(lesson_count)), IntegerField())
+    )
+
+
+def apply_completed_delta(student_id, lesson_id, delta):
+    """
+    Dars tugallanganda (+1) yoki bekor qilinganda (-1) enrollment hisoblagichini
+    yangilash. Kurs va uning darslari soni dars id si bo'yicha bitta so'rovda
+    olinadi, hisoblagich esa bitta UPDATE da F() orqali o'zgaradi.
+    """
+    course = Course.objects.filter(lessons=lesson_id).values_list('pk', 'lesson_count').first()
+    if course is None:
+        return 0
+    course_id, lesson_count = course
+
+    completed = Greatest(F('completed_lessons') + delta, Value(0))
+
+    # UPDATE ichida F('completed_lessons') eski qiymatni bildiradi
+    if lesson_count:
+        reaches_end = Q(completed_lessons__gte=lesson_count - delta)
+    else:
+        reaches_end = Q(pk__in=[])
+
+    if delta > 0:
+        is_completed = Q(is_completed=True) | reaches_end
+    else:
+        is_completed = reaches_end
+
+    updated = Enrollment.objects.filter(student_id=student_id, course_id=course_id).update(
+        completed_lessons=completed,
+        progress=progress_expression(completed, lesson_count),
+        is_completed=is_completed,
+    )
+    if updated:
+        transaction.on_commit(lambda: invalidate_enrollment_state(student_id))
+    return updated
+
+
+def refresh_course_progress(course_id):
+    """Darslar soni o'zgarganda kursdagi barcha enrollment progressini yangilash"""
+    lesson_count = Course.objects.filter(pk=course_id).values_list('lesson_count', flat=True).first()
+    if lesson_count is None:
+        return 0
+
+    updated = Enrollment.objects.filter(course_id=course_id).update(
+        progress=progress_expression(F('completed_lessons'), lesson_count)
+    )
+    if updated:
+        transaction.on_commit(lambda: invalidate_course_enrollment_states([course_id]))
+    return updated
+
+
+def _completed_lessons_count():
+    """Enrollment talabasining shu kursda tugallagan darslari soni (subquery)"""
+    from apps.lessons.models import LessonProgress
+
+    completed_counts = LessonProgress.objects.filter(
+        student=OuterRef('student'),
+        lesson__course=OuterRef('course'),
+        is_completed=True
+    ).order_by().values('student').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(completed_counts), 0)
+
+
+def _recount_enrollments(enrollments, lesson_count):
+    """Bitta kurs enrollmentlari hisoblagichini LessonProgress dan qayta sanash (ikki UPDATE)"""
+    enrollments.update(completed_lessons=_completed_lessons_count())
+
+    # Tugallangan kurslar qaytadan "tugallanmagan" qilinmaydi
+    reaches_end = Q(completed_lessons__gte=lesson_count) if lesson_count else Q(pk__in=[])
+    return enrollments.update(
+        progress=progress_expression(F('completed_lessons'), lesson_count),
+        is_completed=Q(is_completed=True) | reaches_end,
+    )
+
+
+def seed_enrollment_progress(enrollment):
+    """
+    Yangi enrollment hisoblagichini avval tugallangan darslardan boshlash
+    (qayta yozilganda progress 0 dan boshlanmasligi uchun). Tugallangan dars
+    bo'lmasa faqat bitta COUNT so'rovi.
+    """
+    from apps.lessons.models import LessonProgress
+
+    completed = LessonProgress.objects.filter(
+        student_id=enrollment.student_id,
+        lesson__course_id=enrollment.course_id,
+        is_completed=True
+    ).count()
+    if not completed:
+        return
+
+    lesson_count = Course.objects.filter(pk=enrollment.course_id).values_list('lesson_count', flat=True).first()
+    Enrollment.objects.filter(pk=enrollment.pk).update(
+        completed_lessons=completed,
+        progress=progress_expression(Value(completed), lesson_count),
+        is_completed=enrollment.is_completed or bool(lesson_count and completed >= lesson_count),
+    )
+    enrollment.refresh_from_db(fields=['completed_lessons', 'progress', 'is_completed'])
+
+
+def seed_enrollments_progress(course_id, student_ids):
+    """bulk_create bilan yaratilgan enrollmentlar uchun seed_enrollment_progress"""
+    lesson_count = Course.objects.filter(pk=course_id).values_list('lesson_count', flat=True).first()
+    if lesson_count is None:
+        return 0
+    enrollments = Enrollment.objects.filter(course_id=course_id, student_id__in=student_ids)
+    return _recount_enrollments(enrollments, lesson_count)
+
+
+def recompute_progress(course_ids=None):
+    """
+    Hisoblagichlarni noldan qayta hisoblash (drift tuzatish uchun).
+
+    Kurs uchun ikki UPDATE: darslar sonini va enrollmentlarni yangilash.
+    """
+    from apps.lessons.models import Lesson
+
+    courses = Course.objects.all()
+    if course_ids:
+        courses = courses.filter(pk__in=course_ids)
+
+    lesson_counts = Lesson.objects.filter(
+        course=OuterRef('pk')
+    ).order_by().values('course').annotate(total=Count('pk')).values('total')
+    courses.update(lesson_count=Coalesce(Subquery(lesson_counts), 0))
+
+    enrollments_updated = 0
+    course_ids = []
+    for course_id, lesson_count in courses.values_list('pk', 'lesson_count'):
+        course_ids.append(course_id)
+        enrollments_updated += _recount_enrollments(Enrollment.objects.filter(course_id=course_id), lesson_count)
+
+    invalidate_course_enrollment_states(course_ids)
+    return len(course_ids), enrollments_updated
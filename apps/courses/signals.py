@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
+from django.dispatch import receiver
+from .models import Enrollment
+from .counters import adjust_course_counters
+from .enrollment_state import invalidate_enrollment_state
+from .progress import seed_enrollment_progress
+
+
+@receiver(post_save, sender=Enrollment)
+def increment_course_student_count(sender, instance, created, **kwargs):
+    """Yangi talaba yozilganda kurs talabalar sonini oshirish va progressini boshlash"""
+    if created:
+        adjust_course_counters(instance.course_id, student_count=1)
+        seed_enrollment_progress(instance)
+
+
+@receiver(post_delete, sender=Enrollment)
+def decrement_course_student_count(sender, instance, **kwargs):
+    """Yozilish o'chirilganda kurs talabalar sonini kamaytirish"""
+    adjust_course_counters(instance.course_id, student_count=-1)
+
+
+@receiver([post_save, post_delete], sender=Enrollment)
+def invalidate_enrollment_state_on_change(sender, instance, **kwargs):
+    """Talabaning cache dagi yozilishlar holatini tranzaksiya tugagach tozalash"""
+    student_id = instance.student_id
+    transaction.on_commit(lambda: invalidate_enrollment_state(student_id))
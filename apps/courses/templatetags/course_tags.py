@@ -3,6 +3,7 @@ from django.db.models import Count, Avg
 from apps.courses.models import Course, Enrollment
 from apps.lessons.models import LessonProgress
 from apps.quizzes.models import QuizAttempt
+from apps.core.viewer_state import get_viewer_state
 
 register = template.Library()
 
@@ -13,11 +14,7 @@ def course_progress(user, course):
     if not user.is_authenticated:
         return 0
 
-    try:
-        enrollment = Enrollment.objects.get(student=user, course=course)
-        return enrollment.progress
-    except Enrollment.DoesNotExist:
-        return 0
+    return get_viewer_state(user).course_progress(course)
 
 
 @register.filter
@@ -25,7 +22,7 @@ def is_enrolled(user, course):
     """Foydalanuvchi kursga yozilganmi?"""
     if not user.is_authenticated:
         return False
-    return Enrollment.objects.filter(student=user, course=course).exists()
+    return get_viewer_state(user).is_enrolled(course)
 
 
 @register.filter
@@ -34,11 +31,7 @@ def completed_lessons_count(user, course):
     if not user.is_authenticated:
         return 0
 
-    return LessonProgress.objects.filter(
-        student=user,
-        lesson__course=course,
-        is_completed=True
-    ).count()
+    return get_viewer_state(user).completed_lessons_count(course)
 
 
 @register.filter
@@ -92,7 +85,7 @@ def course_level_badge(level):
 @register.filter
 def student_count(course):
     """Kursdagi talabalar soni"""
-    return course.enrollment_set.count()
+    return course.student_count
 
 
 @register.filter
@@ -122,20 +115,17 @@ def course_card(course, user=None):
     """Kurs kartasi uchun ma'lumotlar"""
     data = {
         'course': course,
-        'student_count': course.enrollment_set.count(),
-        'lesson_count': course.lessons.count(),
+        'student_count': course.student_count,
+        'lesson_count': course.lesson_count,
         'is_enrolled': False,
         'progress': 0,
     }
 
     if user and user.is_authenticated:
-        data['is_enrolled'] = Enrollment.objects.filter(student=user, course=course).exists()
-        if data['is_enrolled']:
-            try:
-                enrollment = Enrollment.objects.get(student=user, course=course)
-                data['progress'] = enrollment.progress
-            except Enrollment.DoesNotExist:
-                pass
+        enrollment = get_viewer_state(user).enrollment(course)
+        if enrollment:
+            data['is_enrolled'] = True
+            data['progress'] = enrollment.progress
 
     return data
 
@@ -147,8 +137,8 @@ def render_course_card(course, user=None, show_progress=True):
         'course': course,
         'user': user,
         'show_progress': show_progress,
-        'student_count': course.enrollment_set.count(),
-        'lesson_count': course.lessons.count(),
+        'student_count': course.student_count,
+        'lesson_count': course.lesson_count,
     }
 
 
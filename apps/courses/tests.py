@@ -1,3 +1,201 @@
+import io
+import unittest
+import zipfile
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+
+from apps.accounts.models import User
+from apps.lessons.models import Lesson, LessonProgress
+from .bulk_enroll import bulk_enroll, read_references
+from .counters import adjust_course_counters
+from .enrollment_state import get_enrollment_state
+from .models import Course, Enrollment
+
+
+class EnrollmentProgressTests(TestCase):
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=self.teacher,
+            level='beginner', duration_weeks=4
+        )
+        lessons = [Lesson.objects.create(course=self.course, title=f'{i}-dars', order=i) for i in range(1, 5)]
+        for lesson in lessons[:2]:
+            LessonProgress.objects.create(student=self.student, lesson=lesson, is_completed=True)
+
+    def _progress(self):
+        return Enrollment.objects.filter(student=self.student, course=self.course).values_list(
+            'completed_lessons', 'progress', 'is_completed'
+        ).get()
+
+    def test_reenrollment_starts_from_completed_lessons(self):
+        enrollment = Enrollment.objects.create(student=self.student, course=self.course)
+
+        self.assertEqual(self._progress(), (2, 50, False))
+        self.assertEqual(enrollment.completed_lessons, 2)
+
+    def test_bulk_enrollment_starts_from_completed_lessons(self):
+        bulk_enroll([('username', 'student')], [self.course.pk])
+
+        self.assertEqual(self._progress(), (2, 50, False))
+
+
+class CourseCounterTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+
+    def _values(self):
+        return Course.objects.values_list('student_count', 'lesson_count', 'updated_at').get(pk=self.course.pk)
+
+    def test_counters_never_go_below_zero(self):
+        adjust_course_counters(self.course.pk, student_count=-1, lesson_count=2)
+
+        self.assertEqual(self._values()[:2], (0, 2))
+
+    def test_student_count_does_not_touch_updated_at(self):
+        updated_at = self._values()[2]
+
+        adjust_course_counters(self.course.pk, student_count=1)
+        self.assertEqual(self._values()[::2], (1, updated_at))
+
+        adjust_course_counters(self.course.pk, lesson_count=1)
+        self.assertGreater(self._values()[2], updated_at)
+
+
+class BulkEnrollTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        # Username boshqa talabaning id siga teng
+        self.numeric = User.objects.create_user(username=str(self.student.pk), password='pw', role='student')
+
+    def _enroll(self, data, file_format='csv'):
+        return bulk_enroll(read_references(io.StringIO(data), file_format), [self.course.pk])
+
+    def _enrolled(self):
+        return set(Enrollment.objects.filter(course=self.course).values_list('student_id', flat=True))
+
+    def test_values_resolved_by_declared_column(self):
+        self._enroll(f'username\n{self.numeric.username}\n')
+        self.assertEqual(self._enrolled(), {self.numeric.pk})
+
+        self._enroll(f'id\n{self.student.pk}\n')
+        self.assertEqual(self._enrolled(), {self.numeric.pk, self.student.pk})
+
+    def test_numeric_value_without_column_is_ambiguous(self):
+        report = self._enroll(f'{self.student.pk}\n')
+
+        self.assertEqual(report['ambiguous'], 1)
+        self.assertEqual(self._enrolled(), set())
+
+    def test_created_counts_only_new_rows(self):
+        Enrollment.objects.create(student=self.student, course=self.course)
+
+        report = self._enroll(f'id\n{self.student.pk}\n{self.numeric.pk}\n')
+
+        self.assertEqual((report['created'], report['skipped']), (1, 1))
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.student_count, 2)
+
+
+class CourseAccessTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=self.teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.lesson = Lesson.objects.create(course=self.course, title='1-dars')
+        self.client.login(username='student', password='pw')
+
+    def test_stale_enrollment_state_does_not_deny_access(self):
+        # Holat cache ga yozilishdan oldin yuklangan, yozilish esa signalsiz
+        # (masalan boshqa processda) yaratilgan
+        self.assertEqual(get_enrollment_state(self.student.pk), {})
+        Enrollment.objects.bulk_create([Enrollment(student=self.student, course=self.course)])
+
+        response = self.client.get(reverse('lessons:detail', args=[self.course.pk, self.lesson.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(self.course.pk, get_enrollment_state(self.student.pk))
+
+    def test_not_enrolled_student_is_denied(self):
+        response = self.client.post(reverse('lessons:complete', args=[self.lesson.pk]))
+
+        self.assertFalse(response.json()['success'])
+
+
+class EnrollmentExportTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher', is_staff=True)
+        teacher.user_permissions.add(Permission.objects.get(codename='view_enrollment'))
+        other = User.objects.create_user(username='other', password='pw', role='teacher')
+        student = User.objects.create_user(
+            username='student', password='pw', role='student', first_name='=HYPERLINK("http://x.uz")'
+        )
+        for title, instructor in (('Anatomiya', teacher), ('Fiziologiya', other)):
+            course = Course.objects.create(
+                title=title, description='Kurs', instructor=instructor,
+                level='beginner', duration_weeks=4
+            )
+            Enrollment.objects.create(student=student, course=course)
+        self.client.login(username='teacher', password='pw')
+        self.url = reverse('admin:courses_enrollment_export')
+
+    def _content(self, response):
+        return b''.join(response.streaming_content)
+
+    def test_csv_only_own_courses_and_no_formulas(self):
+        response = self.client.get(self.url, {'format': 'csv'})
+
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        lines = self._content(response).decode('utf-8-sig').splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn('Anatomiya', lines[1])
+        self.assertIn('"\'=HYPERLINK(""http://x.uz"")"', lines[1])
+
+    def test_xlsx_is_valid_workbook_with_own_courses(self):
+        response = self.client.get(self.url, {'format': 'xlsx'})
+
+        with zipfile.ZipFile(io.BytesIO(self._content(response))) as workbook:
+            self.assertIsNone(workbook.testzip())
+            sheet = workbook.read('xl/worksheets/sheet1.xml').decode()
+        self.assertEqual(sheet.count('<row>'), 2)
+        self.assertIn('Anatomiya', sheet)
+        self.assertNotIn('Fiziologiya', sheet)
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN formati SQLite ga xos')
+class CourseIndexTests(TestCase):
+
+    def test_catalog_orderings_use_partial_indexes(self):
+        active = Course.objects.filter(is_active=True)
+        plans = {
+            'course_active_newest_idx': active.order_by('-created_at', '-id')[:12].explain(),
+            'course_active_level_idx': active.filter(level='beginner').order_by('-created_at', '-id')[:12].explain(),
+            'course_active_popular_idx': active.order_by('-student_count', '-id')[:6].explain(),
+        }
 
-# Create your tests here.
+        for index_name, plan in plans.items():
+            self.assertIn(index_name, plan)
+            self.assertNotIn('TEMP B-TREE', plan)
@@ -3,22 +3,27 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
-from django.db.models import Count, Q, Avg
+from django.db.models import Avg
 from django.urls import reverse
 
 from .models import Course, Enrollment
 from .forms import CourseSearchForm, CourseCreateForm, CourseEditForm
 from apps.accounts.models import User
 from apps.lessons.models import Lesson
+from apps.core.search import get_search_backend
+from apps.core.pagination import paginate, cached_count
+from apps.core.catalog import catalog_page
+from apps.core.page_cache import page_cache
+from apps.core.viewer_state import get_viewer_state
+from .access import get_course_access
+from .enrollment_state import get_enrollment_state, invalidate_enrollment_state
 
 
+@catalog_page
+@page_cache
 def course_list_view(request):
     """Kurslar ro'yxati"""
-    courses = Course.objects.filter(is_active=True).select_related('instructor').annotate(
-        student_count=Count('enrollment'),
-        lesson_count=Count('lessons')
-    )
+    courses = Course.objects.filter(is_active=True).select_related('instructor')
 
     # Search va Filter
     form = CourseSearchForm(request.GET)
@@ -28,10 +33,7 @@ def course_list_view(request):
         instructor = form.cleaned_data.get('instructor')
 
         if query:
-            courses = courses.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query)
-            )
+            courses = courses.filter(id__in=get_search_backend().matching_ids(query, 'course'))
 
         if level:
             courses = courses.filter(level=level)
@@ -39,19 +41,17 @@ def course_list_view(request):
         if instructor:
             courses = courses.filter(instructor=instructor)
 
-    # Sorting
+    # Sorting (oxirgi maydon - cursor pagination uchun unikal kalit)
     sort_by = request.GET.get('sort', 'newest')
     if sort_by == 'popular':
-        courses = courses.order_by('-student_count')
+        ordering = ('-student_count', '-id')
     elif sort_by == 'alphabetical':
-        courses = courses.order_by('title')
+        ordering = ('title', 'id')
     else:  # newest
-        courses = courses.order_by('-created_at')
+        ordering = ('-created_at', '-id')
 
     # Pagination
-    paginator = Paginator(courses, 12)
-    page = request.GET.get('page')
-    courses_page = paginator.get_page(page)
+    courses_page = paginate(request, courses, 12, ordering, count=lambda: cached_count(courses))
 
     # Statistics
     stats = {
@@ -71,6 +71,8 @@ def course_list_view(request):
     return render(request, 'courses/course_list.html', context)
 
 
+@catalog_page
+@page_cache
 def course_detail_view(request, course_id):
     """Kurs tafsilotlari"""
     course = get_object_or_404(
@@ -79,23 +81,18 @@ def course_detail_view(request, course_id):
         is_active=True
     )
 
-    # Enrollment tekshirish
-    is_enrolled = False
-    enrollment = None
-    if request.user.is_authenticated:
-        try:
-            enrollment = Enrollment.objects.get(student=request.user, course=course)
-            is_enrolled = True
-        except Enrollment.DoesNotExist:
-            pass
+    # Enrollment tekshirish (cache dagi yozilishlar holatidan)
+    state = get_viewer_state(request.user)
+    enrollment = state.enrollment(course) if state else None
+    is_enrolled = enrollment is not None
 
     # Darslar
     lessons = course.lessons.all().order_by('order')
 
-    # Statistika
-    total_students = course.enrollment_set.count()
-    total_lessons = lessons.count()
-    total_duration = sum(lesson.duration_minutes for lesson in lessons)
+    # Statistika (kursdagi hisoblagichlardan)
+    total_students = course.student_count
+    total_lessons = course.lesson_count
+    total_duration = course.total_duration_minutes
 
     # O'qituvchining boshqa kurslari
     instructor_other_courses = Course.objects.filter(
@@ -129,16 +126,21 @@ def course_enroll_view(request, course_id):
         messages.error(request, 'Faqat talabalar kursga yozilishi mumkin!')
         return redirect('courses:detail', course_id=course.id)
 
-    # Allaqachon yozilganligini tekshirish
-    if Enrollment.objects.filter(student=request.user, course=course).exists():
+    # Allaqachon yozilganligini tekshirish (avval cache dagi holatdan)
+    if get_course_access(request).is_enrolled(course):
         messages.warning(request, 'Siz allaqachon bu kursga yozilgansiz!')
         return redirect('courses:detail', course_id=course.id)
 
-    # Enrollment yaratish
-    enrollment = Enrollment.objects.create(
+    # Enrollment yaratish (holat signal orqali yangilanadi)
+    enrollment, created = Enrollment.objects.get_or_create(
         student=request.user,
         course=course
     )
+    if not created:
+        # Cache dagi holat eskirgan edi
+        invalidate_enrollment_state(request.user.pk)
+        messages.warning(request, 'Siz allaqachon bu kursga yozilgansiz!')
+        return redirect('courses:detail', course_id=course.id)
 
     messages.success(request, f'"{course.title}" kursiga muvaffaqiyatli yozildingiz!')
     return redirect('courses:detail', course_id=course.id)
@@ -151,7 +153,7 @@ def my_courses_view(request):
         # Talaba kurslari
         enrollments = Enrollment.objects.filter(
             student=request.user
-        ).select_related('course', 'course__instructor').order_by('-enrolled_at')
+        ).select_related('course', 'course__instructor')
 
         # Status bo'yicha filter
         status = request.GET.get('status', 'all')
@@ -161,13 +163,20 @@ def my_courses_view(request):
             enrollments = enrollments.filter(is_completed=True)
 
         # Pagination
-        paginator = Paginator(enrollments, 12)
-        page = request.GET.get('page')
-        enrollments_page = paginator.get_page(page)
+        enrollments_page = paginate(request, enrollments, 12, ('-enrolled_at', '-id'))
+
+        # Status bo'yicha sonlar (cache dagi holatdan, so'rovsiz)
+        enrollment_state = get_enrollment_state(request.user.pk).values()
+        completed_count = sum(1 for entry in enrollment_state if entry.is_completed)
 
         context = {
             'enrollments': enrollments_page,
             'current_status': status,
+            'status_counts': {
+                'all': len(enrollment_state),
+                'active': len(enrollment_state) - completed_count,
+                'completed': completed_count,
+            },
             'page_title': 'Mening kurslarim',
         }
 
@@ -192,10 +201,7 @@ def instructor_courses_view(request):
     # O'qituvchi kurslari
     courses = Course.objects.filter(
         instructor=request.user
-    ).annotate(
-        student_count=Count('enrollment'),
-        lesson_count=Count('lessons')
-    ).order_by('-created_at')
+    )
 
     # Status filter
     status = request.GET.get('status', 'all')
@@ -205,9 +211,7 @@ def instructor_courses_view(request):
         courses = courses.filter(is_active=False)
 
     # Pagination
-    paginator = Paginator(courses, 12)
-    page = request.GET.get('page')
-    courses_page = paginator.get_page(page)
+    courses_page = paginate(request, courses, 12, ('-created_at', '-id'))
 
     # Statistics
     stats = {
@@ -305,6 +309,7 @@ def course_toggle_status_view(request, course_id):
     return redirect('courses:instructor_courses')
 
 
+@catalog_page
 def category_courses_view(request, level):
     """Daraja bo'yicha kurslar"""
     level_choices = dict(Course.LEVEL_CHOICES)
@@ -315,14 +320,10 @@ def category_courses_view(request, level):
     courses = Course.objects.filter(
         is_active=True,
         level=level
-    ).select_related('instructor').annotate(
-        student_count=Count('enrollment')
-    ).order_by('-created_at')
+    ).select_related('instructor')
 
     # Pagination
-    paginator = Paginator(courses, 12)
-    page = request.GET.get('page')
-    courses_page = paginator.get_page(page)
+    courses_page = paginate(request, courses, 12, ('-created_at', '-id'), count=lambda: cached_count(courses))
 
     context = {
         'courses': courses_page,
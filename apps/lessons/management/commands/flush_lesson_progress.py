@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from apps.lessons import progress_buffer
+
+
+class Command(BaseCommand):
+    help = 'Cache dagi video heartbeatlarini LessonProgress ga yozish (cron orqali ishga tushiriladi)'
+
+    def handle(self, *args, **options):
+        flushed = progress_buffer.flush()
+
+        self.stdout.write(self.style.SUCCESS(f'{flushed} ta dars progressi bazaga yozildi'))
@@ -15,6 +15,7 @@ class Lesson(models.Model):
     duration_minutes = models.PositiveIntegerField(default=0)
     is_free = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['course', 'order']
@@ -33,6 +34,13 @@ class LessonProgress(models.Model):
 
     class Meta:
         unique_together = ['student', 'lesson']
+        indexes = [
+            # Tugallangan darslar soni (progress, dashboard)
+            models.Index(
+                fields=['student', 'lesson'], name='lesson_progress_done_idx',
+                condition=models.Q(is_completed=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.student.username} - {self.lesson.title}"
\ No newline at end of file
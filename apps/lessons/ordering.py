@@ -0,0 +1,47 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .models import Lesson
+from .outline import invalidate_course_outline
+from apps.core.catalog import touch_catalog
+
+
+def reorder_lessons(course_id, lesson_ids):
+    """
+    Kurs darslariga yangi tartib berish (lesson_ids - yangi tartibdagi id lar).
+
+    Yuborilgan id lar kursdagi darslar bilan aynan bir xil bo'lishi kerak,
+    aks holda ValueError. Hammasi bitta tranzaksiyada: avval barcha darslar
+    vaqtincha (eng katta tartibdan yuqoriga) suriladi, so'ng bitta
+    UPDATE ... CASE bilan 1..n qilinadi. Shunda (course, order) unikalligi
+    oraliq holatda ham buzilmaydi.
+    """
+    try:
+        lesson_ids = [int(lesson_id) for lesson_id in lesson_ids]
+    except (TypeError, ValueError):
+        raise ValueError('Noto\'g\'ri dars id si')
+
+    with transaction.atomic():
+        lessons = Lesson.objects.filter(course_id=course_id)
+        current = dict(lessons.select_for_update().values_list('id', 'order'))
+
+        if len(lesson_ids) != len(set(lesson_ids)):
+            raise ValueError('Darslar ro\'yxatida takroriy id bor')
+        if set(lesson_ids) != set(current):
+            raise ValueError('Darslar ro\'yxati kursdagi darslarga mos kelmaydi')
+
+        if all(current[lesson_id] == position for position, lesson_id in enumerate(lesson_ids, 1)):
+            return 0
+
+        offset = max(current.values()) + 1
+        lessons.update(order=F('order') + offset)
+        updated = lessons.update(order=Case(
+            *[When(pk=lesson_id, then=Value(position)) for position, lesson_id in enumerate(lesson_ids, 1)],
+            output_field=IntegerField(),
+        ), updated_at=timezone.now())
+
+        transaction.on_commit(lambda: invalidate_course_outline(course_id))
+        transaction.on_commit(touch_catalog)
+
+    return updated
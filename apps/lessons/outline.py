@@ -0,0 +1,111 @@
+"""
+Kurs darslari tartibi (outline).
+
+Har bir kurs uchun darslar ro'yxati (id, sarlavha, tartib, bepulmi,
+davomiylik, URL) bir marta quriladi va cache da saqlanadi. Oldingi/keyingi
+dars, darsning o'rni va yon paneldagi ro'yxat shu yerdan olinadi.
+Dars qo'shilganda, o'zgarganda, o'chirilganda yoki tartib o'zgarganda
+kurs versiyasi oshiriladi.
+"""
+from django.core.cache import cache
+from django.urls import reverse
+
+from .models import Lesson
+
+OUTLINE_TIMEOUT = 86400
+
+
+class OutlineLesson:
+    """Outline elementi (template filterlar uchun pk va course_id bor)"""
+
+    def __init__(self, id, course_id, title, order, is_free, duration_minutes, url, position):
+        self.id = self.pk = id
+        self.course_id = course_id
+        self.title = title
+        self.order = order
+        self.is_free = is_free
+        self.duration_minutes = duration_minutes
+        self.url = url
+        self.position = position
+
+
+class CourseOutline:
+    """Kurs darslari tartib bo'yicha, id orqali O(1) qidiruv bilan"""
+
+    def __init__(self, course_id, rows):
+        self.course_id = course_id
+        self.lessons = [
+            OutlineLesson(course_id=course_id, position=position, **row)
+            for position, row in enumerate(rows, 1)
+        ]
+        self._by_id = {lesson.id: lesson for lesson in self.lessons}
+
+    def __iter__(self):
+        return iter(self.lessons)
+
+    def __len__(self):
+        return len(self.lessons)
+
+    def get(self, lesson_id):
+        return self._by_id.get(lesson_id)
+
+    def position(self, lesson_id):
+        """Darsning kursdagi o'rni (1 dan boshlanadi)"""
+        lesson = self._by_id.get(lesson_id)
+        return lesson.position if lesson else None
+
+    def previous(self, lesson_id):
+        lesson = self._by_id.get(lesson_id)
+        if lesson is None or lesson.position == 1:
+            return None
+        return self.lessons[lesson.position - 2]
+
+    def next(self, lesson_id):
+        lesson = self._by_id.get(lesson_id)
+        if lesson is None or lesson.position == len(self.lessons):
+            return None
+        return self.lessons[lesson.position]
+
+    @property
+    def total_duration(self):
+        return sum(lesson.duration_minutes for lesson in self.lessons)
+
+    @property
+    def free_lessons(self):
+        return [lesson for lesson in self.lessons if lesson.is_free]
+
+
+def _version_key(course_id):
+    return f'lesson_outline_version_{course_id}'
+
+
+def invalidate_course_outline(*course_ids):
+    for course_id in course_ids:
+        try:
+            cache.incr(_version_key(course_id))
+        except ValueError:
+            cache.set(_version_key(course_id), 1, None)
+
+
+def build_outline_rows(course_id):
+    """Outline uchun bitta so'rov (cache ga oddiy dict lar yoziladi)"""
+    rows = Lesson.objects.filter(course_id=course_id).order_by('order', 'id').values(
+        'id', 'title', 'order', 'is_free', 'duration_minutes'
+    )
+    return [
+        {**row, 'url': reverse('lessons:detail', args=[course_id, row['id']])}
+        for row in rows
+    ]
+
+
+def get_course_outline(course_id):
+    """Kurs outline i (cache dan, o'zgarganda qayta quriladi)"""
+    version = cache.get_or_set(_version_key(course_id), 1, None)
+    cache_key = f'lesson_outline_{course_id}_v{version}'
+
+    rows = cache.get(cache_key)
+    if rows is None:
+        rows = build_outline_rows(course_id)
+        cache.set(cache_key, rows, OUTLINE_TIMEOUT)
+
+    return CourseOutline(course_id, rows)
@@ -0,0 +1,200 @@
+"""
+Video heartbeatlari uchun write-behind bufer.
+
+Player har necha soniyada ko'rilgan vaqtni yuboradi. Har bir heartbeatni
+bazaga yozish o'rniga qiymat cache da (student, lesson) kaliti bo'yicha
+saqlanadi (max-merge) va vaqti-vaqti bilan bitta bulk upsert bilan
+LessonProgress ga yoziladi.
+
+Cache kalitlarini skanerlab bo'lmagani uchun yangi kalitlar ketma-ket
+"slot"larda ro'yxatga olinadi (cache.incr atomar). Flush oxirgi flush
+qilingan slotdan joriy slotgacha bo'lgan kalitlarni yig'adi. Slot raqami
+qiymat bilan birga saqlanadi, shuning uchun flush qilingan slotdagi kalit
+keyingi heartbeatda qayta ro'yxatga olinadi.
+
+Heartbeat va flush parallel ishlaganda qiymat yo'qolmasligi uchun:
+- ro'yxatga olishda avval qiymat, keyin slot yoziladi; band qilingan, lekin
+  hali yozilmagan slot keyingi flushlarda yana o'qiladi (MAX_RETRY_ATTEMPTS);
+- flush qiymatlarni o'chirmaydi (cache da compare-and-delete yo'q): o'qilgan
+  qiymat o'zgarmagan bo'lsa faqat muddati qisqartiriladi (touch), o'zgargan
+  bo'lsa yangi slotda qayta ro'yxatga olinadi;
+- heartbeat yozgandan keyin flush uning slotidan o'tib ketganini ko'rsa
+  qiymatni qayta ro'yxatga oladi;
+- bazaga max-merge UPSERT ichida (GREATEST/MAX) qilinadi, flush esa bir
+  vaqtda faqat bitta processda ishlaydi.
+
+Bir nechta process bo'lsa umumiy cache backend (Redis/Memcached) kerak.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .models import LessonProgress
+
+KEY_PREFIX = 'lesson_progress_buffer'
+SEQ_KEY = f'{KEY_PREFIX}:seq'
+FLUSHED_KEY = f'{KEY_PREFIX}:flushed'
+FLUSH_LOCK_KEY = f'{KEY_PREFIX}:flush_lock'
+FLUSH_RUNNING_KEY = f'{KEY_PREFIX}:flush_running'
+RETRY_KEY = f'{KEY_PREFIX}:retry'
+
+# Flush bir vaqtda faqat bitta processda (web yoki buyruq) ishlaydi
+FLUSH_RUNNING_TIMEOUT = 300
+
+# Band qilingan, lekin yozilmagan slot necha flushgacha qayta o'qiladi
+MAX_RETRY_ATTEMPTS = 3
+
+UPSERT_BATCH_SIZE = 500
+
+# Flush ishlamay qolsa ham ma'lumot darhol yo'qolmasligi uchun
+ENTRY_TIMEOUT = 24 * 3600
+
+# Bazaga yozilgan qiymat keyingi heartbeatlar uchun (max-merge) qancha qoladi
+FLUSHED_ENTRY_TIMEOUT = 3600
+
+
+def is_enabled():
+    return settings.LESSON_PROGRESS_WRITE_BEHIND
+
+
+def _entry_key(student_id, lesson_id):
+    return f'{KEY_PREFIX}:{student_id}:{lesson_id}'
+
+
+def _slot_key(slot):
+    return f'{KEY_PREFIX}:slot:{slot}'
+
+
+def _completed_key(student_id, lesson_id):
+    return f'{KEY_PREFIX}:done:{student_id}:{lesson_id}'
+
+
+def _next_slot():
+    cache.add(SEQ_KEY, 0, None)
+    return cache.incr(SEQ_KEY)
+
+
+def _register(student_id, lesson_id, watched_duration):
+    """Kalitni yangi slotda ro'yxatga olish: avval qiymat, keyin slot"""
+    slot = _next_slot()
+    cache.set(_entry_key(student_id, lesson_id), (watched_duration, slot), ENTRY_TIMEOUT)
+    cache.set(_slot_key(slot), (student_id, lesson_id), ENTRY_TIMEOUT)
+    return slot
+
+
+def record_heartbeat(student_id, lesson_id, watched_duration):
+    """Heartbeatni buferga yozish, buferdagi eng katta qiymatni qaytaradi"""
+    key = _entry_key(student_id, lesson_id)
+    current = cache.get_many([key, FLUSHED_KEY])
+    entry = current.get(key)
+    last_flushed = current.get(FLUSHED_KEY) or 0
+
+    if entry is not None and entry[1] > last_flushed:
+        if watched_duration <= entry[0]:
+            return entry[0]
+        slot = entry[1]
+        cache.set(key, (watched_duration, slot), ENTRY_TIMEOUT)
+    else:
+        # Yangi (yoki allaqachon flush qilingan) kalit - flush uchun ro'yxatga olish
+        watched_duration = max(watched_duration, entry[0] if entry else 0)
+        slot = _register(student_id, lesson_id, watched_duration)
+
+    # Flush shu orada slotdan o'tib ketgan bo'lsa yangi qiymatni o'qimagan bo'lishi mumkin
+    if (cache.get(FLUSHED_KEY) or 0) >= slot:
+        _register(student_id, lesson_id, watched_duration)
+    return watched_duration
+
+
+def is_marked_completed(student_id, lesson_id):
+    return bool(cache.get(_completed_key(student_id, lesson_id)))
+
+
+def mark_completed(student_id, lesson_id):
+    """Tugallangan darslar uchun qayta-qayta bazaga murojaat qilmaslik"""
+    cache.set(_completed_key(student_id, lesson_id), True, ENTRY_TIMEOUT)
+
+
+def flush_if_due():
+    """Flush intervali o'tgan bo'lsa buferni bazaga yozish"""
+    if cache.add(FLUSH_LOCK_KEY, True, settings.LESSON_PROGRESS_FLUSH_INTERVAL):
+        return flush()
+    return 0
+
+
+def flush():
+    """
+    Buferdagi barcha qiymatlarni bazaga yozish. Boshqa flush ishlayotgan
+    bo'lsa (web workerda yoki buyruqda) hech narsa qilinmaydi.
+    """
+    if not cache.add(FLUSH_RUNNING_KEY, True, FLUSH_RUNNING_TIMEOUT):
+        return 0
+    try:
+        return _flush()
+    finally:
+        cache.delete(FLUSH_RUNNING_KEY)
+
+
+def _flush():
+    cache.add(SEQ_KEY, 0, None)
+    head = cache.get(SEQ_KEY) or 0
+    last_flushed = cache.get(FLUSHED_KEY) or 0
+    retry = cache.get(RETRY_KEY) or {}
+    new_slots = range(last_flushed + 1, head + 1)
+    if not retry and not new_slots:
+        return 0
+
+    slot_keys = [_slot_key(slot) for slot in [*retry, *new_slots]]
+    pairs = cache.get_many(slot_keys)
+    entry_keys = {_entry_key(*pair): pair for pair in set(pairs.values())}
+    entries = cache.get_many(list(entry_keys))
+
+    # Band qilingan, lekin hali yozilmagan slotlar keyingi flushlarda yana o'qiladi
+    attempts = {slot: 1 for slot in new_slots}
+    attempts.update({slot: count + 1 for slot, count in retry.items()})
+    retry = {
+        slot: count for slot, count in attempts.items()
+        if _slot_key(slot) not in pairs and count < MAX_RETRY_ATTEMPTS
+    }
+    cache.set(RETRY_KEY, retry, ENTRY_TIMEOUT)
+    cache.set(FLUSHED_KEY, head, None)
+    cache.delete_many(list(pairs))
+
+    # O'qilgandan keyin o'zgargan qiymatlar keyingi flushga qoladi
+    for key, latest in cache.get_many(list(entries)).items():
+        if latest == entries[key]:
+            cache.touch(key, FLUSHED_ENTRY_TIMEOUT)
+        elif latest[1] <= head:
+            _register(*entry_keys[key], latest[0])
+
+    buffered = {entry_keys[key]: watched for key, (watched, _) in entries.items()}
+
+    if not buffered:
+        return 0
+
+    rows = [(student_id, lesson_id, watched) for (student_id, lesson_id), watched in buffered.items()]
+    _upsert_max(rows)
+    return len(rows)
+
+
+def _upsert_max(rows):
+    """
+    (student_id, lesson_id, watched) qatorlarini upsert qilish. Bazadagi
+    qiymatdan kichik bo'lsa ustiga yozilmaydi (max-merge) - taqqoslash
+    UPSERT ning o'zida, shuning uchun parallel saqlangan kattaroq qiymat
+    yo'qolmaydi.
+    """
+    quote = connection.ops.quote_name
+    table = quote(LessonProgress._meta.db_table)
+    greatest = 'GREATEST' if connection.vendor == 'postgresql' else 'MAX'
+
+    with connection.cursor() as cursor:
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            batch = rows[start:start + UPSERT_BATCH_SIZE]
+            values = ', '.join(['(%s, %s, %s, %s)'] * len(batch))
+            cursor.execute(
+                f'INSERT INTO {table} (student_id, lesson_id, watched_duration, is_completed) '
+                f'VALUES {values} '
+                f'ON CONFLICT (student_id, lesson_id) DO UPDATE SET watched_duration = '
+                f'{greatest}({table}.watched_duration, excluded.watched_duration)',
+                [value for row in batch for value in (*row, False)]
+            )
@@ -1,71 +1,96 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
-from .models import LessonProgress
-from apps.courses.models import Enrollment
+from .models import Lesson, LessonProgress
+from apps.courses.counters import adjust_course_counters, reconcile_course_counters
+from apps.courses.progress import apply_completed_delta, refresh_course_progress
+from .outline import invalidate_course_outline
+
+
+@receiver(post_init, sender=LessonProgress)
+def remember_lesson_progress_state(sender, instance, **kwargs):
+    """Saqlashdan oldingi holatni eslab qolish (o'tishlarni aniqlash uchun)"""
+    instance._was_completed = instance.is_completed
 
 
 @receiver(post_save, sender=LessonProgress)
-def update_course_progress_on_lesson_complete(sender, instance, **kwargs):
+def update_course_progress_on_lesson_complete(sender, instance, created, **kwargs):
     """Dars tugallanganda course progress yangilash"""
-    if instance.is_completed:
-        try:
-            enrollment = Enrollment.objects.get(
-                student=instance.student,
-                course=instance.lesson.course
-            )
+    was_completed = False if created else instance._was_completed
+    instance._was_completed = instance.is_completed
 
-            # Course dagi barcha darslar
-            total_lessons = instance.lesson.course.lessons.count()
-            if total_lessons == 0:
-                return
+    # Faqat holat o'zgarganda (heartbeatlarda hech narsa qilinmaydi)
+    if instance.is_completed == was_completed:
+        return
 
-            # Tugallangan darslar
-            completed_lessons = LessonProgress.objects.filter(
-                student=instance.student,
-                lesson__course=instance.lesson.course,
-                is_completed=True
-            ).count()
+    delta = 1 if instance.is_completed else -1
+    apply_completed_delta(instance.student_id, instance.lesson_id, delta)
 
-            # Progress hisoblash
-            progress = round((completed_lessons / total_lessons) * 100)
-            enrollment.progress = progress
 
-            # 100% bo'lsa kursni tugallangan deb belgilash
-            if progress >= 100:
-                enrollment.is_completed = True
+@receiver(post_delete, sender=LessonProgress)
+def update_course_progress_on_lesson_delete(sender, instance, **kwargs):
+    """Lesson progress o'chirilganda course progress yangilash"""
+    if instance._was_completed:
+        apply_completed_delta(instance.student_id, instance.lesson_id, -1)
 
-            enrollment.save()
 
-        except Enrollment.DoesNotExist:
-            pass
+def _lesson_counter_state(instance):
+    """(course_id, duration_minutes); yuklanmagan (deferred) maydonlar None bo'ladi"""
+    return instance.__dict__.get('course_id'), instance.__dict__.get('duration_minutes')
 
 
-@receiver(post_delete, sender=LessonProgress)
-def update_course_progress_on_lesson_delete(sender, instance, **kwargs):
-    """Lesson progress o'chirilganda course progress yangilash"""
-    try:
-        enrollment = Enrollment.objects.get(
-            student=instance.student,
-            course=instance.lesson.course
+@receiver(post_init, sender=Lesson)
+def remember_lesson_state(sender, instance, **kwargs):
+    """Kurs hisoblagichlari uchun saqlashdan oldingi qiymatlar"""
+    instance._counter_snapshot = _lesson_counter_state(instance)
+
+
+@receiver([post_save, post_delete], sender=Lesson)
+def invalidate_outline_on_lesson_change(sender, instance, **kwargs):
+    """Dars o'zgarganda kurs outline ini yangilash (ko'chirilgan bo'lsa ikkala kursni)"""
+    old_course_id = instance._counter_snapshot[0]
+    invalidate_course_outline(*{old_course_id, instance.course_id} - {None})
+
+
+@receiver(post_save, sender=Lesson)
+def update_course_lesson_counters(sender, instance, created, **kwargs):
+    """Dars qo'shilganda yoki o'zgarganda kurs darslari soni va davomiyligini yangilash"""
+    old_course_id, old_duration = instance._counter_snapshot
+    instance._counter_snapshot = _lesson_counter_state(instance)
+
+    if created:
+        adjust_course_counters(
+            instance.course_id,
+            lesson_count=1,
+            total_duration_minutes=instance.duration_minutes
+        )
+        refresh_course_progress(instance.course_id)
+    elif None in (old_course_id, old_duration):
+        # Eski qiymat noma'lum - hisoblagichlarni qayta sanash
+        reconcile_course_counters({old_course_id, instance.course_id} - {None})
+        refresh_course_progress(instance.course_id)
+    elif old_course_id != instance.course_id:
+        # Dars boshqa kursga ko'chirilgan
+        adjust_course_counters(old_course_id, lesson_count=-1, total_duration_minutes=-old_duration)
+        adjust_course_counters(
+            instance.course_id,
+            lesson_count=1,
+            total_duration_minutes=instance.duration_minutes
         )
+        refresh_course_progress(old_course_id)
+        refresh_course_progress(instance.course_id)
+    else:
+        adjust_course_counters(
+            instance.course_id,
+            total_duration_minutes=instance.duration_minutes - old_duration
+        )
+
 
-        total_lessons = instance.lesson.course.lessons.count()
-        if total_lessons == 0:
-            enrollment.progress = 0
-            enrollment.is_completed = False
-            enrollment.save()
-            return
-
-        completed_lessons = LessonProgress.objects.filter(
-            student=instance.student,
-            lesson__course=instance.lesson.course,
-            is_completed=True
-        ).count()
-
-        progress = round((completed_lessons / total_lessons) * 100)
-        enrollment.progress = progress
-        enrollment.is_completed = (progress >= 100)
-        enrollment.save()
-
-    except Enrollment.DoesNotExist:
-        pass
\ No newline at end of file
+@receiver(post_delete, sender=Lesson)
+def decrement_course_lesson_counters(sender, instance, **kwargs):
+    """Dars o'chirilganda kurs darslari soni va davomiyligini kamaytirish"""
+    course_id, duration = instance._counter_snapshot
+    if duration is None:
+        reconcile_course_counters([instance.course_id])
+    else:
+        adjust_course_counters(course_id, lesson_count=-1, total_duration_minutes=-duration)
+    refresh_course_progress(instance.course_id)
\ No newline at end of file
@@ -1,5 +1,6 @@
 from django import template
-from apps.lessons.models import LessonProgress
+from apps.core.viewer_state import get_viewer_state
+from apps.lessons.outline import get_course_outline
 
 register = template.Library()
 
@@ -10,10 +11,7 @@ def lesson_progress(user, lesson):
     if not user.is_authenticated:
         return None
 
-    try:
-        return LessonProgress.objects.get(student=user, lesson=lesson)
-    except LessonProgress.DoesNotExist:
-        return None
+    return get_viewer_state(user).lesson_progress(lesson)
 
 
 @register.filter
@@ -22,11 +20,8 @@ def is_lesson_completed(user, lesson):
     if not user.is_authenticated:
         return False
 
-    try:
-        progress = LessonProgress.objects.get(student=user, lesson=lesson)
-        return progress.is_completed
-    except LessonProgress.DoesNotExist:
-        return False
+    progress = get_viewer_state(user).lesson_progress(lesson)
+    return progress.is_completed if progress else False
 
 
 @register.filter
@@ -35,14 +30,14 @@ def lesson_watched_percentage(user, lesson):
     if not user.is_authenticated or lesson.duration_minutes == 0:
         return 0
 
-    try:
-        progress = LessonProgress.objects.get(student=user, lesson=lesson)
-        watched_minutes = progress.watched_duration / 60  # seconds to minutes
-        percentage = (watched_minutes / lesson.duration_minutes) * 100
-        return min(100, round(percentage, 1))
-    except LessonProgress.DoesNotExist:
+    progress = get_viewer_state(user).lesson_progress(lesson)
+    if not progress:
         return 0
 
+    watched_minutes = progress.watched_duration / 60  # seconds to minutes
+    percentage = (watched_minutes / lesson.duration_minutes) * 100
+    return min(100, round(percentage, 1))
+
 
 @register.filter
 def format_video_url(url):
@@ -72,14 +67,12 @@ def lesson_status_badge(user, lesson):
     if not user.is_authenticated:
         return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-gray-100 text-gray-800">Ko\'rish uchun login qiling</span>'
 
-    try:
-        progress = LessonProgress.objects.get(student=user, lesson=lesson)
+    progress = get_viewer_state(user).lesson_progress(lesson)
+    if progress:
         if progress.is_completed:
             return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-green-100 text-green-800">✓ Tugallangan</span>'
         elif progress.watched_duration > 0:
             return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-yellow-100 text-yellow-800">📺 Ko\'rilmoqda</span>'
-    except LessonProgress.DoesNotExist:
-        pass
 
     return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-blue-100 text-blue-800">🎯 Yangi</span>'
 
@@ -107,35 +100,21 @@ def video_player(lesson, user=None):
 @register.simple_tag
 def next_lesson_url(lesson):
     """Keyingi dars URL"""
-    from django.urls import reverse
-
-    next_lesson = lesson.course.lessons.filter(
-        order__gt=lesson.order
-    ).order_by('order').first()
-
-    if next_lesson:
-        return reverse('lessons:detail', kwargs={
-            'course_id': lesson.course.id,
-            'lesson_id': next_lesson.id
-        })
-    return None
+    next_lesson = get_course_outline(lesson.course_id).next(lesson.id)
+    return next_lesson.url if next_lesson else None
 
 
 @register.simple_tag
 def prev_lesson_url(lesson):
     """Oldingi dars URL"""
-    from django.urls import reverse
-
-    prev_lesson = lesson.course.lessons.filter(
-        order__lt=lesson.order
-    ).order_by('-order').first()
-
-    if prev_lesson:
-        return reverse('lessons:detail', kwargs={
-            'course_id': lesson.course.id,
-            'lesson_id': prev_lesson.id
-        })
-    return None
+    prev_lesson = get_course_outline(lesson.course_id).previous(lesson.id)
+    return prev_lesson.url if prev_lesson else None
+
+
+@register.simple_tag
+def lesson_position(lesson):
+    """Darsning kursdagi o'rni (1 dan boshlanadi)"""
+    return get_course_outline(lesson.course_id).position(lesson.id)
 
 
 @register.filter
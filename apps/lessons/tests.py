@@ -1,3 +1,168 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from apps.accounts.models import User
+from apps.courses.models import Course
+from . import progress_buffer
+from .models import Lesson, LessonProgress
+from .ordering import reorder_lessons
+from .outline import get_course_outline
+
+
+class ProgressBufferTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.lesson = Lesson.objects.create(course=course, title='1-dars')
+
+    def _watched(self):
+        return LessonProgress.objects.filter(
+            student=self.student, lesson=self.lesson
+        ).values_list('watched_duration', flat=True).first()
+
+    def test_flush_between_slot_reservation_and_write(self):
+        next_slot = progress_buffer._next_slot
+
+        def reserve_then_flush():
+            slot = next_slot()
+            progress_buffer.flush()
+            return slot
+
+        with mock.patch.object(progress_buffer, '_next_slot', side_effect=reserve_then_flush):
+            progress_buffer.record_heartbeat(self.student.pk, self.lesson.pk, 30)
+
+        # Boshqa heartbeat kelmasa ham keyingi flush qiymatni yozadi
+        progress_buffer.flush()
+        self.assertEqual(self._watched(), 30)
+
+    def test_heartbeat_between_flush_read_and_cleanup(self):
+        progress_buffer.record_heartbeat(self.student.pk, self.lesson.pk, 30)
+        entry_key = progress_buffer._entry_key(self.student.pk, self.lesson.pk)
+        get_many = cache.get_many
+        interleaved = []
+
+        def get_many_then_heartbeat(keys, *args, **kwargs):
+            values = get_many(keys, *args, **kwargs)
+            if entry_key in keys and not interleaved:
+                interleaved.append(True)
+                progress_buffer.record_heartbeat(self.student.pk, self.lesson.pk, 45)
+            return values
+
+        with mock.patch.object(progress_buffer.cache, 'get_many', side_effect=get_many_then_heartbeat):
+            progress_buffer.flush()
+        self.assertEqual(self._watched(), 30)
+
+        progress_buffer.flush()
+        self.assertEqual(self._watched(), 45)
+
+    def test_flush_does_not_lower_saved_duration(self):
+        progress_buffer.record_heartbeat(self.student.pk, self.lesson.pk, 30)
+        # Parallel so'rov bazaga kattaroq qiymat saqlagan
+        LessonProgress.objects.create(student=self.student, lesson=self.lesson, watched_duration=100)
+
+        progress_buffer.flush()
+
+        self.assertEqual(self._watched(), 100)
+
+    def test_concurrent_flush_is_skipped(self):
+        progress_buffer.record_heartbeat(self.student.pk, self.lesson.pk, 30)
+        cache.add(progress_buffer.FLUSH_RUNNING_KEY, True)
+
+        self.assertEqual(progress_buffer.flush(), 0)
+        cache.delete(progress_buffer.FLUSH_RUNNING_KEY)
+        self.assertEqual(progress_buffer.flush(), 1)
+
+    def test_empty_slots_are_dropped_after_retries(self):
+        # Slot band qilingan, lekin process yozishdan oldin to'xtagan
+        progress_buffer._next_slot()
+
+        for _ in range(progress_buffer.MAX_RETRY_ATTEMPTS):
+            progress_buffer.flush()
+
+        self.assertEqual(cache.get(progress_buffer.RETRY_KEY), {})
+
+
+class LessonReorderTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course, other = [
+            Course.objects.create(
+                title=title, description='Kurs', instructor=teacher,
+                level='beginner', duration_weeks=4
+            )
+            for title in ('Anatomiya', 'Fiziologiya')
+        ]
+        self.lessons = [Lesson.objects.create(course=self.course, title=f'{i}-dars', order=i) for i in range(1, 5)]
+        self.other_lesson = Lesson.objects.create(course=other, title='Boshqa', order=1)
+
+    def _order(self):
+        return list(Lesson.objects.filter(course=self.course).order_by('order').values_list('pk', flat=True))
+
+    def test_reorder_in_one_case_update(self):
+        new_order = [lesson.pk for lesson in reversed(self.lessons)]
+
+        # Savepoint, qulflash (SELECT FOR UPDATE), surish, CASE update, release
+        with self.assertNumQueries(5):
+            self.assertEqual(reorder_lessons(self.course.pk, new_order), 4)
+
+        self.assertEqual(self._order(), new_order)
+        self.assertEqual(
+            list(Lesson.objects.filter(course=self.course).order_by('order').values_list('order', flat=True)),
+            [1, 2, 3, 4]
+        )
+
+    def test_lessons_of_another_course_are_rejected(self):
+        lesson_ids = [lesson.pk for lesson in self.lessons[1:]] + [self.other_lesson.pk]
+
+        with self.assertRaises(ValueError):
+            reorder_lessons(self.course.pk, lesson_ids)
+
+        self.assertEqual(self._order(), [lesson.pk for lesson in self.lessons])
+
+    def test_duplicate_ids_are_rejected(self):
+        with self.assertRaises(ValueError):
+            reorder_lessons(self.course.pk, [lesson.pk for lesson in self.lessons] + [self.lessons[0].pk])
+
+
+class CourseOutlineTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.lessons = [Lesson.objects.create(course=self.course, title=f'{i}-dars', order=i) for i in range(1, 4)]
+
+    def test_previous_and_next_from_cache(self):
+        first, middle, last = self.lessons
+        get_course_outline(self.course.pk)
+
+        with self.assertNumQueries(0):
+            outline = get_course_outline(self.course.pk)
+
+        self.assertEqual(outline.position(middle.pk), 2)
+        self.assertEqual((outline.previous(middle.pk).pk, outline.next(middle.pk).pk), (first.pk, last.pk))
+        self.assertIsNone(outline.previous(first.pk))
+        self.assertIsNone(outline.next(last.pk))
+
+    def test_outline_rebuilt_after_changes(self):
+        get_course_outline(self.course.pk)
+
+        self.lessons[0].delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            reorder_lessons(self.course.pk, [self.lessons[2].pk, self.lessons[1].pk])
+
+        outline = get_course_outline(self.course.pk)
+        self.assertEqual([lesson.pk for lesson in outline], [self.lessons[2].pk, self.lessons[1].pk])
@@ -9,34 +9,38 @@ from django.utils import timezone
 
 from .models import Lesson, LessonProgress
 from .forms import LessonCreateForm, LessonEditForm, LessonProgressForm
-from apps.courses.models import Course, Enrollment
+from . import progress_buffer
+from .outline import get_course_outline
+from .ordering import reorder_lessons
+from apps.courses.models import Course
+from apps.courses.access import course_access
 from apps.quizzes.models import Quiz
 
 
+@course_access
 def lesson_list_view(request, course_id):
     """Kurs darslari ro'yxati"""
     course = get_object_or_404(Course, id=course_id, is_active=True)
 
-    # Enrollment tekshirish
-    is_enrolled = False
-    if request.user.is_authenticated:
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
-
     # Faqat enrolled yoki o'qituvchi ko'rishi mumkin
-    can_view = (
-            request.user.is_authenticated and
-            (is_enrolled or request.user == course.instructor or request.user.role == 'admin')
-    )
+    is_enrolled = request.access.is_enrolled(course)
+    can_view = request.access.can_view(course)
 
-    lessons = course.lessons.all().order_by('order')
+    lessons = course.lessons.prefetch_related('quizzes').order_by('order')
 
     # Free lessons barchaga ko'rsatish
     if not can_view:
         lessons = lessons.filter(is_free=True)
 
+    # Darslar soni, davomiyligi va o'rni outline dan
+    outline = get_course_outline(course.id)
+    lessons = list(lessons)
+    for lesson in lessons:
+        lesson.position = outline.position(lesson.id)
+
     # Progress ma'lumotlari
     lesson_progress = {}
-    if request.user.is_authenticated and is_enrolled:
+    if is_enrolled:
         progress_data = LessonProgress.objects.filter(
             student=request.user,
             lesson__course=course
@@ -47,6 +51,7 @@ def lesson_list_view(request, course_id):
     context = {
         'course': course,
         'lessons': lessons,
+        'outline': outline,
         'is_enrolled': is_enrolled,
         'can_view': can_view,
         'lesson_progress': lesson_progress,
@@ -56,26 +61,18 @@ def lesson_list_view(request, course_id):
     return render(request, 'lessons/lesson_list.html', context)
 
 
+@course_access
 def lesson_detail_view(request, course_id, lesson_id):
     """Dars tafsilotlari"""
-    course = get_object_or_404(Course, id=course_id, is_active=True)
-    lesson = get_object_or_404(Lesson, id=lesson_id, course=course)
-
-    # Access tekshirish
-    can_view = False
-    is_enrolled = False
-
-    if request.user.is_authenticated:
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
-        can_view = (
-                is_enrolled or
-                request.user == course.instructor or
-                request.user.role == 'admin'
-        )
+    lesson = get_object_or_404(
+        Lesson.objects.select_related('course'),
+        id=lesson_id, course_id=course_id, course__is_active=True
+    )
+    course = lesson.course
 
-    # Free lesson bo'lsa barchaga ko'rsatish
-    if lesson.is_free:
-        can_view = True
+    # Access tekshirish (free lesson bo'lsa barchaga ko'rsatish)
+    is_enrolled = request.access.is_enrolled(course)
+    can_view = lesson.is_free or request.access.can_view(course)
 
     if not can_view:
         messages.error(request, 'Bu darsni ko\'rish uchun kursga yozilishingiz kerak!')
@@ -83,7 +80,7 @@ def lesson_detail_view(request, course_id, lesson_id):
 
     # Progress ma'lumotlari
     lesson_progress = None
-    if request.user.is_authenticated and is_enrolled:
+    if is_enrolled:
         lesson_progress, created = LessonProgress.objects.get_or_create(
             student=request.user,
             lesson=lesson,
@@ -93,17 +90,18 @@ def lesson_detail_view(request, course_id, lesson_id):
     # Quizlar
     quizzes = lesson.quizzes.all()
 
-    # Oldingi va keyingi darslar
-    prev_lesson = course.lessons.filter(order__lt=lesson.order).order_by('-order').first()
-    next_lesson = course.lessons.filter(order__gt=lesson.order).order_by('order').first()
+    # Oldingi va keyingi darslar (outline dan, qo'shimcha so'rovsiz)
+    outline = get_course_outline(course.id)
 
     context = {
         'course': course,
         'lesson': lesson,
         'lesson_progress': lesson_progress,
         'quizzes': quizzes,
-        'prev_lesson': prev_lesson,
-        'next_lesson': next_lesson,
+        'outline': outline,
+        'lesson_position': outline.position(lesson.id),
+        'prev_lesson': outline.previous(lesson.id),
+        'next_lesson': outline.next(lesson.id),
         'is_enrolled': is_enrolled,
         'page_title': f'{lesson.title} - {course.title}',
     }
@@ -113,12 +111,13 @@ def lesson_detail_view(request, course_id, lesson_id):
 
 @login_required
 @require_http_methods(["POST"])
+@course_access
 def mark_lesson_complete(request, lesson_id):
     """Darsni tugallangan deb belgilash"""
     lesson = get_object_or_404(Lesson, id=lesson_id)
 
     # Enrollment tekshirish
-    if not Enrollment.objects.filter(student=request.user, course=lesson.course).exists():
+    if not request.access.is_enrolled(lesson.course_id):
         return JsonResponse({'success': False, 'message': 'Kursga yozilmagan!'})
 
     # Progress yaratish yoki yangilash
@@ -135,10 +134,7 @@ def mark_lesson_complete(request, lesson_id):
     if not progress.is_completed:
         progress.is_completed = True
         progress.completed_at = timezone.now()
-        progress.save()
-
-        # Course progress yangilash
-        update_course_progress(request.user, lesson.course)
+        progress.save()  # Course progress signal orqali yangilanadi
 
         return JsonResponse({
             'success': True,
@@ -155,42 +151,70 @@ def mark_lesson_complete(request, lesson_id):
 
 @login_required
 @require_http_methods(["POST"])
+@course_access
 def update_lesson_progress(request, lesson_id):
     """Dars progress yangilash (video watching)"""
     lesson = get_object_or_404(Lesson, id=lesson_id)
 
     # Enrollment tekshirish
-    if not Enrollment.objects.filter(student=request.user, course=lesson.course).exists():
+    if not request.access.is_enrolled(lesson.course_id):
         return JsonResponse({'success': False, 'message': 'Kursga yozilmagan!'})
 
     try:
         watched_duration = int(request.POST.get('watched_duration', 0))
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri ma\'lumot!'})
 
-        progress, created = LessonProgress.objects.get_or_create(
-            student=request.user,
-            lesson=lesson,
-            defaults={'watched_duration': watched_duration}
-        )
-
-        progress.watched_duration = max(progress.watched_duration, watched_duration)
-
-        # 80% ko'rgan bo'lsa tugallangan deb hisoblash
-        if watched_duration >= (lesson.duration_minutes * 60 * 0.8):
+    # 80% ko'rgan bo'lsa tugallangan deb hisoblash
+    reached_completion = watched_duration >= (lesson.duration_minutes * 60 * 0.8)
+
+    if progress_buffer.is_enabled():
+        # Heartbeat cache ga yoziladi, bazaga vaqti-vaqti bilan flush qilinadi
+        watched_duration = progress_buffer.record_heartbeat(request.user.id, lesson.id, watched_duration)
+        is_completed = progress_buffer.is_marked_completed(request.user.id, lesson.id)
+
+        # Tugallash darhol bazaga yoziladi (course progress signal orqali)
+        if reached_completion and not is_completed:
+            progress, created = LessonProgress.objects.get_or_create(
+                student=request.user,
+                lesson=lesson,
+                defaults={'watched_duration': watched_duration}
+            )
+            progress.watched_duration = max(progress.watched_duration, watched_duration)
             if not progress.is_completed:
                 progress.is_completed = True
                 progress.completed_at = timezone.now()
-                update_course_progress(request.user, lesson.course)
+            progress.save()
+            progress_buffer.mark_completed(request.user.id, lesson.id)
+            is_completed = True
 
-        progress.save()
+        progress_buffer.flush_if_due()
 
         return JsonResponse({
             'success': True,
-            'watched_duration': progress.watched_duration,
-            'is_completed': progress.is_completed
+            'watched_duration': watched_duration,
+            'is_completed': is_completed
         })
 
-    except ValueError:
-        return JsonResponse({'success': False, 'message': 'Noto\'g\'ri ma\'lumot!'})
+    progress, created = LessonProgress.objects.get_or_create(
+        student=request.user,
+        lesson=lesson,
+        defaults={'watched_duration': watched_duration}
+    )
+
+    progress.watched_duration = max(progress.watched_duration, watched_duration)
+
+    if reached_completion and not progress.is_completed:
+        progress.is_completed = True
+        progress.completed_at = timezone.now()
+
+    progress.save()
+
+    return JsonResponse({
+        'success': True,
+        'watched_duration': progress.watched_duration,
+        'is_completed': progress.is_completed
+    })
 
 
 @login_required
@@ -270,16 +294,12 @@ def lesson_reorder_view(request, course_id):
     course = get_object_or_404(Course, id=course_id, instructor=request.user)
 
     try:
-        lesson_orders = request.POST.getlist('lesson_order')
-
-        for i, lesson_id in enumerate(lesson_orders, 1):
-            Lesson.objects.filter(id=lesson_id, course=course).update(order=i)
-
-        return JsonResponse({'success': True, 'message': 'Tartib o\'zgartirildi!'})
-
-    except Exception as e:
+        reorder_lessons(course.id, request.POST.getlist('lesson_order'))
+    except ValueError as e:
         return JsonResponse({'success': False, 'message': str(e)})
 
+    return JsonResponse({'success': True, 'message': 'Tartib o\'zgartirildi!'})
+
 
 def lesson_notes_view(request, lesson_id):
     """Dars izohlar (keyinroq implement)"""
@@ -293,31 +313,3 @@ def lesson_notes_view(request, lesson_id):
 
     return render(request, 'lessons/lesson_notes.html', context)
 
-
-# Helper function
-def update_course_progress(user, course):
-    """Course progress yangilash"""
-    try:
-        enrollment = Enrollment.objects.get(student=user, course=course)
-
-        total_lessons = course.lessons.count()
-        if total_lessons == 0:
-            return
-
-        completed_lessons = LessonProgress.objects.filter(
-            student=user,
-            lesson__course=course,
-            is_completed=True
-        ).count()
-
-        progress = round((completed_lessons / total_lessons) * 100)
-        enrollment.progress = progress
-
-        # 100% bo'lsa kursni tugallangan deb belgilash
-        if progress >= 100:
-            enrollment.is_completed = True
-
-        enrollment.save()
-
-    except Enrollment.DoesNotExist:
-        pass
\ No newline at end of file
@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import Quiz, Question, Choice, QuizAttempt
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ERROR_FLAG, ORDER_VAR, PAGE_VAR
+from django.db.models import Count, Q, Sum
+from .models import Quiz, Question, Choice, QuizAttempt, AttemptAnswer, QuizStats
+from apps.core.exports import ExportAdminMixin
 
 
 class ChoiceInline(admin.TabularInline):
@@ -52,14 +56,45 @@ class QuizAdmin(admin.ModelAdmin):
         return qs
 
 
+class AttemptAnswerInline(admin.TabularInline):
+    model = AttemptAnswer
+    extra = 0
+    can_delete = False
+    fields = ('question', 'selected_choice', 'is_correct')
+    readonly_fields = ('question', 'selected_choice', 'is_correct')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('question', 'selected_choice')
+
+
 @admin.register(QuizAttempt)
-class QuizAttemptAdmin(admin.ModelAdmin):
+class QuizAttemptAdmin(ExportAdminMixin, admin.ModelAdmin):
     list_display = ('student', 'quiz', 'score', 'is_passed', 'started_at', 'completed_at')
     list_filter = ('is_passed', 'started_at', 'quiz__lesson__course')
     search_fields = ('student__username', 'quiz__title')
     ordering = ('-started_at',)
 
+    # Baholar jurnali eksporti (filtrlangan ro'yxat bo'yicha)
+    export_filename = 'test_natijalari'
+    export_fields = (
+        ('Login', 'student__username'),
+        ('Ism', 'student__first_name'),
+        ('Familiya', 'student__last_name'),
+        ('Email', 'student__email'),
+        ('Kurs', 'quiz__lesson__course__title'),
+        ('Dars', 'quiz__lesson__title'),
+        ('Test', 'quiz__title'),
+        ('Ball (%)', 'score'),
+        ('O\'tdi', 'is_passed'),
+        ('Boshlangan', 'started_at'),
+        ('Tugallangan', 'completed_at'),
+    )
+
     readonly_fields = ('started_at', 'completed_at')
+    inlines = [AttemptAnswerInline]
 
     fieldsets = (
         ('Test ma\'lumotlari', {
@@ -79,4 +114,51 @@ class QuizAttemptAdmin(admin.ModelAdmin):
             return qs.filter(quiz__lesson__course__instructor=request.user)
         elif request.user.role == 'student':
             return qs.filter(student=request.user)
-        return qs
\ No newline at end of file
+        return qs
+
+    # Faqat shu filtrlar bo'lsa statistika QuizStats dan olinadi
+    ROLLUP_FILTERS = {
+        'quiz__id__exact': 'quiz_id',
+        'quiz__lesson__course__id__exact': 'quiz__lesson__course_id',
+    }
+
+    def _stats_summary(self, request):
+        """Changelistdagi tugallangan urinishlar bo'yicha yig'ma son (noto'g'ri filtrda None)"""
+        params = {key: value for key, value in request.GET.items() if key not in (ORDER_VAR, PAGE_VAR, ERROR_FLAG)}
+
+        if set(params) <= set(self.ROLLUP_FILTERS) and all(value.isdigit() for value in params.values()):
+            stats = QuizStats.objects.all()
+            if request.user.role == 'teacher':
+                stats = stats.filter(quiz__lesson__course__instructor=request.user)
+            for key, value in params.items():
+                stats = stats.filter(**{self.ROLLUP_FILTERS[key]: int(value)})
+            return stats.aggregate(
+                attempt_count=Sum('attempt_count'),
+                pass_count=Sum('pass_count'),
+                score_sum=Sum('score_sum'),
+            )
+
+        # Boshqa filtrlar yoki qidiruv - changelist querysetidan bitta aggregate
+        try:
+            queryset = self.get_changelist_instance(request).get_queryset(request)
+        except IncorrectLookupParameters:
+            return None
+        return queryset.filter(completed_at__isnull=False).aggregate(
+            attempt_count=Count('id'),
+            pass_count=Count('id', filter=Q(is_passed=True)),
+            score_sum=Sum('score'),
+        )
+
+    def changelist_view(self, request, extra_context=None):
+        """Ro'yxat tepasida yig'ma statistika (iloji bo'lsa QuizStats dan, urinishlarni sanamasdan)"""
+        extra_context = extra_context or {}
+        summary = self._stats_summary(request) if request.user.role != 'student' else None
+        if summary is not None:
+            attempt_count = summary['attempt_count'] or 0
+            extra_context['quiz_stats_summary'] = {
+                'attempt_count': attempt_count,
+                'pass_count': summary['pass_count'] or 0,
+                'pass_rate': round((summary['pass_count'] or 0) / attempt_count * 100, 1) if attempt_count else 0,
+                'avg_score': round((summary['score_sum'] or 0) / attempt_count, 1) if attempt_count else 0,
+            }
+        return super().changelist_view(request, extra_context=extra_context)
\ No newline at end of file
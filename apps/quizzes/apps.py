@@ -5,3 +5,6 @@ class QuizzesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.quizzes'
     verbose_name = 'Testlar'
+
+    def ready(self):
+        import apps.quizzes.signals
\ No newline at end of file
@@ -0,0 +1,86 @@
+from django.core.cache import cache
+
+from .models import Question, Choice
+
+ANSWER_KEY_TIMEOUT = 3600
+
+
+def _answer_key_cache_key(quiz_id):
+    return f'quiz_answer_key_{quiz_id}'
+
+
+def build_answer_key(quiz_id):
+    """
+    Test javoblar kaliti:
+    - questions: savollar id lari (tartib bo'yicha)
+    - choices: savol id -> variantlar id lari
+    - correct: savol id -> to'g'ri variantlar id lari
+    """
+    question_ids = list(
+        Question.objects.filter(quiz_id=quiz_id).order_by('order', 'id').values_list('id', flat=True)
+    )
+
+    choices = {question_id: set() for question_id in question_ids}
+    correct = {question_id: set() for question_id in question_ids}
+    for question_id, choice_id, is_correct in Choice.objects.filter(
+        question__quiz_id=quiz_id
+    ).values_list('question_id', 'id', 'is_correct'):
+        choices[question_id].add(choice_id)
+        if is_correct:
+            correct[question_id].add(choice_id)
+
+    return {
+        'questions': question_ids,
+        'choices': choices,
+        'correct': correct,
+    }
+
+
+def get_answer_key(quiz_id):
+    """Javoblar kalitini cache dan olish (bo'lmasa yaratish)"""
+    cache_key = _answer_key_cache_key(quiz_id)
+    answer_key = cache.get(cache_key)
+
+    if answer_key is None:
+        answer_key = build_answer_key(quiz_id)
+        cache.set(cache_key, answer_key, ANSWER_KEY_TIMEOUT)
+
+    return answer_key
+
+
+def invalidate_answer_key(quiz_id):
+    cache.delete(_answer_key_cache_key(quiz_id))
+
+
+def grade_submission(answer_key, data):
+    """
+    Javoblarni bir o'tishda tekshirish (bazaga murojaatsiz).
+
+    data - request.POST (question_<id> -> choice id).
+    Qaytaradi: (to'g'ri javoblar soni, savollar soni, javoblar ro'yxati)
+    """
+    responses = []
+    correct_answers = 0
+
+    for question_id in answer_key['questions']:
+        selected_choice_id = data.get(f'question_{question_id}')
+        try:
+            selected_choice_id = int(selected_choice_id)
+        except (TypeError, ValueError):
+            selected_choice_id = None
+
+        # Boshqa savolning varianti yuborilgan bo'lsa hisobga olinmaydi
+        if selected_choice_id not in answer_key['choices'][question_id]:
+            selected_choice_id = None
+
+        is_correct = selected_choice_id in answer_key['correct'][question_id]
+        if is_correct:
+            correct_answers += 1
+
+        responses.append({
+            'question_id': question_id,
+            'selected_choice_id': selected_choice_id,
+            'is_correct': is_correct,
+        })
+
+    return correct_answers, len(answer_key['questions']), responses
@@ -0,0 +1,156 @@
+import numpy as np
+from django.db.models import Exists, OuterRef
+
+from .models import AttemptAnswer, Choice, Question, QuizAttempt
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def _accumulate_chunk(totals, correct, selected, choice_ids):
+    """
+    Bitta bo'lak (attempts x questions matritsasi) uchun yig'indilarni qo'shish.
+
+    correct - 0/1 matritsa, selected - tanlangan variant id lari (0 - javobsiz).
+    """
+    scores = correct.sum(axis=1)
+
+    totals['attempts'] += correct.shape[0]
+    totals['sum_x'] += correct.sum(axis=0)
+    totals['sum_t'] += scores.sum()
+    totals['sum_tt'] += (scores ** 2).sum()
+    totals['sum_tx'] += scores @ correct
+    totals['answered'] += (selected != 0).sum(axis=0)
+
+    picked = selected[np.isin(selected, choice_ids)]
+    if picked.size:
+        positions = np.searchsorted(choice_ids, picked)
+        totals['choice_counts'] += np.bincount(positions, minlength=choice_ids.size)
+
+
+def _point_biserial(totals):
+    """
+    Tuzatilgan point-biserial: har bir savol va qolgan savollar bo'yicha ball
+    (savolning o'zi hisobga olinmaydi) orasidagi korrelyatsiya.
+    """
+    n = totals['attempts']
+    sum_x = totals['sum_x']
+
+    # R = T - x (x^2 = x bo'lgani uchun)
+    sum_r = totals['sum_t'] - sum_x
+    sum_rr = totals['sum_tt'] - 2 * totals['sum_tx'] + sum_x
+    sum_rx = totals['sum_tx'] - sum_x
+
+    p = sum_x / n
+    mean_r = sum_r / n
+    cov = sum_rx / n - mean_r * p
+    var = (p * (1 - p)) * (sum_rr / n - mean_r ** 2)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        r = cov / np.sqrt(var)
+    return np.where(var > 0, r, np.nan)
+
+
+def analyze_quiz(quiz, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Test savollari bo'yicha klassik item tahlili:
+    - difficulty: to'g'ri javob berganlar ulushi (p-value)
+    - discrimination: tuzatilgan point-biserial korrelyatsiya
+    - variantlar bo'yicha tanlash ulushi (distraktorlar tahlili)
+
+    Urinishlar bazadan id bo'yicha bo'laklab o'qiladi, shuning uchun xotira
+    urinishlar soniga emas, bo'lak hajmiga bog'liq.
+    """
+    questions = list(Question.objects.filter(quiz=quiz).order_by('order', 'id'))
+    choices = list(Choice.objects.filter(question__quiz=quiz).order_by('id'))
+
+    question_ids = np.array(sorted(question.id for question in questions), dtype=np.int64)
+    choice_ids = np.array([choice.id for choice in choices], dtype=np.int64)
+    n_questions = question_ids.size
+
+    totals = {
+        'attempts': 0,
+        'sum_x': np.zeros(n_questions, dtype=np.int64),
+        'sum_t': 0,
+        'sum_tt': 0,
+        'sum_tx': np.zeros(n_questions, dtype=np.int64),
+        'answered': np.zeros(n_questions, dtype=np.int64),
+        'choice_counts': np.zeros(choice_ids.size, dtype=np.int64),
+    }
+
+    # Javoblari saqlanmagan (eski) urinishlar tahlilga kirmaydi
+    attempts = QuizAttempt.objects.filter(
+        Exists(AttemptAnswer.objects.filter(attempt=OuterRef('pk'))),
+        quiz=quiz,
+        completed_at__isnull=False
+    )
+    last_id = 0
+    while n_questions:
+        attempt_ids = np.array(
+            attempts.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:chunk_size],
+            dtype=np.int64
+        )
+        if not attempt_ids.size:
+            break
+        last_id = int(attempt_ids[-1])
+
+        rows = np.array([
+            (attempt_id, question_id, choice_id or 0, is_correct)
+            for attempt_id, question_id, choice_id, is_correct in AttemptAnswer.objects.filter(
+                attempt_id__gte=attempt_ids[0],
+                attempt_id__lte=last_id,
+                attempt__quiz=quiz
+            ).values_list('attempt_id', 'question_id', 'selected_choice_id', 'is_correct')
+        ], dtype=np.int64).reshape(-1, 4)
+
+        rows = rows[np.isin(rows[:, 0], attempt_ids) & np.isin(rows[:, 1], question_ids)]
+        row_idx = np.searchsorted(attempt_ids, rows[:, 0])
+        col_idx = np.searchsorted(question_ids, rows[:, 1])
+
+        correct = np.zeros((attempt_ids.size, n_questions), dtype=np.int64)
+        selected = np.zeros((attempt_ids.size, n_questions), dtype=np.int64)
+        correct[row_idx, col_idx] = rows[:, 3]
+        selected[row_idx, col_idx] = rows[:, 2]
+
+        _accumulate_chunk(totals, correct, selected, choice_ids)
+
+    attempt_count = totals['attempts']
+    if attempt_count:
+        difficulty = totals['sum_x'] / attempt_count
+        discrimination = _point_biserial(totals)
+        omit_rate = 1 - totals['answered'] / attempt_count
+        choice_rates = totals['choice_counts'] / attempt_count
+    else:
+        difficulty = discrimination = omit_rate = np.full(n_questions, np.nan)
+        choice_rates = np.full(choice_ids.size, np.nan)
+
+    column = {question_id: i for i, question_id in enumerate(question_ids.tolist())}
+    choice_rate_by_id = dict(zip(choice_ids.tolist(), choice_rates.tolist()))
+    choices_by_question = {}
+    for choice in choices:
+        choices_by_question.setdefault(choice.question_id, []).append({
+            'choice': choice,
+            'is_correct': choice.is_correct,
+            'selection_rate': _clean(choice_rate_by_id[choice.id]),
+        })
+
+    items = []
+    for question in questions:
+        i = column[question.id]
+        items.append({
+            'question': question,
+            'difficulty': _clean(difficulty[i]),
+            'discrimination': _clean(discrimination[i]),
+            'omit_rate': _clean(omit_rate[i]),
+            'choices': choices_by_question.get(question.id, []),
+        })
+
+    return {
+        'attempt_count': attempt_count,
+        'items': items,
+    }
+
+
+def _clean(value):
+    """NaN -> None, qolganlari 3 xonagacha yaxlitlanadi"""
+    value = float(value)
+    return None if np.isnan(value) else round(value, 3)
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.quizzes.item_analysis import DEFAULT_CHUNK_SIZE, analyze_quiz
+from apps.quizzes.models import Quiz
+
+
+class Command(BaseCommand):
+    help = 'Test savollari bo\'yicha item tahlili (qiyinlik va ajratish kuchi)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('quiz_id', type=int, help='Test ID si')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help='Bir martada o\'qiladigan urinishlar soni'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            quiz = Quiz.objects.get(pk=options['quiz_id'])
+        except Quiz.DoesNotExist:
+            raise CommandError(f'Test topilmadi: {options["quiz_id"]}')
+
+        analysis = analyze_quiz(quiz, chunk_size=max(options['chunk_size'], 1))
+
+        self.stdout.write(f'{quiz.title}: {analysis["attempt_count"]} ta urinish')
+        for number, item in enumerate(analysis['items'], 1):
+            self.stdout.write(
+                f'{number}. {item["question"].text[:60]} | '
+                f'qiyinlik: {_format(item["difficulty"])} | '
+                f'ajratish: {_format(item["discrimination"])} | '
+                f'javobsiz: {_format(item["omit_rate"])}'
+            )
+            for choice in item['choices']:
+                marker = '*' if choice['is_correct'] else ' '
+                self.stdout.write(
+                    f'    {marker} {choice["choice"].text[:50]}: {_format(choice["selection_rate"])}'
+                )
+
+        self.stdout.write(self.style.SUCCESS('Tahlil yakunlandi'))
+
+
+def _format(value):
+    return '-' if value is None else f'{value:.3f}'
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from apps.quizzes.statistics import rebuild_quiz_stats
+
+
+class Command(BaseCommand):
+    help = 'QuizStats yig\'ma statistikasini urinishlardan qayta hisoblash'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'quiz_ids',
+            nargs='*',
+            type=int,
+            help='Faqat shu testlar uchun (bo\'sh bo\'lsa barcha testlar)'
+        )
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_quiz_stats(options['quiz_ids'])
+
+        self.stdout.write(self.style.SUCCESS(f'{rebuilt} ta test statistikasi qayta hisoblandi'))
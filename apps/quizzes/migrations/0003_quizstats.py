@@ -0,0 +1,70 @@
+# Generated by Django 5.2.4 on 2026-10-18 01:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+BUCKET_FIELDS = [
+    'scores_0_9', 'scores_10_19', 'scores_20_29', 'scores_30_39', 'scores_40_49',
+    'scores_50_59', 'scores_60_69', 'scores_70_79', 'scores_80_89', 'scores_90_100',
+]
+
+
+def backfill_quiz_stats(apps, schema_editor):
+    QuizAttempt = apps.get_model('quizzes', 'QuizAttempt')
+    QuizStats = apps.get_model('quizzes', 'QuizStats')
+
+    aggregates = {
+        'attempt_count': Count('id'),
+        'unique_students': Count('student', distinct=True),
+        'pass_count': Count('id', filter=Q(is_passed=True)),
+        'score_sum': Sum('score'),
+    }
+    for i, field in enumerate(BUCKET_FIELDS):
+        bucket_filter = Q(score__gte=i * 10) if i == 9 else Q(score__gte=i * 10, score__lt=(i + 1) * 10)
+        aggregates[field] = Count('id', filter=bucket_filter)
+
+    rows = QuizAttempt.objects.filter(
+        completed_at__isnull=False
+    ).values('quiz').annotate(**aggregates).order_by()
+
+    QuizStats.objects.bulk_create(
+        [QuizStats(quiz_id=row.pop('quiz'), **row) for row in rows],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0002_attemptanswer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuizStats',
+            fields=[
+                ('quiz', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='quizzes.quiz')),
+                ('attempt_count', models.PositiveIntegerField(default=0)),
+                ('unique_students', models.PositiveIntegerField(default=0)),
+                ('pass_count', models.PositiveIntegerField(default=0)),
+                ('score_sum', models.PositiveBigIntegerField(default=0)),
+                ('scores_0_9', models.PositiveIntegerField(default=0)),
+                ('scores_10_19', models.PositiveIntegerField(default=0)),
+                ('scores_20_29', models.PositiveIntegerField(default=0)),
+                ('scores_30_39', models.PositiveIntegerField(default=0)),
+                ('scores_40_49', models.PositiveIntegerField(default=0)),
+                ('scores_50_59', models.PositiveIntegerField(default=0)),
+                ('scores_60_69', models.PositiveIntegerField(default=0)),
+                ('scores_70_79', models.PositiveIntegerField(default=0)),
+                ('scores_80_89', models.PositiveIntegerField(default=0)),
+                ('scores_90_100', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Test statistikasi',
+                'verbose_name_plural': 'Testlar statistikasi',
+            },
+        ),
+        migrations.RunPython(backfill_quiz_stats, migrations.RunPython.noop),
+    ]
@@ -45,5 +45,85 @@ class QuizAttempt(models.Model):
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Talabaning test bo'yicha urinishlari (oxirgisi birinchi)
+            models.Index(fields=['student', 'quiz', '-started_at'], name='quiz_attempt_student_quiz_idx'),
+            # Mening natijalarim (faqat tugallanganlar, cursor pagination)
+            models.Index(
+                fields=['student', '-completed_at', '-id'], name='quiz_attempt_student_done_idx',
+                condition=models.Q(completed_at__isnull=False),
+            ),
+            # Test statistikasi (tugallangan urinishlar)
+            models.Index(
+                fields=['quiz', 'student'], name='quiz_attempt_quiz_done_idx',
+                condition=models.Q(completed_at__isnull=False),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student.username} - {self.quiz.title} ({self.score}%)"
+
+
+class AttemptAnswer(models.Model):
+    attempt = models.ForeignKey(QuizAttempt, on_delete=models.CASCADE, related_name='answers')
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    selected_choice = models.ForeignKey(Choice, on_delete=models.SET_NULL, null=True, blank=True)
+    is_correct = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ['attempt', 'question']
+
+    def __str__(self):
+        return f"{self.attempt} - {self.question}"
+
+
+class QuizStats(models.Model):
+    """Test bo'yicha yig'ma statistika (urinishlar tugallanganda yangilanadi)"""
+    # Ballar taqsimoti: 0-9, 10-19, ..., 90-100
+    BUCKET_FIELDS = [
+        'scores_0_9', 'scores_10_19', 'scores_20_29', 'scores_30_39', 'scores_40_49',
+        'scores_50_59', 'scores_60_69', 'scores_70_79', 'scores_80_89', 'scores_90_100',
+    ]
+
+    quiz = models.OneToOneField(Quiz, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    attempt_count = models.PositiveIntegerField(default=0)
+    unique_students = models.PositiveIntegerField(default=0)
+    pass_count = models.PositiveIntegerField(default=0)
+    score_sum = models.PositiveBigIntegerField(default=0)
+
+    scores_0_9 = models.PositiveIntegerField(default=0)
+    scores_10_19 = models.PositiveIntegerField(default=0)
+    scores_20_29 = models.PositiveIntegerField(default=0)
+    scores_30_39 = models.PositiveIntegerField(default=0)
+    scores_40_49 = models.PositiveIntegerField(default=0)
+    scores_50_59 = models.PositiveIntegerField(default=0)
+    scores_60_69 = models.PositiveIntegerField(default=0)
+    scores_70_79 = models.PositiveIntegerField(default=0)
+    scores_80_89 = models.PositiveIntegerField(default=0)
+    scores_90_100 = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Test statistikasi'
+        verbose_name_plural = 'Testlar statistikasi'
+
     def __str__(self):
-        return f"{self.student.username} - {self.quiz.title} ({self.score}%)"
\ No newline at end of file
+        return f"{self.quiz.title} statistikasi"
+
+    @classmethod
+    def bucket_field(cls, score):
+        return cls.BUCKET_FIELDS[min(score // 10, 9)]
+
+    @property
+    def avg_score(self):
+        return self.score_sum / self.attempt_count if self.attempt_count else 0
+
+    @property
+    def pass_rate(self):
+        return self.pass_count / self.attempt_count * 100 if self.attempt_count else 0
+
+    @property
+    def histogram(self):
+        return [getattr(self, field) for field in self.BUCKET_FIELDS]
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
+from .models import Question, Choice, QuizAttempt
+from .grading import invalidate_answer_key
+from .statistics import (
+    invalidate_quiz_statistics, record_completed_attempt,
+    update_completed_attempt, remove_completed_attempt
+)
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_answer_key_on_question_change(sender, instance, **kwargs):
+    """Savol o'zgarganda javoblar kalitini yangilash"""
+    invalidate_answer_key(instance.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=Choice)
+def invalidate_answer_key_on_choice_change(sender, instance, **kwargs):
+    """Javob varianti o'zgarganda javoblar kalitini yangilash"""
+    invalidate_answer_key(instance.question.quiz_id)
+
+
+@receiver([post_save, post_delete], sender=QuizAttempt)
+def invalidate_statistics_on_attempt_change(sender, instance, **kwargs):
+    """Yangi urinish saqlanganda test statistikasini yangilash"""
+    invalidate_quiz_statistics(instance.quiz_id)
+
+
+@receiver(post_init, sender=QuizAttempt)
+def remember_attempt_state(sender, instance, **kwargs):
+    """Saqlashdan oldingi holatni eslab qolish"""
+    instance._stats_snapshot = (instance.completed_at is not None, instance.score, instance.is_passed)
+
+
+@receiver(post_save, sender=QuizAttempt)
+def update_quiz_stats_on_attempt_save(sender, instance, created, **kwargs):
+    """Urinish tugallanganda QuizStats ni yangilash"""
+    was_completed, old_score, old_is_passed = instance._stats_snapshot
+    if created:
+        was_completed = False
+    instance._stats_snapshot = (instance.completed_at is not None, instance.score, instance.is_passed)
+
+    if instance.completed_at is None:
+        return
+
+    if not was_completed:
+        record_completed_attempt(instance)
+    elif (old_score, old_is_passed) != (instance.score, instance.is_passed):
+        update_completed_attempt(instance, old_score, old_is_passed)
+
+
+@receiver(post_delete, sender=QuizAttempt)
+def update_quiz_stats_on_attempt_delete(sender, instance, **kwargs):
+    """Tugallangan urinish o'chirilganda QuizStats ni yangilash"""
+    if instance._stats_snapshot[0]:
+        remove_completed_attempt(instance)
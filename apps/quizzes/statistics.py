@@ -0,0 +1,235 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Avg, Count, F, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import QuizAttempt, QuizStats
+
+STATISTICS_TIMEOUT = 3600
+
+
+def score_bins(bin_width=None):
+    """
+    Ballar taqsimoti oraliqlari: [(label, low, high), ...] (yuqoridan pastga).
+
+    bin_width berilmasa settings.QUIZ_SCORE_BINS (quyi chegaralar) ishlatiladi.
+    """
+    if bin_width:
+        lower_bounds = list(range(0, 100, bin_width))
+    else:
+        lower_bounds = sorted(settings.QUIZ_SCORE_BINS)
+
+    bins = []
+    for i, low in enumerate(lower_bounds):
+        high = lower_bounds[i + 1] - 1 if i + 1 < len(lower_bounds) else 100
+        bins.append((f'{low}-{high}', low, high))
+
+    return list(reversed(bins))
+
+
+def _version_key(quiz_id):
+    return f'quiz_stats_version_{quiz_id}'
+
+
+def invalidate_quiz_statistics(quiz_id):
+    """Versiyani oshirish - barcha oraliq variantlari uchun cache eskiradi"""
+    try:
+        cache.incr(_version_key(quiz_id))
+    except ValueError:
+        cache.set(_version_key(quiz_id), 1, None)
+
+
+def compute_quiz_statistics(quiz, bin_width=None):
+    """Test statistikasi bitta aggregate() so'rovida (QuizStats kabi faqat tugallangan urinishlar)"""
+    bins = score_bins(bin_width)
+
+    aggregates = {
+        'total_attempts': Count('id'),
+        'unique_students': Count('student', distinct=True),
+        'passed_attempts': Count('id', filter=Q(is_passed=True)),
+        'avg_score': Avg('score'),
+    }
+    for i, (label, low, high) in enumerate(bins):
+        aggregates[f'bin_{i}'] = Count('id', filter=Q(score__gte=low, score__lte=high))
+
+    result = QuizAttempt.objects.filter(
+        quiz=quiz,
+        completed_at__isnull=False
+    ).aggregate(**aggregates)
+
+    total_attempts = result['total_attempts']
+    passed_attempts = result['passed_attempts']
+
+    return {
+        'total_attempts': total_attempts,
+        'unique_students': result['unique_students'],
+        'passed_attempts': passed_attempts,
+        'pass_rate': round((passed_attempts / total_attempts * 100), 1) if total_attempts > 0 else 0,
+        'avg_score': round(result['avg_score'] or 0, 1),
+        'score_ranges': {
+            label: result[f'bin_{i}'] for i, (label, low, high) in enumerate(bins)
+        },
+    }
+
+
+def rollup_statistics(rollup, bins):
+    """QuizStats qatoridan statistika (oraliqlar 10 ga karrali bo'lishi kerak)"""
+    histogram = rollup.histogram
+
+    return {
+        'total_attempts': rollup.attempt_count,
+        'unique_students': rollup.unique_students,
+        'passed_attempts': rollup.pass_count,
+        'pass_rate': round(rollup.pass_rate, 1),
+        'avg_score': round(rollup.avg_score, 1),
+        'score_ranges': {
+            label: sum(histogram[low // 10:high // 10 + 1]) if high < 100 else sum(histogram[low // 10:])
+            for label, low, high in bins
+        },
+    }
+
+
+def get_quiz_statistics(quiz, bin_width=None):
+    """Test statistikasi (cache dan, yangi urinish saqlanganda yangilanadi)"""
+    bins = score_bins(bin_width)
+
+    # Oraliqlar o'nliklarga mos bo'lsa yig'ma jadvaldan bitta qator o'qiladi
+    if all(low % 10 == 0 for label, low, high in bins):
+        rollup = QuizStats.objects.filter(quiz=quiz).first()
+        if rollup is not None:
+            return rollup_statistics(rollup, bins)
+
+    version = cache.get_or_set(_version_key(quiz.id), 1, None)
+    cache_key = f'quiz_stats_{quiz.id}_v{version}_{bin_width or "default"}'
+
+    stats = cache.get(cache_key)
+    if stats is None:
+        stats = compute_quiz_statistics(quiz, bin_width)
+        cache.set(cache_key, stats, STATISTICS_TIMEOUT)
+
+    return stats
+
+
+# QuizStats yig'ma jadvalini yangilash
+def _apply_stats_delta(quiz_id, deltas, create=False, **values):
+    """
+    Hisoblagichlarni F() orqali atomar o'zgartirish (values - qo'shimcha
+    ifodalar, masalan qayta sanash subquery si).
+
+    Qator faqat create=True bo'lsa (yangi urinish qo'shilganda) yaratiladi.
+    Ayirishda qator bo'lmasa hech narsa qilinmaydi: test o'chirilganda
+    QuizStats urinishlardan oldin o'chadi va noldan ayirib bo'lmaydi.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    updates.update(values)
+    if not updates:
+        return
+
+    updates['updated_at'] = timezone.now()
+    if QuizStats.objects.filter(quiz_id=quiz_id).update(**updates) or not create:
+        return
+
+    QuizStats.objects.get_or_create(quiz_id=quiz_id)
+    QuizStats.objects.filter(quiz_id=quiz_id).update(**updates)
+
+
+def _has_other_completed_attempts(attempt):
+    return QuizAttempt.objects.filter(
+        quiz_id=attempt.quiz_id,
+        student_id=attempt.student_id,
+        completed_at__isnull=False
+    ).exclude(pk=attempt.pk).exists()
+
+
+def record_completed_attempt(attempt):
+    """Tugallangan urinishni statistikaga qo'shish"""
+    _apply_stats_delta(attempt.quiz_id, {
+        'attempt_count': 1,
+        'unique_students': 0 if _has_other_completed_attempts(attempt) else 1,
+        'pass_count': int(attempt.is_passed),
+        'score_sum': attempt.score,
+        QuizStats.bucket_field(attempt.score): 1,
+    }, create=True)
+
+
+def update_completed_attempt(attempt, old_score, old_is_passed):
+    """Tugallangan urinish bahosi o'zgarganda (masalan admin orqali)"""
+    deltas = {
+        'pass_count': int(attempt.is_passed) - int(old_is_passed),
+        'score_sum': attempt.score - old_score,
+    }
+    old_bucket = QuizStats.bucket_field(old_score)
+    new_bucket = QuizStats.bucket_field(attempt.score)
+    if old_bucket != new_bucket:
+        deltas[old_bucket] = -1
+        deltas[new_bucket] = 1
+
+    _apply_stats_delta(attempt.quiz_id, deltas)
+
+
+def _unique_students_count(quiz_id):
+    """Testni tugallagan talabalar soni (COUNT DISTINCT subquery)"""
+    students = QuizAttempt.objects.filter(
+        quiz_id=quiz_id,
+        completed_at__isnull=False
+    ).order_by().values('quiz').annotate(total=Count('student', distinct=True)).values('total')
+    return Coalesce(Subquery(students), 0)
+
+
+def remove_completed_attempt(attempt):
+    """
+    O'chirilgan urinishni statistikadan ayirish. Kaskad yoki queryset
+    o'chirishda post_delete barcha qatorlar o'chgandan keyin keladi, shuning
+    uchun talabalar soni delta bilan emas, qayta sanab yoziladi.
+    """
+    _apply_stats_delta(attempt.quiz_id, {
+        'attempt_count': -1,
+        'pass_count': -int(attempt.is_passed),
+        'score_sum': -attempt.score,
+        QuizStats.bucket_field(attempt.score): -1,
+    }, unique_students=_unique_students_count(attempt.quiz_id))
+
+
+def rebuild_quiz_stats(quiz_ids=None):
+    """QuizStats ni noldan qayta hisoblash (bitta guruhlangan so'rov + bulk upsert)"""
+    from .models import Quiz
+
+    quizzes = Quiz.objects.all()
+    if quiz_ids:
+        quizzes = quizzes.filter(pk__in=quiz_ids)
+
+    aggregates = {
+        'attempt_count': Count('id'),
+        'unique_students': Count('student', distinct=True),
+        'pass_count': Count('id', filter=Q(is_passed=True)),
+        'score_sum': Sum('score'),
+    }
+    for i, field in enumerate(QuizStats.BUCKET_FIELDS):
+        bucket_filter = Q(score__gte=i * 10) if i == 9 else Q(score__gte=i * 10, score__lt=(i + 1) * 10)
+        aggregates[field] = Count('id', filter=bucket_filter)
+
+    rows = QuizAttempt.objects.filter(
+        quiz__in=quizzes,
+        completed_at__isnull=False
+    ).values('quiz').annotate(**aggregates).order_by()
+    totals = {row.pop('quiz'): row for row in rows}
+
+    now = timezone.now()
+    stats = []
+    for quiz_id in quizzes.values_list('pk', flat=True):
+        row = totals.get(quiz_id, {})
+        stats.append(QuizStats(
+            quiz_id=quiz_id,
+            updated_at=now,
+            **{field: row.get(field) or 0 for field in aggregates}
+        ))
+
+    QuizStats.objects.bulk_create(
+        stats,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['quiz'],
+        update_fields=list(aggregates) + ['updated_at'],
+    )
+    return len(stats)
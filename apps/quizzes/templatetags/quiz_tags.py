@@ -1,5 +1,5 @@
 from django import template
-from apps.quizzes.models import QuizAttempt
+from apps.core.viewer_state import get_viewer_state
 
 register = template.Library()
 
@@ -10,14 +10,8 @@ def user_quiz_attempt(user, quiz):
     if not user.is_authenticated:
         return None
 
-    try:
-        return QuizAttempt.objects.filter(
-            student=user,
-            quiz=quiz,
-            completed_at__isnull=False
-        ).order_by('-started_at').first()
-    except QuizAttempt.DoesNotExist:
-        return None
+    summary = get_viewer_state(user).quiz_summary(quiz)
+    return summary['latest_attempt'] if summary else None
 
 
 @register.filter
@@ -26,14 +20,9 @@ def user_best_score(user, quiz):
     if not user.is_authenticated:
         return 0
 
-    attempts = QuizAttempt.objects.filter(
-        student=user,
-        quiz=quiz,
-        completed_at__isnull=False
-    )
-
-    if attempts.exists():
-        return max(attempt.score for attempt in attempts)
+    summary = get_viewer_state(user).quiz_summary(quiz)
+    if summary and summary['best_attempt']:
+        return summary['best_attempt'].score
     return 0
 
 
@@ -43,11 +32,8 @@ def quiz_attempts_count(user, quiz):
     if not user.is_authenticated:
         return 0
 
-    return QuizAttempt.objects.filter(
-        student=user,
-        quiz=quiz,
-        completed_at__isnull=False
-    ).count()
+    summary = get_viewer_state(user).quiz_summary(quiz)
+    return summary['attempts_count'] if summary else 0
 
 
 @register.filter
@@ -56,11 +42,8 @@ def is_quiz_passed(user, quiz):
     if not user.is_authenticated:
         return False
 
-    return QuizAttempt.objects.filter(
-        student=user,
-        quiz=quiz,
-        is_passed=True
-    ).exists()
+    summary = get_viewer_state(user).quiz_summary(quiz)
+    return summary['is_passed'] if summary else False
 
 
 @register.simple_tag
@@ -69,16 +52,12 @@ def quiz_status_badge(user, quiz):
     if not user.is_authenticated:
         return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-gray-100 text-gray-800">Login qiling</span>'
 
-    attempts = QuizAttempt.objects.filter(
-        student=user,
-        quiz=quiz,
-        completed_at__isnull=False
-    )
+    summary = get_viewer_state(user).quiz_summary(quiz)
 
-    if not attempts.exists():
+    if not summary or not summary['best_attempt']:
         return '<span class="px-2 py-1 text-xs font-medium rounded-full bg-blue-100 text-blue-800">🎯 Yangi</span>'
 
-    best_attempt = attempts.order_by('-score').first()
+    best_attempt = summary['best_attempt']
 
     if best_attempt.is_passed:
         return f'<span class="px-2 py-1 text-xs font-medium rounded-full bg-green-100 text-green-800">✓ O\'tgan ({best_attempt.score}%)</span>'
@@ -1,3 +1,289 @@
+import unittest
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.courses.models import Course, Enrollment
+from apps.lessons.models import Lesson
+from .models import AttemptAnswer, Choice, Question, Quiz, QuizAttempt, QuizStats
+from .grading import get_answer_key, grade_submission
+from .item_analysis import analyze_quiz
+from .statistics import compute_quiz_statistics, get_quiz_statistics
+
+
+class QuizStatsTests(TestCase):
+
+    def setUp(self):
+        self.teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        self.course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=self.teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.lesson = Lesson.objects.create(course=self.course, title='1-dars')
+        self.quiz = Quiz.objects.create(lesson=self.lesson, title='Test')
+
+    def _attempt(self, score, completed=True):
+        return QuizAttempt.objects.create(
+            student=self.student, quiz=self.quiz, score=score,
+            is_passed=score >= self.quiz.passing_score,
+            completed_at=timezone.now() if completed else None
+        )
+
+    def test_delete_lesson_with_completed_attempt(self):
+        self._attempt(80)
+        self.assertTrue(QuizStats.objects.filter(quiz=self.quiz).exists())
+
+        self.lesson.delete()
+
+        self.assertFalse(Quiz.objects.exists())
+        self.assertFalse(QuizStats.objects.exists())
+
+    def test_delete_attempt_updates_rollup(self):
+        attempt = self._attempt(80)
+        self._attempt(50)
+
+        attempt.delete()
+
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual(stats.attempt_count, 1)
+        self.assertEqual(stats.pass_count, 0)
+
+    def test_cascade_delete_of_student_with_several_attempts(self):
+        self._attempt(80)
+        self._attempt(50)
+        other = User.objects.create_user(username='other', password='pw', role='student')
+        QuizAttempt.objects.create(student=other, quiz=self.quiz, score=90, is_passed=True, completed_at=timezone.now())
+
+        self.student.delete()
+
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.attempt_count, stats.unique_students), (1, 1))
+
+    def test_queryset_delete_keeps_other_students(self):
+        self._attempt(80)
+        self._attempt(50)
+        other = User.objects.create_user(username='other', password='pw', role='student')
+        QuizAttempt.objects.create(student=other, quiz=self.quiz, score=90, is_passed=True, completed_at=timezone.now())
+
+        QuizAttempt.objects.filter(student=self.student).delete()
+
+        stats = QuizStats.objects.get(quiz=self.quiz)
+        self.assertEqual((stats.attempt_count, stats.unique_students, stats.pass_count), (1, 1, 1))
+
+    def test_statistics_count_completed_attempts_only(self):
+        self._attempt(80)
+        self._attempt(0, completed=False)
+
+        rollup_stats = get_quiz_statistics(self.quiz)
+        QuizStats.objects.all().delete()
+        aggregate_stats = get_quiz_statistics(self.quiz)
+
+        self.assertEqual(rollup_stats, aggregate_stats)
+        self.assertEqual(aggregate_stats['total_attempts'], 1)
+
+    def test_statistics_in_one_aggregate_query(self):
+        for score in (95, 75, 40):
+            self._attempt(score)
+
+        with self.assertNumQueries(1):
+            stats = compute_quiz_statistics(self.quiz, bin_width=50)
+
+        self.assertEqual(stats['score_ranges'], {'50-100': 2, '0-49': 1})
+        self.assertEqual((stats['total_attempts'], stats['passed_attempts'], stats['avg_score']), (3, 2, 70.0))
+
+
+class QuizResultViewTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.quiz = Quiz.objects.create(lesson=Lesson.objects.create(course=course, title='1-dars'), title='Test')
+        self.attempt = QuizAttempt.objects.create(student=self.student, quiz=self.quiz, completed_at=timezone.now())
+        for order in range(1, 6):
+            question = Question.objects.create(quiz=self.quiz, text=f'{order}-savol', order=order)
+            choices = [Choice.objects.create(question=question, text=str(i), is_correct=i == 0) for i in range(3)]
+            AttemptAnswer.objects.create(
+                attempt=self.attempt, question=question, selected_choice=choices[0], is_correct=True
+            )
+        self.client.login(username='student', password='pw')
+
+    def test_result_queries(self):
+        url = reverse('quizzes:result', args=[self.attempt.pk])
+        # Sayt chrome va boshqa cache lar to'ladi
+        self.client.get(url)
+
+        # Sessiya va foydalanuvchi + urinish, savollar, variantlar, javoblar
+        with self.assertNumQueries(6):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['correct_count'], 5)
+
+
+class QuizAttemptAdminTests(TestCase):
+
+    def setUp(self):
+        admin_user = User.objects.create_superuser(username='admin', password='pw', email='a@x.uz', role='admin')
+        student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=admin_user,
+            level='beginner', duration_weeks=4
+        )
+        self.quiz = Quiz.objects.create(lesson=Lesson.objects.create(course=course, title='1-dars'), title='Test')
+        for score in (90, 40):
+            QuizAttempt.objects.create(
+                student=student, quiz=self.quiz, score=score, is_passed=score >= 70, completed_at=timezone.now()
+            )
+        self.client.login(username='admin', password='pw')
+        self.url = reverse('admin:quizzes_quizattempt_changelist')
+
+    def test_summary_from_rollup_and_changelist_filters(self):
+        response = self.client.get(self.url, {'quiz__id__exact': self.quiz.pk})
+        self.assertEqual(response.context['quiz_stats_summary']['attempt_count'], 2)
+
+        response = self.client.get(self.url, {'quiz__id__exact': self.quiz.pk, 'is_passed__exact': '1'})
+        self.assertEqual(response.context['quiz_stats_summary']['attempt_count'], 1)
+
+    def test_invalid_filter_value_does_not_fail(self):
+        response = self.client.get(self.url, {'quiz__id__exact': 'abc'})
+
+        self.assertEqual(response.status_code, 302)
+
+
+class QuizGradingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        Enrollment.objects.create(student=self.student, course=course)
+        self.quiz = Quiz.objects.create(lesson=Lesson.objects.create(course=course, title='1-dars'), title='Test')
+        self.questions = []
+        for order in (1, 2):
+            question = Question.objects.create(quiz=self.quiz, text=f'{order}-savol', order=order)
+            question.correct = Choice.objects.create(question=question, text='Ha', is_correct=True)
+            question.wrong = Choice.objects.create(question=question, text="Yo'q")
+            self.questions.append(question)
+
+    def test_answer_key_cached_until_choice_changes(self):
+        get_answer_key(self.quiz.pk)
+        with self.assertNumQueries(0):
+            get_answer_key(self.quiz.pk)
+
+        Choice.objects.create(question=self.questions[0], text='Balki', is_correct=True)
+
+        self.assertEqual(len(get_answer_key(self.quiz.pk)['correct'][self.questions[0].pk]), 2)
+
+    def test_choice_of_another_question_is_ignored(self):
+        first, second = self.questions
+        data = {f'question_{first.pk}': str(first.correct.pk), f'question_{second.pk}': str(first.correct.pk)}
+
+        correct, total, responses = grade_submission(get_answer_key(self.quiz.pk), data)
+
+        self.assertEqual((correct, total), (1, 2))
+        self.assertIsNone(responses[1]['selected_choice_id'])
+
+    def test_submission_saves_attempt_and_answers(self):
+        first, second = self.questions
+        self.client.login(username='student', password='pw')
+
+        self.client.post(reverse('quizzes:attempt', args=[self.quiz.pk]), {
+            f'question_{first.pk}': first.correct.pk,
+            f'question_{second.pk}': second.wrong.pk,
+        })
+
+        attempt = QuizAttempt.objects.get(student=self.student)
+        self.assertEqual((attempt.score, attempt.is_passed), (50, False))
+        self.assertEqual(
+            list(attempt.answers.order_by('question__order').values_list('is_correct', flat=True)), [True, False]
+        )
+
+
+class ItemAnalysisTests(TestCase):
+    # Urinishlar x savollar (1 - to'g'ri javob)
+    ANSWERS = [
+        (1, 1, 1),
+        (1, 1, 0),
+        (1, 0, 0),
+        (0, 0, 1),
+    ]
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.quiz = Quiz.objects.create(lesson=Lesson.objects.create(course=course, title='1-dars'), title='Test')
+        questions = []
+        for order in (1, 2, 3):
+            question = Question.objects.create(quiz=self.quiz, text=f'{order}-savol', order=order)
+            question.choice_by_result = {
+                1: Choice.objects.create(question=question, text='Ha', is_correct=True),
+                0: Choice.objects.create(question=question, text="Yo'q"),
+            }
+            questions.append(question)
+
+        for row in self.ANSWERS:
+            attempt = QuizAttempt.objects.create(
+                student=student, quiz=self.quiz, score=round(sum(row) / 3 * 100), completed_at=timezone.now()
+            )
+            AttemptAnswer.objects.bulk_create([
+                AttemptAnswer(
+                    attempt=attempt, question=question,
+                    selected_choice=question.choice_by_result[result], is_correct=bool(result)
+                )
+                for question, result in zip(questions, row)
+            ])
+
+    def test_difficulty_and_point_biserial(self):
+        # Bo'laklarga bo'lish natijaga ta'sir qilmasligi kerak
+        analysis = analyze_quiz(self.quiz, chunk_size=3)
+
+        self.assertEqual(analysis['attempt_count'], 4)
+        items = analysis['items']
+        self.assertEqual([item['difficulty'] for item in items], [0.75, 0.5, 0.5])
+        self.assertEqual([item['discrimination'] for item in items], [0.0, 0.577, -0.302])
+        self.assertEqual([item['omit_rate'] for item in items], [0.0, 0.0, 0.0])
+        self.assertEqual([choice['selection_rate'] for choice in items[0]['choices']], [0.75, 0.25])
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN formati SQLite ga xos')
+class QuizAttemptIndexTests(TestCase):
+
+    def setUp(self):
+        teacher = User.objects.create_user(username='teacher', password='pw', role='teacher')
+        self.student = User.objects.create_user(username='student', password='pw', role='student')
+        course = Course.objects.create(
+            title='Anatomiya', description='Kurs', instructor=teacher,
+            level='beginner', duration_weeks=4
+        )
+        self.quiz = Quiz.objects.create(lesson=Lesson.objects.create(course=course, title='1-dars'), title='Test')
+
+    def test_my_results_use_partial_index_without_sort(self):
+        plan = QuizAttempt.objects.filter(
+            student=self.student, completed_at__isnull=False
+        ).order_by('-completed_at', '-id')[:20].explain()
+
+        self.assertIn('quiz_attempt_student_done_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_quiz_attempts_of_student_use_composite_index(self):
+        plan = QuizAttempt.objects.filter(student=self.student, quiz=self.quiz).order_by('-started_at').explain()
 
-# Create your tests here.
+        self.assertIn('quiz_attempt_student_quiz_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
@@ -19,6 +19,7 @@ urlpatterns = [
 
     # Statistika va boshqaruv
     path('<int:quiz_id>/statistics/', views.quiz_statistics_view, name='statistics'),
+    path('<int:quiz_id>/item-analysis/', views.quiz_item_analysis_view, name='item_analysis'),
     path('<int:quiz_id>/toggle-status/', views.quiz_toggle_status_view, name='toggle_status'),
 
     # Foydalanuvchi natijalar
@@ -3,33 +3,31 @@ from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
-from django.core.paginator import Paginator
+from django.db import transaction
 from django.db.models import Count, Avg
 from django.utils import timezone
 import json
 
-from .models import Quiz, Question, Choice, QuizAttempt
+from .models import Quiz, Question, Choice, QuizAttempt, AttemptAnswer
+from .grading import get_answer_key, grade_submission
+from .statistics import get_quiz_statistics
+from .item_analysis import analyze_quiz
 from .forms import QuizCreateForm, QuestionCreateForm, ChoiceFormSet, QuizAttemptForm
-from apps.courses.models import Course, Enrollment
+from apps.courses.models import Course
+from apps.courses.access import course_access
 from apps.lessons.models import Lesson
+from apps.core.pagination import paginate
 
 
+@course_access
 def quiz_list_view(request, lesson_id):
     """Dars testlari ro'yxati"""
-    lesson = get_object_or_404(Lesson, id=lesson_id)
+    lesson = get_object_or_404(Lesson.objects.select_related('course'), id=lesson_id)
     course = lesson.course
 
     # Access tekshirish
-    is_enrolled = False
-    can_view = False
-
-    if request.user.is_authenticated:
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
-        can_view = (
-                is_enrolled or
-                request.user == course.instructor or
-                request.user.role == 'admin'
-        )
+    is_enrolled = request.access.is_enrolled(course)
+    can_view = request.access.can_view(course)
 
     if not can_view:
         messages.error(request, 'Bu testlarni ko\'rish uchun kursga yozilishingiz kerak!')
@@ -39,7 +37,7 @@ def quiz_list_view(request, lesson_id):
 
     # User attempts
     user_attempts = {}
-    if request.user.is_authenticated and is_enrolled:
+    if is_enrolled:
         attempts = QuizAttempt.objects.filter(
             student=request.user,
             quiz__lesson=lesson
@@ -61,22 +59,15 @@ def quiz_list_view(request, lesson_id):
     return render(request, 'quizzes/quiz_list.html', context)
 
 
+@course_access
 def quiz_detail_view(request, quiz_id):
     """Test tafsilotlari"""
     quiz = get_object_or_404(Quiz.objects.select_related('lesson__course'), id=quiz_id)
     course = quiz.lesson.course
 
     # Access tekshirish
-    is_enrolled = False
-    can_view = False
-
-    if request.user.is_authenticated:
-        is_enrolled = Enrollment.objects.filter(student=request.user, course=course).exists()
-        can_view = (
-                is_enrolled or
-                request.user == course.instructor or
-                request.user.role == 'admin'
-        )
+    is_enrolled = request.access.is_enrolled(course)
+    can_view = request.access.can_view(course)
 
     if not can_view:
         messages.error(request, 'Bu testni ko\'rish uchun kursga yozilishingiz kerak!')
@@ -90,7 +81,7 @@ def quiz_detail_view(request, quiz_id):
     best_score = 0
     can_attempt = True
 
-    if request.user.is_authenticated and is_enrolled:
+    if is_enrolled:
         user_attempts = QuizAttempt.objects.filter(
             student=request.user,
             quiz=quiz
@@ -116,59 +107,56 @@ def quiz_detail_view(request, quiz_id):
 
 
 @login_required
+@course_access
 def quiz_attempt_view(request, quiz_id):
     """Test yechish"""
-    quiz = get_object_or_404(
-        Quiz.objects.select_related('lesson__course').prefetch_related('questions__choices'),
-        id=quiz_id
-    )
+    quiz = get_object_or_404(Quiz.objects.select_related('lesson__course'), id=quiz_id)
     course = quiz.lesson.course
 
     # Enrollment tekshirish
-    if not Enrollment.objects.filter(student=request.user, course=course).exists():
+    if not request.access.is_enrolled(course):
         messages.error(request, 'Bu testni yechish uchun kursga yozilishingiz kerak!')
         return redirect('quizzes:detail', quiz_id=quiz.id)
 
-    # Questions
-    questions = quiz.questions.all().order_by('order')
-    if not questions.exists():
+    # Javoblar kaliti (cache dan, savollar bo'yicha alohida so'rovlarsiz)
+    answer_key = get_answer_key(quiz.id)
+    if not answer_key['questions']:
         messages.error(request, 'Bu testda savollar mavjud emas!')
         return redirect('quizzes:detail', quiz_id=quiz.id)
 
     if request.method == 'POST':
-        # Quiz attempt yaratish
-        attempt = QuizAttempt.objects.create(
-            student=request.user,
-            quiz=quiz
-        )
-
-        correct_answers = 0
-        total_questions = questions.count()
-
         # Javoblarni tekshirish
-        for question in questions:
-            selected_choice_id = request.POST.get(f'question_{question.id}')
-            if selected_choice_id:
-                try:
-                    selected_choice = question.choices.get(id=selected_choice_id)
-                    if selected_choice.is_correct:
-                        correct_answers += 1
-                except Choice.DoesNotExist:
-                    pass
+        correct_answers, total_questions, responses = grade_submission(answer_key, request.POST)
 
         # Score hisoblash
         score = round((correct_answers / total_questions) * 100) if total_questions > 0 else 0
         is_passed = score >= quiz.passing_score
 
-        # Attempt yangilash
-        attempt.score = score
-        attempt.is_passed = is_passed
-        attempt.completed_at = timezone.now()
-        attempt.save()
+        with transaction.atomic():
+            attempt = QuizAttempt.objects.create(
+                student=request.user,
+                quiz=quiz,
+                score=score,
+                is_passed=is_passed,
+                completed_at=timezone.now()
+            )
+
+            # Javoblarni keyinroq ko'rib chiqish uchun saqlash
+            AttemptAnswer.objects.bulk_create([
+                AttemptAnswer(
+                    attempt=attempt,
+                    question_id=response['question_id'],
+                    selected_choice_id=response['selected_choice_id'],
+                    is_correct=response['is_correct']
+                )
+                for response in responses
+            ])
 
         messages.success(request, f'Test tugallandi! Sizning natijangiz: {score}%')
         return redirect('quizzes:result', attempt_id=attempt.id)
 
+    questions = quiz.questions.prefetch_related('choices').order_by('order')
+
     context = {
         'quiz': quiz,
         'questions': questions,
@@ -189,12 +177,29 @@ def quiz_result_view(request, attempt_id):
     )
 
     quiz = attempt.quiz
-    questions = quiz.questions.all().order_by('order')
+
+    # Savollar, variantlar va javoblar - yana 3 ta so'rov (sessiya, foydalanuvchi
+    # va urinish bilan jami 6 ta, QuizResultViewTests)
+    questions = list(quiz.questions.prefetch_related('choices').order_by('order'))
+    answers = {answer.question_id: answer for answer in attempt.answers.all()}
+
+    question_results = []
+    for question in questions:
+        answer = answers.get(question.id)
+        question_results.append({
+            'question': question,
+            'choices': question.choices.all(),
+            'answer': answer,
+            'selected_choice_id': answer.selected_choice_id if answer else None,
+            'is_correct': answer.is_correct if answer else False,
+        })
 
     context = {
         'attempt': attempt,
         'quiz': quiz,
         'questions': questions,
+        'question_results': question_results,
+        'correct_count': sum(1 for answer in answers.values() if answer.is_correct),
         'page_title': f'{quiz.title} - Natija',
     }
 
@@ -289,34 +294,24 @@ def quiz_statistics_view(request, quiz_id):
     """Test statistikasi (O'qituvchi uchun)"""
     quiz = get_object_or_404(Quiz, id=quiz_id, lesson__course__instructor=request.user)
 
-    attempts = QuizAttempt.objects.filter(quiz=quiz).select_related('student')
+    # Ballar taqsimoti oraliq kengligi (?bin_width=10), bo'lmasa standart oraliqlar
+    try:
+        bin_width = int(request.GET.get('bin_width', 0))
+    except ValueError:
+        bin_width = 0
+    if not 1 <= bin_width <= 100:
+        bin_width = None
 
-    # Statistics
-    total_attempts = attempts.count()
-    unique_students = attempts.values('student').distinct().count()
-    passed_attempts = attempts.filter(is_passed=True).count()
-    avg_score = attempts.aggregate(avg_score=Avg('score'))['avg_score'] or 0
-
-    # Score distribution
-    score_ranges = {
-        '90-100': attempts.filter(score__gte=90).count(),
-        '80-89': attempts.filter(score__gte=80, score__lt=90).count(),
-        '70-79': attempts.filter(score__gte=70, score__lt=80).count(),
-        '60-69': attempts.filter(score__gte=60, score__lt=70).count(),
-        '0-59': attempts.filter(score__lt=60).count(),
-    }
+    # Statistics (bitta aggregate so'rovi, cache qilingan)
+    stats = get_quiz_statistics(quiz, bin_width)
 
     # Recent attempts
-    recent_attempts = attempts.order_by('-started_at')[:10]
+    recent_attempts = QuizAttempt.objects.filter(quiz=quiz).select_related('student').order_by('-started_at')[:10]
 
     context = {
         'quiz': quiz,
-        'total_attempts': total_attempts,
-        'unique_students': unique_students,
-        'passed_attempts': passed_attempts,
-        'pass_rate': round((passed_attempts / total_attempts * 100), 1) if total_attempts > 0 else 0,
-        'avg_score': round(avg_score, 1),
-        'score_ranges': score_ranges,
+        **stats,
+        'bin_width': bin_width,
         'recent_attempts': recent_attempts,
         'page_title': f'{quiz.title} - Statistika',
     }
@@ -324,13 +319,29 @@ def quiz_statistics_view(request, quiz_id):
     return render(request, 'quizzes/quiz_statistics.html', context)
 
 
+@login_required
+def quiz_item_analysis_view(request, quiz_id):
+    """Savollar bo'yicha item tahlili (O'qituvchi uchun)"""
+    quiz = get_object_or_404(Quiz, id=quiz_id, lesson__course__instructor=request.user)
+
+    analysis = analyze_quiz(quiz)
+
+    context = {
+        'quiz': quiz,
+        **analysis,
+        'page_title': f'{quiz.title} - Savollar tahlili',
+    }
+
+    return render(request, 'quizzes/quiz_item_analysis.html', context)
+
+
 @login_required
 def my_quiz_results_view(request):
     """Mening test natijalarim"""
     attempts = QuizAttempt.objects.filter(
         student=request.user,
         completed_at__isnull=False
-    ).select_related('quiz__lesson__course').order_by('-completed_at')
+    ).select_related('quiz__lesson__course')
 
     # Filter
     course_id = request.GET.get('course')
@@ -345,9 +356,7 @@ def my_quiz_results_view(request):
         attempts = attempts.filter(is_passed=False)
 
     # Pagination
-    paginator = Paginator(attempts, 20)
-    page = request.GET.get('page')
-    attempts_page = paginator.get_page(page)
+    attempts_page = paginate(request, attempts, 20, ('-completed_at', '-id'))
 
     # Statistics
     stats = {
@@ -387,12 +396,13 @@ def quiz_toggle_status_view(request, quiz_id):
 # API endpoints for AJAX
 @login_required
 @require_http_methods(["POST"])
+@course_access
 def save_quiz_progress(request, quiz_id):
     """Test progressini saqlash (AJAX)"""
-    quiz = get_object_or_404(Quiz, id=quiz_id)
+    quiz = get_object_or_404(Quiz.objects.select_related('lesson'), id=quiz_id)
 
     # Enrollment tekshirish
-    if not Enrollment.objects.filter(student=request.user, course=quiz.lesson.course).exists():
+    if not request.access.is_enrolled(quiz.lesson.course_id):
         return JsonResponse({'success': False, 'message': 'Ruxsat yo\'q!'})
 
     try:
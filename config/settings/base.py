@@ -56,16 +56,8 @@ TEMPLATES = [
                'django.contrib.messages.context_processors.messages',
 
                 # Core context processors
-                'apps.core.context_processors.site_settings',
-                'apps.core.context_processors.social_networks',
-                'apps.core.context_processors.header_settings',
-                'apps.core.context_processors.footer_settings',
-                'apps.core.context_processors.navigation_menus',
-                'apps.core.context_processors.seo_context',
-                'apps.core.context_processors.user_context',
-                'apps.core.context_processors.maintenance_mode',
-                'apps.core.context_processors.breadcrumbs_context',
-                'apps.core.context_processors.global_counters',
+                'apps.core.context_processors.site_chrome',
+                'apps.core.context_processors.page_shell',
            ],
        },
    },
@@ -102,4 +94,34 @@ MEDIA_ROOT = BASE_DIR / 'media'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-AUTH_USER_MODEL = 'accounts.User'
\ No newline at end of file
+AUTH_USER_MODEL = 'accounts.User'
+
+# Cache. Site chrome, yozilishlar holati va heartbeat buferi barcha processlarda
+# bir xil bo'lishi kerak, shuning uchun bir nechta worker bo'lsa umumiy backend
+# (Redis/Memcached) ishlatiladi. LocMem faqat bitta processli development uchun.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
+# Video heartbeatlarini cache orqali yig'ib, bazaga guruhlab yozish.
+# Bir nechta process bo'lsa umumiy cache (Redis/Memcached) kerak.
+LESSON_PROGRESS_WRITE_BEHIND = config('LESSON_PROGRESS_WRITE_BEHIND', default=False, cast=bool)
+LESSON_PROGRESS_FLUSH_INTERVAL = config('LESSON_PROGRESS_FLUSH_INTERVAL', default=60, cast=int)  # seconds
+
+# Test statistikasi: ballar taqsimoti oraliqlarining quyi chegaralari
+QUIZ_SCORE_BINS = [0, 60, 70, 80, 90]
+
+# Sayt chrome snapshoti (sozlamalar, menyular, hisoblagichlar) qancha saqlanadi
+SITE_CHROME_TIMEOUT = config('SITE_CHROME_TIMEOUT', default=1800, cast=int)  # seconds
+
+# Qidiruv backend (bo'sh bo'lsa baza turiga qarab: PostgreSQL - tsvector, SQLite - FTS5)
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='')
+
+# Katalog sahifalari (anonim): CDN necha soniya saqlaydi, brauzer har safar ETag bilan tekshiradi
+CATALOG_CACHE_S_MAXAGE = config('CATALOG_CACHE_S_MAXAGE', default=60, cast=int)  # seconds
+
+# Anonim sahifalar shell cache i (katalog o'zgarganda ham eskiradi)
+PAGE_CACHE_TIMEOUT = config('PAGE_CACHE_TIMEOUT', default=300, cast=int)  # seconds
\ No newline at end of file
@@ -15,6 +15,14 @@ DATABASES = {
     }
 }
 
+# Cache (barcha workerlar uchun umumiy Redis)
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.redis.RedisCache'),
+        'LOCATION': config('CACHE_LOCATION', default='redis://127.0.0.1:6379/1'),
+    }
+}
+
 # # Security sozlamalari
 # SECURE_SSL_REDIRECT = True
 # SECURE_BROWSER_XSS_FILTER = True